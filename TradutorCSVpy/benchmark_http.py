@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark das conexões HTTP do backend google-web, sem rede
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Sobe o servidor local de tradutor_http.py (latência por requisição e custo
+de handshake simulados) e traduz o mesmo CSV sintético com o backend
+google-web em cada modo de conexão:
+- keepalive: pool compartilhado, conexões reaproveitadas entre requisições
+- sem-keepalive: uma conexão nova por requisição (--keepalive 0)
+- http2 (só com --mode http2): cliente httpx por worker com HTTP/2 habilitado;
+  o servidor local não tem TLS, então a conexão fica em HTTP/1.1 e o modo
+  mede só o cliente httpx
+
+O relatório em JSON traz, por modo, células por segundo, conexões aceitas
+pelo servidor e os contadores do pool (abertas, reaproveitadas, taxa).
+
+Uso:
+    python benchmark_http.py
+    python benchmark_http.py --rows 2000 --workers 16 --handshake 0.05 --json http.json
+    python benchmark_http.py --mode keepalive --mode http2
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import Dict
+
+from benchmark_tradutor import SCENARIOS, generate_csv
+from tradutor_core import TranslationConfig, create_translator
+from tradutor_http import LocalTranslateServer
+
+MODES = {
+    'keepalive': {'http_keepalive': 30.0},
+    'sem-keepalive': {'http_keepalive': 0.0},
+    'http2': {'http_keepalive': 30.0, 'http2': True},
+}
+
+def run_mode(server: LocalTranslateServer, input_file: str, output_file: str, config: TranslationConfig) -> Dict:
+    """Traduz o arquivo uma vez e retorna tempo, conexões aceitas pelo servidor e contadores do pool"""
+    connections = server.connections
+    translator = create_translator(config, log=lambda message: None)
+    start = time.perf_counter()
+    try:
+        translator.translate_csv_stream(input_file, output_file)
+        elapsed = time.perf_counter() - start
+        http = translator.http_stats() or {}
+    finally:
+        translator.close()
+    return {
+        'elapsed_seconds': elapsed,
+        'backend_requests': translator.backend_requests,
+        'server_connections': server.connections - connections,
+        'http': http,
+        'failed_texts': len(translator.failed_texts),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de keep-alive e HTTP/2 do backend google-web (servidor local)")
+    parser.add_argument('--rows', type=int, default=1000, help='Linhas de dados do CSV sintético')
+    parser.add_argument('-t', '--target', default='en', help='Idioma(s) de destino, separados por vírgula')
+    parser.add_argument('-w', '--workers', type=int, default=8, help='Requisições simultâneas ao backend')
+    parser.add_argument('--batch-size', type=int, default=10, help='Células por requisição')
+    parser.add_argument('--latency', type=float, default=0.005, help='Latência do servidor por requisição, em segundos')
+    parser.add_argument('--handshake', type=float, default=0.02,
+                        help='Atraso de cada conexão nova no servidor (custo do TLS), em segundos')
+    parser.add_argument('--mode', action='append', choices=list(MODES), help='Modo (repetível; padrão: keepalive e sem-keepalive)')
+    parser.add_argument('--json', default='-', help='Arquivo do relatório JSON (padrão: saída padrão)')
+    args = parser.parse_args()
+
+    modes = args.mode or ['keepalive', 'sem-keepalive']
+    if 'http2' in modes and (importlib.util.find_spec('h2') is None or importlib.util.find_spec('httpx') is None):
+        parser.error("o modo http2 requer httpx e h2")
+
+    server = LocalTranslateServer(latency=args.latency, handshake=args.handshake)
+    config = TranslationConfig(source_language='pt', target_language=args.target, backend='google-web',
+                               backend_url=server.start(), max_concurrency=args.workers,
+                               http_pool_size=args.workers, batch_size=args.batch_size,
+                               stream=True, journal=False)
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='benchmark_http_') as work_dir:
+            input_file = os.path.join(work_dir, 'entrada.csv')
+            cells = generate_csv(input_file, replace(SCENARIOS['padrao'], rows=args.rows, duplicates=0.0))
+            for mode in modes:
+                result = run_mode(server, input_file, os.path.join(work_dir, f"{mode}.csv"),
+                                  replace(config, **MODES[mode]))
+                result['cells_per_second'] = cells * len(config.target_languages) / result['elapsed_seconds']
+                results[mode] = result
+                http = result['http']
+                print(f"{mode:<14} {result['cells_per_second']:9.0f} células/s  {result['elapsed_seconds']:6.2f}s  "
+                      f"{result['backend_requests']:5d} req  {result['server_connections']:5d} conexões no servidor  "
+                      f"reaproveitadas {http.get('reuse_rate', 0.0):4.0%}", file=sys.stderr)
+    finally:
+        server.stop()
+
+    report = {
+        'rows': args.rows,
+        'workers': args.workers,
+        'latency': args.latency,
+        'handshake': args.handshake,
+        'modes': results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.json == '-':
+        print(text)
+    else:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+
+if __name__ == "__main__":
+    main()
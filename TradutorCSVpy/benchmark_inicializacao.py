@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do tempo de inicialização (partida a frio)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Mede, em processos novos, quanto tempo leva cada ponto de entrada até
+terminar ou ficar pronto para uso:
+- CLI: `tradutor_csv.py --help` e `--create-config`
+- interface gráfica: `import tradutor_csv_gui` (sem abrir a janela)
+- biblioteca: `import tradutor_csv` e `import tradutor_core`
+
+O custo do próprio interpretador (`python -c pass`) é medido à parte e
+descontado. Cada alvo tem um orçamento em milissegundos acima do
+interpretador; o script termina com erro se a mediana passar dele ou se a
+importação carregar alguma das bibliotecas de rede (googletrans, httpx,
+asyncio), que só devem ser importadas quando uma tradução começa.
+
+Uso:
+    python benchmark_inicializacao.py
+    python benchmark_inicializacao.py --runs 20 --json inicializacao.json
+    python benchmark_inicializacao.py --imports 15
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bibliotecas que não podem ser carregadas na importação dos módulos
+HEAVY_MODULES = ('googletrans', 'httpx', 'asyncio')
+
+# Alvo -> (argumentos do interpretador, orçamento em ms acima de `python -c pass`)
+TARGETS = {
+    'cli --help': (['tradutor_csv.py', '--help'], 150),
+    'cli --create-config': (['tradutor_csv.py', '--create-config'], 150),
+    'import tradutor_csv': (['-c', 'import tradutor_csv'], 120),
+    'import tradutor_core': (['-c', 'import tradutor_core'], 120),
+    'import tradutor_csv_gui': (['-c', 'import tradutor_csv_gui'], 200),
+}
+
+def _run(arguments: List[str], cwd: str) -> float:
+    """Executa o interpretador com `arguments` e retorna a duração em segundos"""
+    env = dict(os.environ, PYTHONPATH=SCRIPT_DIR)
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def _script_arguments(arguments: List[str]) -> List[str]:
+    """Caminho absoluto para scripts (o alvo roda em um diretório temporário)"""
+    if arguments and arguments[0].endswith('.py'):
+        return [os.path.join(SCRIPT_DIR, arguments[0])] + arguments[1:]
+    return arguments
+
+def measure(arguments: List[str], runs: int, cwd: str) -> Dict:
+    """Mínimo, mediana e máximo de `runs` execuções, em milissegundos (a primeira aquece o cache do disco)"""
+    _run(arguments, cwd)
+    samples = [_run(arguments, cwd) * 1000 for _ in range(max(1, runs))]
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'max_ms': max(samples),
+    }
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    """Bibliotecas de HEAVY_MODULES presentes em sys.modules depois de importar `module`"""
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps([name for name in {list(HEAVY_MODULES)!r} if name in sys.modules]))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=SCRIPT_DIR, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout)
+
+def slowest_imports(module: str, count: int) -> List[Dict]:
+    """As `count` importações com maior tempo acumulado (python -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SCRIPT_DIR, capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        imports.append({'module': name, 'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+    return sorted(imports, key=lambda item: item['cumulative_ms'], reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização do CLI, da interface e da biblioteca")
+    parser.add_argument('--runs', type=int, default=10, help='Execuções por alvo (vale a mediana)')
+    parser.add_argument('--target', action='append', choices=list(TARGETS), help='Alvo (repetível; padrão: todos)')
+    parser.add_argument('--imports', type=int, default=0, metavar='N',
+                        help='Mostrar as N importações mais lentas de tradutor_csv')
+    parser.add_argument('--json', help='Gravar o relatório em JSON')
+    args = parser.parse_args()
+
+    targets = {name: TARGETS[name] for name in (args.target or TARGETS)}
+    if importlib.util.find_spec('tkinter') is None:
+        targets.pop('import tradutor_csv_gui', None)
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix='benchmark_inicializacao_') as work_dir:
+        interpreter = measure(['-c', 'pass'], args.runs, work_dir)
+        print(f"🐍 Interpretador (python -c pass): {interpreter['median_ms']:.0f} ms (mediana de {args.runs})")
+
+        results = {}
+        for name, (arguments, budget) in targets.items():
+            timing = measure(_script_arguments(arguments), args.runs, work_dir)
+            overhead = timing['median_ms'] - interpreter['median_ms']
+            result = dict(timing, overhead_ms=overhead, budget_ms=budget, within_budget=overhead <= budget)
+
+            if arguments[0] == '-c':
+                result['heavy_modules'] = loaded_heavy_modules(arguments[1].split()[-1])
+                if result['heavy_modules']:
+                    failures.append(f"{name} carrega {', '.join(result['heavy_modules'])}")
+            if not result['within_budget']:
+                failures.append(f"{name}: {overhead:.0f} ms acima do interpretador (orçamento: {budget} ms)")
+
+            results[name] = result
+            status = '✅' if result['within_budget'] and not result.get('heavy_modules') else '❌'
+            print(f"{status} {name:<26} {timing['median_ms']:7.0f} ms  (+{overhead:5.0f} ms, orçamento {budget} ms)")
+
+    report = {
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'interpreter': interpreter,
+        'targets': results,
+    }
+
+    if args.imports:
+        report['slowest_imports'] = slowest_imports('tradutor_csv', args.imports)
+        print("\n📦 Importações mais lentas de tradutor_csv (tempo acumulado):")
+        for item in report['slowest_imports']:
+            print(f"   {item['cumulative_ms']:7.1f} ms  {item['module']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"💾 Relatório salvo em: {args.json}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
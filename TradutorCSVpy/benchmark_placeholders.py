@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark da preservação de elementos (placeholders)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Compara a implementação anterior (um finditer por padrão e um str.replace
+por ocorrência) com a de tradutor_placeholders (um re.sub por tipo, com as
+expressões pré-compiladas, e a restauração em uma passada), conferindo
+antes que o texto restaurado é o mesmo e que o texto mascarado só difere
+onde o str.replace da versão anterior trocava um valor dentro de outro.
+
+Antes dos tempos, --fuzz células aleatórias misturando URLs, emails,
+números e moedas (com números repetidos, contidos em URLs e emails, emails
+com "www." e moedas coladas a emails) são conferidas da mesma forma.
+
+Uso:
+    python benchmark_placeholders.py [--repeat N] [--fuzz N]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, Tuple
+
+from tradutor_placeholders import mask_elements, placeholder_kinds, restore_elements
+
+LEGACY_PATTERNS = {
+    'url': re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+', re.IGNORECASE),
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'number': re.compile(r'\b\d+(?:[,\.]\d+)*\b'),
+    'currency': re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)\s*(?:R\$|BRL|reais?|USD|\$|€|EUR)', re.IGNORECASE),
+}
+
+def legacy_preserve(text: str, currency_handler: Callable[[str], str] = None,
+                    track_rewrites: bool = True) -> Tuple[str, Dict[str, str], bool]:
+    """
+    Implementação anterior (CSVTranslator._preserve_elements; com
+    `currency_handler`, a da GUI para conversão e troca de símbolo)
+
+    Com `track_rewrites`, retorna também se algum str.replace trocou o valor
+    em outro lugar além das ocorrências encontradas pelo padrão (dentro de
+    outro valor ou de um placeholder), o que a versão atual não reproduz de
+    propósito; sem ele, os tempos são os da versão anterior.
+    """
+    placeholders = {}
+    modified_text = text
+    counter = 0
+    rewrote = False
+
+    def replace_all(value: str, placeholder: str, stage_matches):
+        nonlocal modified_text, rewrote
+        if track_rewrites and value not in replaced:
+            replaced.add(value)
+            if modified_text.count(value) != sum(1 for match in stage_matches if match.group() == value):
+                rewrote = True
+        modified_text = modified_text.replace(value, placeholder)
+
+    replaced = set()
+    stage = list(LEGACY_PATTERNS['url'].finditer(text))
+    for match in stage:
+        placeholder = f"__URL_{counter}__"
+        placeholders[placeholder] = match.group()
+        replace_all(match.group(), placeholder, stage)
+        counter += 1
+
+    replaced = set()
+    stage = list(LEGACY_PATTERNS['email'].finditer(modified_text))
+    for match in stage:
+        placeholder = f"__EMAIL_{counter}__"
+        placeholders[placeholder] = match.group()
+        replace_all(match.group(), placeholder, stage)
+        counter += 1
+
+    if currency_handler:
+        replaced = set()
+        stage = list(LEGACY_PATTERNS['currency'].finditer(modified_text))
+        for match in stage:
+            placeholder = f"__CURRENCY_{counter}__"
+            placeholders[placeholder] = currency_handler(match.group())
+            replace_all(match.group(), placeholder, stage)
+            counter += 1
+
+    replaced = set()
+    stage = list(LEGACY_PATTERNS['number'].finditer(modified_text))
+    for match in stage:
+        if not any(match.group() in value for value in placeholders.values()):
+            placeholder = f"__NUMBER_{counter}__"
+            placeholders[placeholder] = match.group()
+            replace_all(match.group(), placeholder, stage)
+            counter += 1
+
+    return modified_text, placeholders, rewrote
+
+def legacy_restore(text: str, placeholders: Dict[str, str]) -> str:
+    """Implementação anterior de CSVTranslator._restore_elements"""
+    for placeholder, original_value in placeholders.items():
+        text = text.replace(placeholder, original_value)
+    return text
+
+def spec_sheet_cell(rng: random.Random, values: int) -> str:
+    """Célula de ficha técnica com muitos números distintos"""
+    labels = ['Potência', 'Tensão', 'Peso', 'Altura', 'Largura', 'Profundidade', 'Consumo', 'Capacidade']
+    units = ['W', 'V', 'kg', 'cm', 'mm', 'kWh/mês', 'L']
+    parts = [f"{rng.choice(labels)}: {index * 7 + 1},{rng.randint(10, 99)} {rng.choice(units)}"
+             for index in range(values)]
+    return '; '.join(parts) + '. Manual em www.loja.com.br/manual ou suporte@loja.com.br'
+
+CORPUS = {
+    'texto curto': ['Comprar agora', 'Vinho tinto seco', 'Frete grátis para todo o Brasil'],
+    'misto': ['Veja www.site.com/promo ou joao@x.com: 10 itens por 99,90',
+              'Mendoza/Argentina - safra 2021, 13,5% vol., 750 ml',
+              'Contato: vendas@loja.com.br | https://loja.com.br/ofertas'],
+}
+
+def check_against_legacy(cell: str, currency_handler: Callable[[str], str] = None) -> bool:
+    """
+    Confere a máscara atual com a versão anterior em uma célula
+
+    Returns:
+        True se o texto mascarado é o mesmo; False onde a versão anterior
+        trocava um valor dentro de outro (aí só a restauração é conferida)
+    """
+    kinds = placeholder_kinds(currency=currency_handler is not None)
+    legacy_text, legacy_map, rewrote = legacy_preserve(cell, currency_handler)
+    new_text, new_map = mask_elements(cell, kinds, currency_handler)
+    if currency_handler is None:
+        assert restore_elements(new_text, new_map) == cell, (cell, new_text)
+    if rewrote:
+        return False
+    assert new_text == legacy_text, (cell, legacy_text, new_text)
+    assert all(legacy_map.get(placeholder) == value for placeholder, value in new_map.items()), \
+        (cell, legacy_map, new_map)
+    return True
+
+def mixed_cell(rng: random.Random) -> str:
+    """Célula aleatória com URLs, emails, números e moedas colados ou separados de várias formas"""
+    number = lambda: rng.choice([str(rng.randint(0, 30)), f"{rng.randint(1, 300)},{rng.randint(0, 99):02d}",
+                                 f"{rng.randint(1, 9)}.{rng.randint(100, 999)}", '2021', '8,96', '218,96'])
+    word = lambda: rng.choice(['promo', 'www', 'usd', 'Loja', 'x', 'safra', 'vendas', 'reais', 'EUR', 'http'])
+    pieces = [
+        lambda: f"www.{word()}{rng.choice(['', number()])}.com{rng.choice(['', '/' + number(), '/p?id=' + number()])}",
+        lambda: f"{rng.choice(['http', 'https', 'HTTP'])}://{word()}.com.br/{number()}",
+        lambda: f"{word()}{rng.choice(['', number(), '.' + word()])}@{rng.choice(['', 'www.'])}{word()}.com",
+        lambda: f"{number()}{rng.choice(['', ' '])}{rng.choice(['R$', 'BRL', 'reais', 'USD', '$', '€', 'EUR', 'usd'])}",
+        number, number, word, word,
+    ]
+    separators = ['', ' ', ' ', ', ', '-', '.', ':', '/', '@', ' e ']
+    return ''.join(rng.choice(pieces)() + rng.choice(separators) for _ in range(rng.randint(1, 8)))
+
+def fuzz(cells: int):
+    """Confere --fuzz células aleatórias com a versão anterior (sem e com moedas)"""
+    rng = random.Random(1)
+    for currency_handler in (None, lambda value: '$' + value):
+        identical = sum(check_against_legacy(mixed_cell(rng), currency_handler) for _ in range(cells))
+        mode = 'com moedas' if currency_handler else 'sem moedas'
+        print(f"🔎 {cells} células aleatórias {mode}: mascarados iguais à versão anterior em {identical}, "
+              f"{cells - identical} onde ela trocava um valor dentro de outro")
+
+def run_case(name: str, cells, repeat: int):
+    kinds = placeholder_kinds()
+
+    identical = sum(check_against_legacy(cell) for cell in cells)
+
+    def timed(function):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for cell in cells:
+                function(cell)
+        return time.perf_counter() - start
+
+    legacy = timed(lambda cell: legacy_restore(*legacy_preserve(cell, track_rewrites=False)[:2]))
+    current = timed(lambda cell: restore_elements(*mask_elements(cell, kinds)))
+    per_cell = 1e6 / (repeat * len(cells))
+    print(f"{name:<22} anterior {legacy * per_cell:9.1f} µs/célula   "
+          f"atual {current * per_cell:9.1f} µs/célula   ({legacy / current:.1f}x)   "
+          f"mascarados iguais: {identical}/{len(cells)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark da preservação de elementos")
+    parser.add_argument('--repeat', type=int, default=200, help='Repetições de cada conjunto de células')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Células aleatórias conferidas com a versão anterior')
+    args = parser.parse_args()
+
+    fuzz(args.fuzz)
+
+    rng = random.Random(0)
+    cases = dict(CORPUS)
+    for values in (10, 50, 200):
+        cases[f'ficha técnica ({values})'] = [spec_sheet_cell(rng, values) for _ in range(5)]
+
+    print("⏱️  Preservação + restauração (textos mascarados conferidos com a versão anterior)")
+    for name, cells in cases.items():
+        run_case(name, cells, args.repeat)
+
+if __name__ == "__main__":
+    main()
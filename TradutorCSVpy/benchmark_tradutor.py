@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do tradutor, sem rede
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Gera CSVs sintéticos no formato das variáveis do Illustrator (cabeçalho com
+os nomes das variáveis e uma linha por registro) e traduz cada um de ponta a
+ponta com CSVTranslator em modo streaming, usando o backend stub com latência
+simulada. O relatório em JSON traz, por cenário:
+- células por segundo (células de dados × idiomas)
+- tempo de cada etapa: preservação, envio ao backend, restauração e o
+  restante (leitura e escrita do CSV)
+- pico de memória Python (tracemalloc, em uma execução à parte para não
+  distorcer os tempos)
+- taxa de acerto dos caches e requisições enviadas ao backend
+
+Com --baseline, compara células por segundo com um relatório anterior e
+termina com erro se algum cenário ficar mais lento que a tolerância.
+
+Uso:
+    python benchmark_tradutor.py > resultado.json
+    python benchmark_tradutor.py --scenario repetido --repeat 5 --json resultado.json
+    python benchmark_tradutor.py --rows 5000 --columns 12 --duplicates 0.5 --latency 0.02
+    python benchmark_tradutor.py --baseline resultado.json --tolerance 0.15
+    python benchmark_tradutor.py --generate-only exemplo.csv --rows 200
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, List
+
+from tradutor_core import TranslationConfig, create_translator
+
+WORDS = ['vinho', 'tinto', 'seco', 'safra', 'notas', 'de', 'frutas', 'vermelhas', 'leve', 'com',
+         'aroma', 'intenso', 'oferta', 'especial', 'frete', 'grátis', 'para', 'todo', 'o', 'Brasil',
+         'produto', 'novo', 'comprar', 'agora', 'garrafa', 'uva', 'carvalho', 'final', 'longo',
+         'harmoniza', 'massas', 'queijos', 'carnes', 'elegante', 'fresco', 'mineral', 'região']
+VARIABLES = ['titulo', 'subtitulo', 'descricao', 'preco', 'origem', 'uva', 'safra', 'harmonizacao',
+             'site', 'contato', 'observacao', 'selo']
+
+@dataclass
+class SyntheticSpec:
+    """Formato de um CSV sintético"""
+    columns: int = 6
+    rows: int = 2000
+    # Média de palavras por célula de texto
+    words: int = 8
+    # Fração das células que repetem um texto já usado no arquivo
+    duplicates: float = 0.3
+    # Fração das células com URL, com número e de preço
+    urls: float = 0.1
+    numbers: float = 0.2
+    currency: float = 0.1
+    # Fração das células com quebra de linha (texto de área no Illustrator)
+    multiline: float = 0.05
+    seed: int = 0
+
+SCENARIOS = {
+    'padrao': SyntheticSpec(),
+    'curto': SyntheticSpec(columns=4, rows=5000, words=2, duplicates=0.5),
+    'largo': SyntheticSpec(columns=40, rows=300, words=6),
+    'repetido': SyntheticSpec(duplicates=0.9),
+    'elementos': SyntheticSpec(words=12, urls=0.6, numbers=0.8, currency=0.3),
+}
+
+def _text_cell(rng: random.Random, spec: SyntheticSpec) -> str:
+    """Célula de texto com URLs, números e quebras de linha conforme as densidades"""
+    count = max(1, int(rng.gauss(spec.words, spec.words / 3)))
+    words = [rng.choice(WORDS) for _ in range(count)]
+    if rng.random() < spec.numbers:
+        words.insert(rng.randrange(len(words) + 1), f"{rng.randint(1, 2000)},{rng.randint(0, 99):02d}")
+    if rng.random() < spec.urls:
+        words.insert(rng.randrange(len(words) + 1), f"www.loja{rng.randint(1, 50)}.com.br/p/{rng.randint(1, 9999)}")
+    text = ' '.join(words)
+    if rng.random() < spec.multiline and count > 1:
+        text = text.replace(' ', '\n', 1)
+    return text if text.startswith('www.') else text[0].upper() + text[1:]
+
+def _price_cell(rng: random.Random) -> str:
+    value = f"{rng.randint(1, 999)},{rng.randint(0, 99):02d}"
+    return f"R$ {value}" if rng.random() < 0.5 else value
+
+def generate_csv(path: str, spec: SyntheticSpec) -> int:
+    """
+    Grava um CSV sintético e retorna o número de células de dados
+
+    A sequência é determinística para a mesma `spec` (inclusive a semente).
+    """
+    rng = random.Random(spec.seed)
+    header = [VARIABLES[index % len(VARIABLES)] + (f"_{index // len(VARIABLES) + 1}" if index >= len(VARIABLES) else '')
+              for index in range(spec.columns)]
+    used: List[str] = []
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(header)
+        for _ in range(spec.rows):
+            row = []
+            for _ in range(spec.columns):
+                if rng.random() < spec.currency:
+                    cell = _price_cell(rng)
+                elif used and rng.random() < spec.duplicates:
+                    cell = rng.choice(used)
+                else:
+                    cell = _text_cell(rng, spec)
+                    used.append(cell)
+                row.append(cell)
+            writer.writerow(row)
+
+    return spec.rows * spec.columns
+
+def _timed(function: Callable, timings: Dict[str, float], stage: str) -> Callable:
+    """Envolve um método do tradutor somando a duração de cada chamada em `timings[stage]`"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[stage] += time.perf_counter() - start
+    return wrapper
+
+def run_translation(input_file: str, output_file: str, config: TranslationConfig,
+                    trace_memory: bool = False) -> Dict:
+    """Traduz um arquivo e retorna tempos, contadores e (opcionalmente) o pico de memória"""
+    translator = create_translator(config, log=lambda message: None)
+    if translator.backend is None:
+        raise RuntimeError(f"backend {config.backend} indisponível")
+
+    # Etapas medidas nos métodos folha do pipeline: os geradores encadeados de
+    # translate_csv_stream chamam cada um deles uma vez por janela
+    timings = {'preservacao': 0.0, 'backend': 0.0, 'restauracao': 0.0}
+    translator._prepare_jobs = _timed(translator._prepare_jobs, timings, 'preservacao')
+    translator._send_requests = _timed(translator._send_requests, timings, 'backend')
+    translator._finish_jobs = _timed(translator._finish_jobs, timings, 'restauracao')
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        translator.translate_csv_stream(input_file, output_file)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        translator.close()
+
+    timings['leitura_escrita'] = max(0.0, elapsed - sum(timings.values()))
+    memory = translator.translation_cache.stats()
+    return {
+        'elapsed': elapsed,
+        'timings': timings,
+        'peak_memory_bytes': peak,
+        'backend_requests': translator.backend_requests,
+        'memory_cache': memory,
+        'persistent_cache_hits': translator.persistent_cache_hits,
+        'dedup_cells': translator.dedup_cells,
+        'dedup_unique': translator.dedup_unique,
+        'failed_texts': len(translator.failed_texts),
+    }
+
+def run_scenario(name: str, spec: SyntheticSpec, config: TranslationConfig, work_dir: str,
+                 repeat: int, measure_memory: bool) -> Dict:
+    """Gera o CSV do cenário, traduz `repeat` vezes e monta o relatório (melhor tempo)"""
+    input_file = os.path.join(work_dir, f"{name}.csv")
+    output_file = os.path.join(work_dir, f"{name}_traduzido.csv")
+    cells = generate_csv(input_file, spec)
+
+    runs = []
+    for _ in range(max(1, repeat)):
+        # Cache persistente novo a cada repetição: todas partem do mesmo estado
+        if config.cache_file and os.path.exists(config.cache_file):
+            os.remove(config.cache_file)
+        runs.append(run_translation(input_file, output_file, config))
+    best = min(runs, key=lambda run: run['elapsed'])
+
+    peak = None
+    if measure_memory:
+        if config.cache_file and os.path.exists(config.cache_file):
+            os.remove(config.cache_file)
+        peak = run_translation(input_file, output_file, config, trace_memory=True)['peak_memory_bytes']
+
+    languages = len(config.target_languages)
+    cache = best['memory_cache']
+    lookups = cache['hits'] + cache['misses']
+    hits = cache['hits'] + best['persistent_cache_hits']
+    return {
+        'spec': asdict(spec),
+        'input_bytes': os.path.getsize(input_file),
+        'cells': cells,
+        'cell_translations': cells * languages,
+        'cells_per_second': cells * languages / best['elapsed'],
+        'elapsed_seconds': best['elapsed'],
+        'elapsed_all_runs': [run['elapsed'] for run in runs],
+        'stage_seconds': best['timings'],
+        'peak_memory_bytes': peak,
+        'backend_requests': best['backend_requests'],
+        'cache': {
+            'memory_hits': cache['hits'],
+            'memory_misses': cache['misses'],
+            'persistent_hits': best['persistent_cache_hits'],
+            'hit_rate': hits / lookups if lookups else 0.0,
+        },
+        'dedup': {
+            'pending_cells': best['dedup_cells'],
+            'unique_texts': best['dedup_unique'],
+        },
+        'failed_texts': best['failed_texts'],
+    }
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Cenários com células por segundo abaixo de (1 - tolerance) × o relatório anterior"""
+    regressions = []
+    for name, result in report['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        ratio = result['cells_per_second'] / previous['cells_per_second']
+        result['baseline_ratio'] = ratio
+        if ratio < 1 - tolerance:
+            regressions.append(f"{name}: {result['cells_per_second']:.0f} células/s, "
+                               f"{ratio:.0%} do anterior ({previous['cells_per_second']:.0f})")
+    return regressions
+
+def _print_summary(name: str, result: Dict):
+    stages = result['stage_seconds']
+    total = result['elapsed_seconds'] or 1.0
+    memory = result['peak_memory_bytes']
+    memory = f"{memory / 1024 / 1024:6.1f} MB" if memory is not None else '     - MB'
+    print(f"{name:<12} {result['cells_per_second']:10.0f} células/s  {result['elapsed_seconds']:7.2f}s  "
+          f"cache {result['cache']['hit_rate']:4.0%}  {result['backend_requests']:5d} req  "
+          f"mem {memory}  |  "
+          + '  '.join(f"{stage} {seconds / total:4.0%}" for stage, seconds in stages.items()),
+          file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tradutor com CSVs sintéticos e backend stub (sem rede)")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='Cenário pré-definido (repetível; padrão: todos)')
+    spec_group = parser.add_argument_group('CSV personalizado (substitui os cenários pré-definidos)')
+    spec_group.add_argument('--columns', type=int, help='Colunas (variáveis)')
+    spec_group.add_argument('--rows', type=int, help='Linhas de dados')
+    spec_group.add_argument('--words', type=int, help='Média de palavras por célula')
+    spec_group.add_argument('--duplicates', type=float, help='Fração de células repetidas (0 a 1)')
+    spec_group.add_argument('--urls', type=float, help='Fração de células com URL (0 a 1)')
+    spec_group.add_argument('--numbers', type=float, help='Fração de células com número (0 a 1)')
+    spec_group.add_argument('--currency', type=float, help='Fração de células de preço (0 a 1)')
+    spec_group.add_argument('--seed', type=int, help='Semente do gerador')
+
+    parser.add_argument('-t', '--target', default='en', help='Idioma(s) de destino, separados por vírgula')
+    parser.add_argument('--latency', type=float, default=0.005, help='Latência simulada por requisição, em segundos')
+    parser.add_argument('-w', '--workers', type=int, default=8, help='Requisições simultâneas ao backend')
+    parser.add_argument('--engine', choices=['threads', 'asyncio'], default='threads', help='Motor de execução')
+    parser.add_argument('--window', type=int, default=500, help='Linhas por janela do streaming')
+    parser.add_argument('--dedup', action='store_true', help='Planejar o arquivo inteiro (textos únicos)')
+    parser.add_argument('--cache', action='store_true', help='Usar cache persistente (SQLite temporário)')
+    parser.add_argument('--repeat', type=int, default=3, help='Execuções por cenário (vale a mais rápida)')
+    parser.add_argument('--no-memory', action='store_true', help='Não medir o pico de memória')
+    parser.add_argument('--json', default='-', help='Arquivo do relatório JSON (padrão: saída padrão)')
+    parser.add_argument('--baseline', help='Relatório anterior para detectar regressões')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Queda máxima de células/s em relação ao --baseline (0 a 1)')
+    parser.add_argument('--generate-only', metavar='CSV', help='Só gravar o CSV sintético e sair')
+    args = parser.parse_args()
+
+    overrides = {field: getattr(args, field)
+                 for field in ('columns', 'rows', 'words', 'duplicates', 'urls', 'numbers', 'currency', 'seed')
+                 if getattr(args, field) is not None}
+    if overrides or args.generate_only:
+        scenarios = {'personalizado': replace(SyntheticSpec(), **overrides)}
+    else:
+        scenarios = {name: SCENARIOS[name] for name in (args.scenario or SCENARIOS)}
+
+    if args.generate_only:
+        cells = generate_csv(args.generate_only, scenarios['personalizado'])
+        print(f"✅ {args.generate_only}: {cells} células de dados", file=sys.stderr)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_tradutor_') as work_dir:
+        config = TranslationConfig(
+            target_language=args.target,
+            backend='stub',
+            stub_latency=args.latency,
+            max_concurrency=args.workers,
+            engine=args.engine,
+            stream=True,
+            stream_window=args.window,
+            dedup=args.dedup,
+            journal=False,
+            cache_file=os.path.join(work_dir, 'cache.sqlite3') if args.cache else '',
+        )
+
+        print(f"⏱️  Tradução de ponta a ponta (stub, {args.latency * 1000:.0f} ms por requisição, "
+              f"{args.workers} workers, {args.engine})", file=sys.stderr)
+        results = {}
+        for name, spec in scenarios.items():
+            results[name] = run_scenario(name, spec, config, work_dir, args.repeat, not args.no_memory)
+            _print_summary(name, results[name])
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'target_languages': config.target_languages,
+            'latency': args.latency,
+            'workers': args.workers,
+            'engine': args.engine,
+            'stream_window': args.window,
+            'dedup': args.dedup,
+            'persistent_cache': args.cache,
+            'repeat': args.repeat,
+        },
+        'scenarios': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare_with_baseline(report, json.load(file), args.tolerance)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.json == '-':
+        print(output)
+    else:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+        print(f"💾 Relatório salvo em: {args.json}", file=sys.stderr)
+
+    if regressions:
+        for regression in regressions:
+            print(f"❌ Regressão: {regression}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
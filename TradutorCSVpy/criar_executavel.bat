@@ -66,9 +66,9 @@ if exist "%TEMP_DIR%" (
 
 mkdir "%TEMP_DIR%"
 
-REM Copiar arquivo necessário para pasta temporária
+REM Copiar interface e módulos do motor de tradução para pasta temporária
 echo 📋 Copiando arquivos...
-copy "tradutor_csv_gui.py" "%TEMP_DIR%\"
+copy "tradutor_*.py" "%TEMP_DIR%\"
 if exist "translation_config.json" copy "translation_config.json" "%TEMP_DIR%\"
 
 REM Entrar na pasta temporária
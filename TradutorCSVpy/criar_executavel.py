@@ -61,8 +61,9 @@ def copy_files_to_temp(temp_dir):
     """Copia arquivos necessários para pasta temporária"""
     current_dir = Path(__file__).parent
     
-    # Arquivos obrigatórios
+    # Arquivos obrigatórios (interface + módulos do motor de tradução)
     required_files = ["tradutor_csv_gui.py"]
+    required_files += sorted(p.name for p in current_dir.glob("tradutor_*.py") if p.name not in required_files)
     
     # Arquivos opcionais
     optional_files = ["translation_config.json", "icon.ico"]
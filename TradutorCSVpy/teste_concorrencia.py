@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes de chamadas simultâneas ao mesmo tradutor (backend stub, sem rede)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Vários despachos do --serve (e threads chamando translate_texts) usam um
+único CSVTranslator: nenhuma tradução pode se perder no caminho para o cache
+persistente nem ser enviada duas vezes ao backend.
+
+    python -m unittest teste_concorrencia
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradutor_core import TranslationConfig, create_translator
+
+LANGUAGES = ['en', 'es']
+THREADS = 8
+
+def texts_for(thread: int) -> list:
+    """Metade dos textos é comum a todas as threads, metade é só desta"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    shared = [f"Produto {letters[i % 26]}{letters[i // 26 % 26]} em oferta" for i in range(60)]
+    own = [f"Item {letters[thread]} {letters[i % 26]}{letters[i // 26 % 26]} exclusivo" for i in range(60)]
+    return shared + own
+
+class ConcurrentCallsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.folder.name, 'cache.sqlite3')
+        # Troca de thread a cada poucos bytecodes: expõe as corridas também com um só núcleo
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+        self.folder.cleanup()
+
+    def _run_threads(self, translator, chunk: int = 5) -> list:
+        """Cada thread traduz os seus textos em chamadas pequenas (muitas gravações no cache)"""
+        results = [None] * THREADS
+        errors = []
+
+        def work(thread: int):
+            try:
+                texts = texts_for(thread)
+                output = {language: [] for language in LANGUAGES}
+                for start in range(0, len(texts), chunk):
+                    translated = translator.translate_texts(texts[start:start + chunk], LANGUAGES)
+                    for language in LANGUAGES:
+                        output[language].extend(translated[language])
+                results[thread] = output
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_every_translation_reaches_persistent_cache(self):
+        config = TranslationConfig(target_language=','.join(LANGUAGES), backend='stub', stub_latency=0.002,
+                                   max_concurrency=4, cache_file=self.cache_file)
+        translator = create_translator(config, log=lambda message: None)
+        try:
+            self._run_threads(translator)
+        finally:
+            translator.close()
+
+        expected = {(language, text) for thread in range(THREADS)
+                    for text in texts_for(thread) for language in LANGUAGES}
+        connection = sqlite3.connect(self.cache_file)
+        try:
+            stored = set(connection.execute('SELECT target_language, source_text FROM translations'))
+        finally:
+            connection.close()
+        self.assertEqual(expected - stored, set())
+
+    def test_concurrent_calls_match_single_caller(self):
+        config = TranslationConfig(target_language=','.join(LANGUAGES), backend='stub', stub_latency=0.002,
+                                   max_concurrency=4)
+        translator = create_translator(config, log=lambda message: None)
+        try:
+            results = self._run_threads(translator)
+            # Cada texto único vai ao backend uma vez por idioma, mesmo com as chamadas simultâneas
+            unique = {text for thread in range(THREADS) for text in texts_for(thread)}
+            self.assertEqual(translator.backend_items, len(unique) * len(LANGUAGES))
+        finally:
+            translator.close()
+
+        single = create_translator(config, log=lambda message: None)
+        try:
+            for thread in range(THREADS):
+                self.assertEqual(results[thread], single.translate_texts(texts_for(thread), LANGUAGES))
+        finally:
+            single.close()
+
+if __name__ == '__main__':
+    unittest.main()
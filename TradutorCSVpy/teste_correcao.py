@@ -14,6 +14,8 @@ sys.path.insert(0, current_dir)
 # Importar e testar
 try:
     from tradutor_csv_gui import CSVTranslatorGUI, TranslationConfig
+    from tradutor_core import detect_case_pattern, preserve_elements
+    from tradutor_placeholders import restore_elements
     import tkinter as tk
     
     print("✅ Importação bem-sucedida!")
@@ -57,28 +59,28 @@ try:
     print(f"\n🧪 Testando texto problemático: {repr(test_text)}")
     
     # Testar funções individuais
-    case_pattern = app.detect_case_pattern(test_text)
+    case_pattern = detect_case_pattern(test_text)
     print(f"✅ Padrão de caixa detectado: {case_pattern}")
     
     # Testar preservação de elementos
-    preserved_text, placeholders = app.preserve_elements(test_text, config)
+    preserved_text, placeholders = preserve_elements(test_text, config)
     print(f"✅ Texto preservado: {repr(preserved_text)}")
     print(f"✅ Placeholders: {placeholders}")
     
-    restored_text = app.restore_elements(preserved_text, placeholders)
+    restored_text = restore_elements(preserved_text, placeholders)
     print(f"✅ Texto restaurado: {repr(restored_text)}")
     
     # Testar com texto em maiúsculas também
     test_text2 = "SOL SUL TORRENTÉS"
     print(f"\n🧪 Testando texto em maiúsculas: {repr(test_text2)}")
     
-    case_pattern2 = app.detect_case_pattern(test_text2)
+    case_pattern2 = detect_case_pattern(test_text2)
     print(f"✅ Padrão de caixa detectado: {case_pattern2}")
     
-    preserved_text2, placeholders2 = app.preserve_elements(test_text2, config)
+    preserved_text2, placeholders2 = preserve_elements(test_text2, config)
     print(f"✅ Texto preservado: {repr(preserved_text2)}")
     
-    restored_text2 = app.restore_elements(preserved_text2, placeholders2)
+    restored_text2 = restore_elements(preserved_text2, placeholders2)
     print(f"✅ Texto restaurado: {repr(restored_text2)}")
     
     root.destroy()
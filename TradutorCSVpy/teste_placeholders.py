@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes da preservação de elementos (placeholders)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+O texto mascarado tem de ser o mesmo da versão anterior (legacy_preserve
+de benchmark_placeholders), exceto onde ela trocava um valor dentro de
+outro, e a restauração tem de devolver a célula original.
+
+    python -m unittest teste_placeholders
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_placeholders import CORPUS, check_against_legacy, legacy_preserve, mixed_cell
+from tradutor_core import TranslationConfig, preserve_elements
+from tradutor_placeholders import mask_elements, placeholder_kinds, restore_elements
+
+FUZZ_CELLS = 3000
+
+class LegacyParityTest(unittest.TestCase):
+
+    def test_corpus_matches_legacy(self):
+        for cells in CORPUS.values():
+            for cell in cells:
+                check_against_legacy(cell)
+                check_against_legacy(cell, lambda value: '$' + value)
+
+    def test_random_cells_match_legacy(self):
+        rng = random.Random(1)
+        for currency_handler in (None, lambda value: '$' + value):
+            for _ in range(FUZZ_CELLS):
+                check_against_legacy(mixed_cell(rng), currency_handler)
+
+    def test_value_inside_another_is_not_rewritten(self):
+        # A versão anterior trocava "8,96" também dentro de "218,96"
+        cell = 'De 8,96 por 218,96'
+        _, _, rewrote = legacy_preserve(cell)
+        self.assertTrue(rewrote)
+        masked, placeholders = mask_elements(cell, placeholder_kinds())
+        self.assertEqual(masked, 'De __NUMBER_0__ por __NUMBER_1__')
+        self.assertEqual(restore_elements(masked, placeholders), cell)
+
+class MaskRulesTest(unittest.TestCase):
+
+    def test_repeated_number_keeps_its_placeholder(self):
+        masked, placeholders = mask_elements('2021, 750 ml, safra 2021', placeholder_kinds())
+        self.assertEqual(masked, '__NUMBER_0__, __NUMBER_1__ ml, safra __NUMBER_0__')
+        self.assertEqual(placeholders, {'__NUMBER_0__': '2021', '__NUMBER_1__': '750'})
+
+    def test_numbers_inside_urls_and_emails_stay(self):
+        cell = 'Veja www.loja.com/p/42 ou vendas42@loja.com: 42 itens'
+        masked, placeholders = mask_elements(cell, placeholder_kinds())
+        self.assertEqual(masked, 'Veja __URL_0__ ou __EMAIL_1__: 42 itens')
+        self.assertEqual(restore_elements(masked, placeholders), cell)
+
+    def test_disabled_kinds_are_kept(self):
+        cell = 'https://loja.com.br 10 itens'
+        masked, placeholders = mask_elements(cell, placeholder_kinds(urls=False, numbers=False))
+        self.assertEqual((masked, placeholders), (cell, {}))
+
+    def test_currency_mode_stores_converted_value(self):
+        config = TranslationConfig(number_treatment='change_symbol', target_currency_symbol='$')
+        masked, placeholders = preserve_elements('Por 99,90 BRL à vista', config)
+        self.assertEqual(masked, 'Por __CURRENCY_0__ à vista')
+        self.assertEqual(restore_elements(masked, placeholders), 'Por 99,90 $ à vista')
+
+if __name__ == '__main__':
+    unittest.main()
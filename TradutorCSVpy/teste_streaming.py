@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do modo streaming (backend stub, sem rede)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+A saída do --stream é a referência: pool de workers, motor asyncio,
+--partitions, --dedup, retomada pelo diário e modo incremental têm de
+gravar exatamente os mesmos bytes.
+
+    python -m unittest teste_streaming
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tradutor_core import TranslationConfig, create_translator
+from tradutor_particoes import translate_partitioned
+
+PRODUCTS = ['Vinho tinto', 'Queijo minas', 'Azeite extra virgem', 'Café torrado', 'Doce de leite']
+
+def write_catalog(path: str, rows: int = 300):
+    """Catálogo com textos repetidos, preços, números, URLs e campos vazios"""
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Produto', 'Descrição', 'Preço', 'Site'])
+        for index in range(rows):
+            product = PRODUCTS[index % len(PRODUCTS)]
+            writer.writerow([f"{product} {index % 37}",
+                             f"Leve {index % 5 + 1} unidades, \"oferta\" por tempo limitado" if index % 3 else '',
+                             f"R$ {index % 90},90",
+                             f"https://loja.com.br/p/{index}" if index % 4 == 0 else 'Comprar agora'])
+
+def read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+class StreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.input_file = self.path('catalogo.csv')
+        write_catalog(self.input_file)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder.name, name)
+
+    def translate(self, output_name: str, translator=None, **options) -> str:
+        """Traduz o catálogo em modo streaming; retorna o caminho da saída"""
+        config = TranslationConfig(**dict(dict(target_language='en,es', backend='stub', stream=True,
+                                               stream_window=40), **options))
+        translator = translator or create_translator(config, log=lambda message: None)
+        output_file = self.path(output_name)
+        try:
+            translator.translate_csv(self.input_file, output_file)
+        finally:
+            translator.close()
+        return output_file
+
+class EngineParityTest(StreamTestCase):
+
+    def test_workers_and_asyncio_match_single_worker(self):
+        reference = read_bytes(self.translate('simples.csv'))
+        self.assertEqual(read_bytes(self.translate('workers.csv', max_concurrency=4, batch_size=7)), reference)
+        self.assertEqual(read_bytes(self.translate('async.csv', engine='asyncio', max_concurrency=4,
+                                                   batch_size=7)), reference)
+
+    def test_partitions_match_stream(self):
+        reference = read_bytes(self.translate('simples.csv'))
+        config = TranslationConfig(target_language='en,es', backend='stub', stream=True, stream_window=40)
+        for partitions in (2, 3):
+            output_file = self.path(f'particoes_{partitions}.csv')
+            translate_partitioned(config, self.input_file, output_file, partitions, log=lambda message: None)
+            self.assertEqual(read_bytes(output_file), reference)
+
+class ResumeTest(StreamTestCase):
+
+    def test_interrupted_run_resumes_to_the_same_output(self):
+        reference = read_bytes(self.translate('simples.csv'))
+        output_file = self.path('retomada.csv')
+        config = TranslationConfig(target_language='en,es', backend='stub', stream=True, stream_window=40,
+                                   resume=True)
+
+        def interrupt(data_rows, fraction):
+            if data_rows >= 120:
+                raise KeyboardInterrupt
+
+        translator = create_translator(config, log=lambda message: None)
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                translator.translate_csv_stream(self.input_file, output_file, window_progress=interrupt)
+        finally:
+            translator.close()
+        self.assertTrue(os.path.exists(output_file + '.journal'))
+
+        translator = create_translator(config, log=lambda message: None)
+        try:
+            translator.translate_csv_stream(self.input_file, output_file)
+            # Só as linhas depois da interrupção voltam ao backend
+            resumed_items = translator.backend_items
+        finally:
+            translator.close()
+        self.assertEqual(read_bytes(output_file), reference)
+        self.assertFalse(os.path.exists(output_file + '.journal'))
+
+        translator = create_translator(TranslationConfig(target_language='en,es', backend='stub', stream=True,
+                                                         stream_window=40), log=lambda message: None)
+        try:
+            translator.translate_csv_stream(self.input_file, self.path('completa.csv'))
+            self.assertLess(resumed_items, translator.backend_items)
+        finally:
+            translator.close()
+
+    def test_no_journal_without_opt_in(self):
+        output_file = self.translate('simples.csv')
+        self.assertFalse(os.path.exists(output_file + '.journal'))
+
+class IncrementalTest(StreamTestCase):
+
+    def test_changed_cells_only_go_to_backend(self):
+        output_name = 'incremental.csv'
+        self.translate(output_name, incremental=True)
+
+        # Reexportação com duas células alteradas
+        with open(self.input_file, encoding='utf-8', newline='') as file:
+            rows = list(csv.reader(file))
+        rows[5][0] = 'Vinho branco suave'
+        rows[200][1] = 'Nova descrição do produto'
+        with open(self.input_file, 'w', encoding='utf-8', newline='') as file:
+            csv.writer(file).writerows(rows)
+
+        config = TranslationConfig(target_language='en,es', backend='stub', stream=True, stream_window=40,
+                                   incremental=True)
+        translator = create_translator(config, log=lambda message: None)
+        output_file = self.translate(output_name, translator)
+        self.assertEqual(translator.backend_items, 2 * 2)
+        self.assertGreater(translator.incremental_reused, 0)
+
+        self.assertEqual(read_bytes(output_file), read_bytes(self.translate('completa.csv')))
+
+class DedupTest(StreamTestCase):
+
+    def test_dedup_matches_plain_stream(self):
+        plain = self.translate('simples.csv')
+        planned = self.translate('dedup.csv', dedup=True)
+        self.assertEqual(read_bytes(planned), read_bytes(plain))
+
+    def test_texts_failed_in_planning_are_retried(self):
+        plain = self.translate('simples.csv')
+
+        config = TranslationConfig(target_language='en,es', backend='stub', stream=True, stream_window=40,
+                                   dedup=True, max_retries=1)
+        translator = create_translator(config, log=lambda message: None)
+        plan = translator._plan_translations
+
+        def failing_plan(rows, target_languages):
+            # Backend fora do ar só durante o planejamento
+            translator.backend.error_rate = 1.0
+            try:
+                plan(rows, target_languages)
+            finally:
+                translator.backend.error_rate = 0.0
+
+        translator._plan_translations = failing_plan
+        planned = self.translate('dedup.csv', translator)
+        self.assertEqual(translator.failed_texts, set())
+        self.assertEqual(read_bytes(planned), read_bytes(plain))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tradução em Lote de Arquivos - Vários CSVs em um pool de processos (--batch)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Uma campanha tem dezenas de exportações do Illustrator. Em vez de um
+processo do CLI por arquivo (partida a frio e cache em memória vazio a cada
+um), run_batch distribui os arquivos entre processos de trabalho:
+- cada processo traduz um arquivo por vez e mantém o cache em memória
+  (LRU) de um arquivo para o outro
+- todos usam o mesmo cache persistente (SQLite em modo WAL), então um texto
+  traduzido para um arquivo é um acerto para os demais
+- a falha de um arquivo (ou de um processo) não interrompe os outros
+
+O resultado de cada arquivo vem em um FileResult e o relatório final soma
+arquivos, células, requisições e acertos de cache, com a vazão do lote.
+"""
+
+import collections
+import dataclasses
+import glob
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tradutor_cache import DEFAULT_CACHE_FILE, LRUTranslationCache, PersistentTranslationCache
+
+# Saídas com o nome padrão (<arquivo>_translated_<idiomas>.csv) não entram no lote de uma pasta
+TRANSLATED_MARKER = '_translated_'
+
+# Mensagens do log de um arquivo guardadas para mostrar quando ele falha
+LOG_TAIL_LINES = 5
+
+@dataclass
+class FileResult:
+    """Resultado da tradução de um arquivo do lote"""
+    input_file: str
+    output_file: str
+    ok: bool = False
+    elapsed: float = 0.0
+    input_bytes: int = 0
+    translated_cells: int = 0
+    backend_requests: int = 0
+    backend_items: int = 0
+    memory_hits: int = 0
+    persistent_hits: int = 0
+    failed_texts: int = 0
+    error: str = ''
+    log_tail: List[str] = field(default_factory=list)
+
+def expand_batch(pattern: str) -> List[str]:
+    """
+    Arquivos CSV de uma pasta (sem subpastas) ou de um padrão glob, em ordem
+
+    Na pasta, saídas com o nome padrão de uma execução anterior são
+    ignoradas; um padrão glob é usado como está.
+    """
+    if os.path.isdir(pattern):
+        files = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                 if name.lower().endswith('.csv') and TRANSLATED_MARKER not in name]
+    else:
+        files = glob.glob(pattern, recursive=True)
+    return sorted(path for path in files if os.path.isfile(path))
+
+def batch_output_path(input_file: str, output_dir: str, target_languages: List[str]) -> str:
+    """Saída de um arquivo do lote: nome padrão, ao lado da entrada ou em `output_dir`"""
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    name = f"{base_name}{TRANSLATED_MARKER}{'-'.join(target_languages)}.csv"
+    return os.path.join(output_dir or os.path.dirname(input_file), name)
+
+# Cache em memória do processo de trabalho, mantido entre os arquivos que ele traduz
+_worker_cache: Optional[LRUTranslationCache] = None
+
+def translate_file(config, input_file: str, output_file: str) -> FileResult:
+    """
+    Traduz um arquivo do lote (roda no processo de trabalho)
+
+    Erros viram um FileResult com `ok` falso e o fim do log, para que o
+    arquivo seguinte seja traduzido normalmente.
+    """
+    global _worker_cache
+    # Import local: tradutor_core só é carregado nos processos de trabalho
+    from tradutor_core import create_translator
+
+    log_tail = collections.deque(maxlen=LOG_TAIL_LINES)
+    result = FileResult(input_file, output_file)
+    start = time.perf_counter()
+    try:
+        result.input_bytes = os.path.getsize(input_file)
+        translator = create_translator(config, log=log_tail.append)
+        try:
+            if translator.backend is None:
+                raise RuntimeError(f"backend {config.backend} indisponível")
+            if _worker_cache is None:
+                _worker_cache = translator.translation_cache
+            translator.translation_cache = _worker_cache
+            cache_before = _worker_cache.stats()['hits']
+
+            translator.translate_csv(input_file, output_file)
+
+            result.memory_hits = _worker_cache.stats()['hits'] - cache_before
+            result.translated_cells = translator.translated_cells
+            result.backend_requests = translator.backend_requests
+            result.backend_items = translator.backend_items
+            result.persistent_hits = translator.persistent_cache_hits
+            result.failed_texts = len(translator.failed_texts)
+            result.ok = True
+        finally:
+            translator.close()
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        result.log_tail = list(log_tail)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def batch_config(config, processes: int):
+    """
+    Configuração de cada processo do lote
+
+    O cache persistente é sempre ligado (DEFAULT_CACHE_FILE se a configuração
+    não tiver um) e os limites de taxa são divididos entre os processos, para
+    o total enviado ao backend continuar o mesmo.
+    """
+    return dataclasses.replace(
+        config,
+        cache_file=config.cache_file or DEFAULT_CACHE_FILE,
+        requests_per_second=config.requests_per_second / processes,
+        chars_per_second=config.chars_per_second / processes,
+    )
+
+def summarize(results: List[FileResult], elapsed: float, processes: int) -> Dict:
+    """Relatório do lote: totais, vazão e o resultado de cada arquivo"""
+    done = [result for result in results if result.ok]
+    cells = sum(result.translated_cells for result in done)
+    input_bytes = sum(result.input_bytes for result in done)
+    items = sum(result.backend_items for result in done)
+    hits = sum(result.memory_hits + result.persistent_hits for result in done)
+    return {
+        'files': len(results),
+        'succeeded': len(done),
+        'failed': len(results) - len(done),
+        'processes': processes,
+        'elapsed_seconds': elapsed,
+        'translated_cells': cells,
+        'input_bytes': input_bytes,
+        'backend_requests': sum(result.backend_requests for result in done),
+        'backend_items': items,
+        'memory_hits': sum(result.memory_hits for result in done),
+        'persistent_hits': sum(result.persistent_hits for result in done),
+        'cache_hit_rate': hits / (hits + items) if hits + items else 0.0,
+        'cells_per_second': cells / elapsed if elapsed else 0.0,
+        'files_per_minute': len(done) * 60 / elapsed if elapsed else 0.0,
+        'megabytes_per_second': input_bytes / 1024 / 1024 / elapsed if elapsed else 0.0,
+        'results': [dataclasses.asdict(result) for result in results],
+    }
+
+def run_batch(config, files: List[str], output_dir: str = '', processes: int = 0,
+              log: Callable[[str], None] = print) -> Dict:
+    """
+    Traduz `files` em um pool de processos e retorna o relatório (summarize)
+
+    Args:
+        config: Configuração de cada arquivo (TranslationConfig)
+        files: Arquivos de entrada (ver expand_batch)
+        output_dir: Pasta das saídas (vazio = ao lado de cada entrada)
+        processes: Processos de trabalho (0 = um por núcleo, até o número de arquivos)
+        log: Recebe uma mensagem por arquivo concluído e o resumo final
+    """
+    # Import local: multiprocessing só é carregado quando o lote roda, não
+    # pelo --watch, que usa este módulo só pelo FileResult e pelos nomes de saída
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    processes = max(1, min(processes or os.cpu_count() or 1, len(files)))
+    config = batch_config(config, processes)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    log(f"📦 Lote: {len(files)} arquivos em {processes} processos")
+    log(f"💾 Cache compartilhado: {config.cache_file}")
+
+    # Cria o banco (modo WAL) antes dos processos: a troca do modo de diário
+    # do SQLite falha com "database is locked" se dois processos a fizerem juntos
+    PersistentTranslationCache(config.cache_file).close()
+
+    # No máximo um arquivo em andamento por processo: se um processo morrer, o
+    # pool é recriado e os arquivos que estavam em andamento são repetidos um
+    # de cada vez, para que só o arquivo culpado seja dado como falho
+    queue = collections.deque((input_file, 0) for input_file in files)
+    results: List[FileResult] = []
+    start = time.perf_counter()
+    while queue:
+        isolated = queue[0][1] > 0
+        limit = 1 if isolated else processes
+        executor = ProcessPoolExecutor(max_workers=limit)
+        running: Dict[Future, Tuple[str, int]] = {}
+        broken = False
+        try:
+            while True:
+                while (queue and len(running) < limit and not broken
+                       and (queue[0][1] > 0) == isolated):
+                    input_file, attempt = queue.popleft()
+                    output_file = batch_output_path(input_file, output_dir, config.target_languages)
+                    future = executor.submit(translate_file, config, input_file, output_file)
+                    running[future] = (input_file, attempt)
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    input_file, attempt = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        if attempt == 0:
+                            queue.appendleft((input_file, 1))
+                            continue
+                        result = FileResult(input_file, batch_output_path(input_file, output_dir,
+                                                                          config.target_languages),
+                                            error="processo de trabalho encerrado inesperadamente")
+                    results.append(result)
+                    _log_result(result, len(results), len(files), log)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    report = summarize(results, time.perf_counter() - start, processes)
+    _log_summary(report, log)
+    return report
+
+def _log_result(result: FileResult, done: int, total: int, log: Callable[[str], None]):
+    name = os.path.basename(result.input_file)
+    if result.ok:
+        warning = f", {result.failed_texts} textos sem tradução" if result.failed_texts else ''
+        log(f"✅ [{done}/{total}] {name} → {result.output_file} "
+            f"({result.translated_cells} células, {result.backend_requests} requisições, "
+            f"{result.elapsed:.1f}s{warning})")
+        return
+    log(f"❌ [{done}/{total}] {name}: {result.error}")
+    for line in result.log_tail:
+        log(f"      {line}")
+
+def _log_summary(report: Dict, log: Callable[[str], None]):
+    log(f"📦 Lote concluído: {report['succeeded']}/{report['files']} arquivos traduzidos, "
+        f"{report['failed']} falhas em {report['elapsed_seconds']:.1f}s")
+    log(f"⚡ Vazão: {report['cells_per_second']:.0f} células/s, {report['files_per_minute']:.1f} arquivos/min, "
+        f"{report['megabytes_per_second']:.2f} MB/s")
+    log(f"📡 Requisições ao backend: {report['backend_requests']} ({report['backend_items']} textos)")
+    log(f"🗃️  Acertos de cache: memória {report['memory_hits']}, persistente {report['persistent_hits']} "
+        f"({report['cache_hit_rate']:.0%} dos textos)")
+    for result in report['results']:
+        if not result['ok']:
+            log(f"   ❌ {result['input_file']}: {result['error']}")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tradutor CSV Assíncrono - Motor asyncio para execuções com alta concorrência
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Variante do CSVTranslator que mantém centenas de requisições em voo em um
+único processo. Reaproveita as mesmas etapas de preparação, preservação,
+restauração e moeda; só o envio ao backend muda:
+- backends com cliente assíncrono (google-web, stub) são chamados direto
+  no event loop, limitados por um semáforo de `max_concurrency` requisições
+- os demais rodam no pool de workers (um cliente por thread)
+
+translate_csv continua síncrono: cada instância tem o seu próprio event
+loop, reutilizado entre chamadas para manter o cliente HTTP aquecido.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tradutor_backends import BackendPool, TranslationBackend
+from tradutor_core import CSVTranslator, TranslationConfig
+from tradutor_lotes import PackedRequest
+
+class AsyncCSVTranslator(CSVTranslator):
+    """CSVTranslator com envio assíncrono das requisições ao backend"""
+
+    def __init__(self, config: TranslationConfig, log: Callable[[str], None] = print,
+                 progress: Callable[[int, int], None] = None):
+        super().__init__(config, log, progress)
+        self._loop = asyncio.new_event_loop()
+        self._thread_pool = None
+        # Avisa as tarefas esperando vaga da concorrência adaptativa (criada no event loop)
+        self._slots = None
+
+    def _max_in_flight(self) -> int:
+        """Com cliente assíncrono o limite é só max_concurrency"""
+        if self.backend.supports_async:
+            return max(1, self.config.max_concurrency)
+        return super()._max_in_flight()
+
+    async def _acquire_slot_async(self):
+        """Espera uma vaga da concorrência adaptativa sem bloquear o event loop"""
+        if self.concurrency is None:
+            return
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(self.concurrency.try_acquire)
+
+    async def _release_slot_async(self, started: float, error: Optional[Exception]):
+        """Devolve a vaga e acorda as tarefas que esperam por uma"""
+        if self.concurrency is None:
+            return
+        self._release_slot(started, error)
+        async with self._slots:
+            self._slots.notify_all()
+
+    def _backends(self) -> List[TranslationBackend]:
+        backends = super()._backends()
+        if self._thread_pool is not None:
+            backends += self._thread_pool.clients
+        return backends
+
+    def _get_thread_pool(self) -> BackendPool:
+        """Pool de workers para backends sem cliente assíncrono"""
+        if self._thread_pool is None:
+            workers = min(self.config.max_concurrency, self.backend.limits.max_concurrency)
+            self._thread_pool = BackendPool(self.config, workers)
+        return self._thread_pool
+
+    async def _request_translations_async(self, texts: List[str], target_language: str,
+                                          semaphore: asyncio.Semaphore) -> Optional[List[str]]:
+        """
+        Envia uma requisição ao backend com retry, sem bloquear o event loop
+        
+        Limite de taxa, concorrência adaptativa e espera entre tentativas
+        como em _request_translations, sem bloquear o event loop.
+        Retorna None se todas as tentativas falharem
+        """
+        chars = sum(len(text) for text in texts)
+        for attempt in range(self.config.max_retries):
+            translated = None
+            error = None
+            async with semaphore:
+                await self._acquire_slot_async()
+                wait = self.rate_limiter.reserve(chars)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                started = time.monotonic()
+                try:
+                    self._count_request(texts, chars)
+                    if self.backend.supports_async:
+                        translated = await self.backend.translate_batch_async(
+                            texts,
+                            src=self.config.source_language,
+                            dest=target_language
+                        )
+                    else:
+                        future = self._get_thread_pool().submit(
+                            lambda backend, batch: backend.translate_batch(batch,
+                                                                          src=self.config.source_language,
+                                                                          dest=target_language),
+                            texts
+                        )
+                        translated = await asyncio.wrap_future(future)
+                except Exception as e:
+                    error = e
+                self._record_latency(started)
+                await self._release_slot_async(started, error)
+
+            if translated and all(translated):
+                return translated
+
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+
+        return None
+
+    async def _send_requests_async(self, tasks: List[Tuple[str, PackedRequest]]) -> List[Optional[List[str]]]:
+        """Envia todas as requisições com no máximo `max_concurrency` em voo"""
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
+        done = 0
+        
+        async def tracked(language: str, request: PackedRequest) -> Optional[List[str]]:
+            nonlocal done
+            response = await self._request_translations_async(request.texts, language, semaphore)
+            done += 1
+            self._report_progress(done, len(tasks))
+            return response
+        
+        responses = await asyncio.gather(*(tracked(language, request) for language, request in tasks))
+        return list(responses)
+
+    async def translate_cells_multi(self, cells: List[str], target_languages: List[str]) -> Dict[str, List[str]]:
+        """
+        Traduz as células para vários idiomas, com todas as requisições concorrentes
+
+        Textos que outra tarefa já está enviando (single-flight) são
+        esperados sem bloquear o event loop.
+        """
+        jobs = self._prepare_jobs(cells, target_languages)
+        try:
+            responses = await self._send_requests_async(self._job_tasks(jobs))
+        except BaseException:
+            self._abandon_flights(jobs)
+            raise
+        waiting = self._publish_flights(jobs, responses)
+        if waiting:
+            await asyncio.gather(*(asyncio.wrap_future(flight) for flight in waiting))
+        return self._finish_jobs(jobs, responses)
+
+    async def translate_cells(self, cells: List[str]) -> List[str]:
+        """
+        Traduz várias células com requisições assíncronas concorrentes
+
+        Mesmo contrato de _translate_cells: a ordem das células é mantida e
+        células cujo lote falhar ficam com o texto original.
+        """
+        target_language = self.config.target_languages[0]
+        return (await self.translate_cells_multi(cells, [target_language]))[target_language]
+
+    def _send_requests(self, tasks: List[Tuple[str, PackedRequest]]) -> List[Optional[List[str]]]:
+        """Wrapper síncrono usado por translate_csv"""
+        return self._loop.run_until_complete(self._send_requests_async(tasks))
+
+    def close(self):
+        """Fecha o cliente assíncrono, o pool de workers e o event loop"""
+        if self.backend is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.backend.aclose())
+        if self._thread_pool is not None:
+            self._thread_pool.close()
+            self._thread_pool = None
+        super().close()
+        if not self._loop.is_closed():
+            self._loop.close()
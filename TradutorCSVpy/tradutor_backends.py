@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de Tradução - Motores plugáveis usados pelo Tradutor CSV
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Define a interface comum dos motores de tradução (tradução individual e em
+lote, com limites declarados) e as implementações disponíveis:
+- googletrans: Google Translate via biblioteca googletrans
+- google-web: endpoint web do Google via HTTP direto (conexões keep-alive, cliente assíncrono com httpx)
+- stub: motor local determinístico, sem rede, para benchmarks e testes de carga
+
+As bibliotecas de rede (googletrans, httpx, http.client) e o asyncio só
+são importados quando um backend é criado ou usado: --help, --create-config
+e a abertura da interface não pagam esse custo.
+"""
+
+import collections
+import dataclasses
+import importlib.util
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Só procura o pacote; a importação (com httpx) fica para GoogleTransBackend
+GOOGLETRANS_AVAILABLE = importlib.util.find_spec('googletrans') is not None
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Separador entre textos unidos em uma só requisição (ver GoogleTransBackend.translate_batch)
+BATCH_SEPARATOR = '\n__SEP_{}__\n'
+BATCH_SEPARATOR_PATTERN = re.compile(r'\s*__\s*SEP_(\d+)\s*__\s*', re.IGNORECASE)
+
+GOOGLE_WEB_URL = 'https://translate.googleapis.com/translate_a/single'
+
+def join_batch(texts: List[str]) -> str:
+    """Une vários textos em um só, com separadores numerados entre eles"""
+    return texts[0] + ''.join(BATCH_SEPARATOR.format(index) + text
+                              for index, text in enumerate(texts[1:], start=1))
+
+def split_batch(translated: str, count: int) -> Optional[List[str]]:
+    """
+    Divide um texto traduzido por join_batch de volta em partes
+    Retorna None se algum separador se perdeu na tradução
+    """
+    parts = BATCH_SEPARATOR_PATTERN.split(translated)
+    indices = [int(index) for index in parts[1::2]]
+    if indices != list(range(1, count)):
+        return None
+    return parts[0::2]
+
+@dataclass
+class BackendLimits:
+    """Limites declarados por um backend de tradução"""
+    max_chars_per_request: int = 5000
+    max_items_per_request: int = 100
+    max_concurrency: int = 1
+    # Caracteres extras por item de um lote (separadores)
+    item_overhead_chars: int = 0
+
+class BackendError(Exception):
+    """
+    Erro ao chamar um backend de tradução
+
+    `status` é o código HTTP da resposta (quando houver), `retry_after` o
+    tempo de espera pedido pelo servidor, em segundos, e `timeout` indica
+    que o servidor não respondeu a tempo.
+    """
+
+    def __init__(self, message: str, status: int = None, retry_after: float = None, timeout: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.timeout = timeout
+
+    @property
+    def throttled(self) -> bool:
+        """O servidor pediu para diminuir o ritmo (429)"""
+        return self.status == 429
+
+    @property
+    def congested(self) -> bool:
+        """Sinal de sobrecarga do servidor: 429, 503 ou timeout"""
+        return self.throttled or self.status == 503 or self.timeout
+
+    @property
+    def retryable(self) -> bool:
+        """Vale tentar de novo: falhas de rede, 408, 429 e 5xx (outros 4xx não)"""
+        return self.status is None or self.status in (408, 429) or self.status >= 500
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos de espera"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    import email.utils
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+class TranslationBackend:
+    """Interface base para motores de tradução"""
+
+    name = 'base'
+    # Backends com cliente assíncrono nativo implementam translate_batch_async
+    supports_async = False
+
+    def __init__(self):
+        self.limits = BackendLimits()
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        """Traduz um texto individual"""
+        raise NotImplementedError
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """
+        Traduz vários textos em uma única requisição
+
+        A implementação padrão faz uma chamada por texto; backends que aceitam
+        listas devem sobrescrever este método.
+        """
+        return [self.translate(text, src, dest) for text in texts]
+
+    async def translate_batch_async(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """Versão assíncrona de translate_batch (quando supports_async)"""
+        raise NotImplementedError
+
+    def close(self):
+        """Libera recursos do backend"""
+        pass
+
+    async def aclose(self):
+        """Libera recursos assíncronos do backend"""
+        pass
+
+    def connection_stats(self) -> Optional[Dict]:
+        """Contadores de conexões HTTP deste backend (HTTPStats.snapshot), se ele usar HTTP direto"""
+        return None
+
+class GoogleTransBackend(TranslationBackend):
+    """Backend baseado na biblioteca googletrans"""
+
+    name = 'googletrans'
+
+    def __init__(self):
+        super().__init__()
+        try:
+            from googletrans import Translator
+        except ImportError as e:
+            raise BackendError("googletrans não está instalado. Execute: pip install googletrans==4.0.0rc1") from e
+
+        # Endpoint web do Google aceita ~5000 caracteres por requisição
+        self.limits = BackendLimits(max_chars_per_request=5000, max_items_per_request=100, max_concurrency=4,
+                                    item_overhead_chars=len(BATCH_SEPARATOR.format(100)))
+        self.translator = Translator()
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        result = self.translator.translate(text, src=src, dest=dest)
+        if not result or not result.text:
+            raise BackendError("Resposta vazia do Google Translate")
+        return result.text
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """
+        Traduz vários textos em uma única requisição HTTP
+
+        O googletrans faz uma requisição por item quando recebe uma lista,
+        então os textos são unidos com separadores numerados e o resultado
+        é dividido de volta. Se algum separador se perder na tradução, cada
+        texto é traduzido individualmente.
+        """
+        if len(texts) == 1:
+            return [self.translate(texts[0], src, dest)]
+
+        parts = split_batch(self.translate(join_batch(texts), src, dest), len(texts))
+        if parts is None:
+            return [self.translate(text, src, dest) for text in texts]
+        return parts
+
+class GoogleWebBackend(TranslationBackend):
+    """
+    Backend HTTP direto no endpoint web do Google
+
+    Não depende do googletrans: a versão síncrona usa um pool de conexões
+    persistentes compartilhado pelos workers (tradutor_http.py) e a
+    assíncrona usa httpx.AsyncClient, permitindo centenas de requisições em
+    voo em um único processo (ver tradutor_async.py). Com `http2` e o httpx
+    com h2 instalados, os dois caminhos usam clientes httpx em HTTP/2.
+    """
+
+    name = 'google-web'
+
+    def __init__(self, base_url: str = GOOGLE_WEB_URL, timeout: float = 10.0, max_connections: int = 100,
+                 keepalive: float = 30.0, http2: bool = False):
+        super().__init__()
+        self.limits = BackendLimits(max_chars_per_request=5000, max_items_per_request=100, max_concurrency=64,
+                                    item_overhead_chars=len(BATCH_SEPARATOR.format(100)))
+        self.base_url = base_url or GOOGLE_WEB_URL
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive = keepalive
+        self.http2 = http2 and importlib.util.find_spec('h2') is not None and self.supports_async
+        self._async_client = None
+        self._client = None
+        self._connection_pool = None
+        # Requisições deste worker; as conexões abertas/reaproveitadas vêm do pool
+        self._http_stats = None
+
+    @property
+    def http_stats(self):
+        if self._http_stats is None:
+            from tradutor_http import HTTPStats
+            self._http_stats = HTTPStats()
+        return self._http_stats
+
+    def connection_stats(self) -> Optional[Dict]:
+        return self._http_stats.snapshot() if self._http_stats is not None else None
+
+    @property
+    def supports_async(self) -> bool:
+        return importlib.util.find_spec('httpx') is not None
+
+    def _url(self, src: str, dest: str) -> str:
+        query = urllib.parse.urlencode([('client', 'gtx'), ('sl', src), ('tl', dest), ('dt', 't')])
+        return f"{self.base_url}?{query}"
+
+    @staticmethod
+    def _parse(payload: str) -> str:
+        """Extrai o texto traduzido da resposta JSON do endpoint"""
+        try:
+            data = json.loads(payload)
+            text = ''.join(part[0] for part in data[0] if part and part[0])
+        except (ValueError, TypeError, IndexError) as e:
+            raise BackendError(f"Resposta inválida do Google Translate: {e}") from e
+        if not text:
+            raise BackendError("Resposta vazia do Google Translate")
+        return text
+
+    def _get_connection_pool(self):
+        """Pool de conexões keep-alive da origem, compartilhado com os outros workers"""
+        if self._connection_pool is None:
+            from tradutor_http import connection_pool, origin_of
+            self._connection_pool = connection_pool(origin_of(self.base_url), self.max_connections,
+                                                    self.keepalive, self.timeout)
+        return self._connection_pool
+
+    def _httpx_options(self) -> Dict:
+        """Limites do pool, keep-alive e HTTP/2 para os clientes httpx"""
+        import httpx
+
+        # httpx < 0.18 usa PoolLimits/pool_limits; versões novas usam Limits/limits
+        keepalive = self.max_connections if self.keepalive > 0 else 0
+        if hasattr(httpx, 'Limits'):
+            options = {'limits': httpx.Limits(max_connections=self.max_connections,
+                                              max_keepalive_connections=keepalive)}
+        else:
+            options = {'pool_limits': httpx.PoolLimits(hard_limit=self.max_connections, soft_limit=keepalive)}
+        if self.http2:
+            options['http2'] = True
+        return options
+
+    def _get_client(self):
+        """Cliente httpx síncrono deste worker (só com http2)"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.Client(timeout=self.timeout, **self._httpx_options())
+        return self._client
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        if self.http2:
+            return self._translate_httpx(text, src, dest)
+
+        import http.client
+
+        body = urllib.parse.urlencode([('q', text)]).encode('utf-8')
+        headers = {'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'}
+        try:
+            status, response_headers, data = self._get_connection_pool().request(
+                'POST', self._url(src, dest), body=body, headers=headers, stats=self.http_stats)
+        except TimeoutError as e:
+            raise BackendError("Tempo esgotado aguardando o Google Translate", timeout=True) from e
+        except (OSError, http.client.HTTPException) as e:
+            raise BackendError(f"Falha de conexão: {e}") from e
+        if status != 200:
+            raise BackendError(f"HTTP {status} do Google Translate", status=status,
+                               retry_after=parse_retry_after(response_headers.get('Retry-After')))
+        return self._parse(data.decode('utf-8'))
+
+    def _translate_httpx(self, text: str, src: str, dest: str) -> str:
+        try:
+            response = self._get_client().post(self._url(src, dest), data={'q': text})
+        except Exception as e:
+            raise BackendError(f"Falha de conexão: {e}", timeout='Timeout' in type(e).__name__) from e
+        return self._handle_httpx_response(response)
+
+    def _handle_httpx_response(self, response) -> str:
+        self.http_stats.count(requests=1)
+        self.http_stats.count_version(response.http_version)
+        if response.status_code != 200:
+            raise BackendError(f"HTTP {response.status_code} do Google Translate", status=response.status_code,
+                               retry_after=parse_retry_after(response.headers.get('Retry-After')))
+        return self._parse(response.text)
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        if len(texts) == 1:
+            return [self.translate(texts[0], src, dest)]
+
+        parts = split_batch(self.translate(join_batch(texts), src, dest), len(texts))
+        if parts is None:
+            return [self.translate(text, src, dest) for text in texts]
+        return parts
+
+    def _get_async_client(self):
+        """Cria sob demanda o cliente httpx assíncrono (deve rodar dentro do event loop)"""
+        if self._async_client is None:
+            import httpx
+            self._async_client = httpx.AsyncClient(timeout=self.timeout, **self._httpx_options())
+        return self._async_client
+
+    async def translate_async(self, text: str, src: str, dest: str) -> str:
+        client = self._get_async_client()
+        try:
+            response = await client.post(self._url(src, dest), data={'q': text})
+        except Exception as e:
+            # httpx.TimeoutException e subclasses (ReadTimeout, ConnectTimeout...)
+            raise BackendError(f"Falha de conexão: {e}", timeout='Timeout' in type(e).__name__) from e
+        return self._handle_httpx_response(response)
+
+    async def translate_batch_async(self, texts: List[str], src: str, dest: str) -> List[str]:
+        if len(texts) == 1:
+            return [await self.translate_async(texts[0], src, dest)]
+
+        parts = split_batch(await self.translate_async(join_batch(texts), src, dest), len(texts))
+        if parts is None:
+            import asyncio
+            return list(await asyncio.gather(*(self.translate_async(text, src, dest) for text in texts)))
+        return parts
+
+    def close(self):
+        # O pool de conexões é compartilhado e continua aberto para a próxima execução
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+class SimulatedEndpoint:
+    """
+    Servidor simulado do backend stub
+
+    Com `max_rps`, aceita no máximo essa quantidade de requisições em
+    qualquer janela de um segundo e recusa as demais com 429. Com
+    `capacity`, atende essa quantidade de requisições ao mesmo tempo na
+    latência normal; acima disso a latência cresce na proporção das
+    requisições em voo, como um servidor sobrecarregado.
+
+    É compartilhado por todos os clientes stub do processo com os mesmos
+    limites (ver stub_endpoint), como os workers reais compartilham o
+    mesmo endpoint do Google.
+    """
+
+    def __init__(self, max_rps: float = 0.0, capacity: int = 0):
+        self.max_rps = max_rps
+        self.capacity = capacity
+        self.in_flight = 0
+        self._accepted = collections.deque()
+        self._lock = threading.Lock()
+
+    def admit(self) -> Optional[float]:
+        """Registra uma requisição; se recusada, retorna os segundos até abrir uma vaga"""
+        if self.max_rps <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            while self._accepted and now - self._accepted[0] >= 1.0:
+                self._accepted.popleft()
+            if len(self._accepted) >= self.max_rps:
+                return 1.0 - (now - self._accepted[0])
+            self._accepted.append(now)
+            return None
+
+    def begin(self, latency: float) -> float:
+        """Marca uma requisição em voo e retorna a latência dela com a carga atual"""
+        with self._lock:
+            self.in_flight += 1
+            load = self.in_flight / self.capacity if self.capacity > 0 else 1.0
+        return latency * max(1.0, load)
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+@lru_cache(maxsize=None)
+def stub_endpoint(max_rps: float, capacity: int = 0) -> SimulatedEndpoint:
+    """Servidor simulado compartilhado pelos clientes stub com os mesmos limites"""
+    return SimulatedEndpoint(max_rps, capacity)
+
+class StubBackend(TranslationBackend):
+    """
+    Backend local determinístico, sem rede
+
+    Devolve o texto prefixado com o idioma de destino (ex.: "[en] Olá"),
+    simulando latência por requisição e uma taxa de erro configurável.
+    Requisições acima do limite de caracteres declarado são rejeitadas,
+    como faria o endpoint real.
+    Os erros são sorteados com semente fixa, então a mesma execução sempre
+    falha nas mesmas chamadas.
+
+    Para testar o controle de fluxo, o stub também responde HTTP 429: uma
+    fração sorteada das requisições (`throttle_rate`) e tudo o que passar de
+    `max_rps` requisições por segundo no servidor simulado, sempre com
+    Retry-After. Com `capacity`, a latência cresce quando há mais de
+    `capacity` requisições em voo no servidor simulado.
+    """
+
+    name = 'stub'
+
+    supports_async = True
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 max_chars_per_request: int = 5000, max_concurrency: int = 64,
+                 throttle_rate: float = 0.0, max_rps: float = 0.0, retry_after: float = 1.0,
+                 capacity: int = 0):
+        super().__init__()
+        self.limits = BackendLimits(max_chars_per_request=max_chars_per_request,
+                                    max_items_per_request=100,
+                                    max_concurrency=max_concurrency)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.endpoint = stub_endpoint(max_rps, capacity) if max_rps > 0 or capacity > 0 else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # Contadores para benchmarks
+        self.requests = 0
+        self.items = 0
+        self.chars = 0
+        self.throttled = 0
+
+    def _register_request(self, texts: List[str]) -> bool:
+        """
+        Contabiliza uma requisição e sorteia se ela vai falhar
+        Requisições recusadas pelo limite de taxa levantam BackendError 429
+        """
+        with self._lock:
+            self.requests += 1
+            self.items += len(texts)
+            self.chars += sum(len(text) for text in texts)
+            failed = self._random.random() < self.error_rate
+            # Só sorteia quando ativo, para não mudar a sequência dos erros simulados
+            throttled = self.throttle_rate > 0 and self._random.random() < self.throttle_rate
+
+        chars = sum(len(text) for text in texts)
+        if chars > self.limits.max_chars_per_request:
+            raise BackendError(f"Requisição com {chars} caracteres excede o limite de "
+                               f"{self.limits.max_chars_per_request}", status=413)
+
+        retry_after = self.retry_after if throttled else None
+        if retry_after is None and self.endpoint is not None:
+            retry_after = self.endpoint.admit()
+        if retry_after is not None:
+            with self._lock:
+                self.throttled += 1
+            raise BackendError("HTTP 429 simulado pelo backend stub", status=429, retry_after=retry_after)
+
+        return failed
+
+    def _simulate_request(self, texts: List[str]):
+        """Simula latência e falhas de uma requisição"""
+        failed = self._register_request(texts)
+
+        if self.endpoint is not None:
+            latency = self.endpoint.begin(self.latency)
+            try:
+                time.sleep(latency)
+            finally:
+                self.endpoint.end()
+        elif self.latency > 0:
+            time.sleep(self.latency)
+
+        if failed:
+            raise BackendError("Falha simulada pelo backend stub")
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        self._simulate_request([text])
+        return f"[{dest}] {text}"
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        self._simulate_request(texts)
+        return [f"[{dest}] {text}" for text in texts]
+
+    async def translate_batch_async(self, texts: List[str], src: str, dest: str) -> List[str]:
+        import asyncio
+
+        failed = self._register_request(texts)
+
+        if self.endpoint is not None:
+            latency = self.endpoint.begin(self.latency)
+            try:
+                await asyncio.sleep(latency)
+            finally:
+                self.endpoint.end()
+        elif self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        if failed:
+            raise BackendError("Falha simulada pelo backend stub")
+        return [f"[{dest}] {text}" for text in texts]
+
+BACKENDS: Dict[str, Type[TranslationBackend]] = {
+    GoogleTransBackend.name: GoogleTransBackend,
+    GoogleWebBackend.name: GoogleWebBackend,
+    StubBackend.name: StubBackend,
+}
+
+def create_backend(config) -> TranslationBackend:
+    """Cria o backend de tradução selecionado na configuração"""
+    if config.backend not in BACKENDS:
+        raise BackendError(f"Backend desconhecido: {config.backend} (disponíveis: {', '.join(BACKENDS)})")
+
+    if config.backend == StubBackend.name:
+        return StubBackend(latency=config.stub_latency,
+                           error_rate=config.stub_error_rate,
+                           seed=config.stub_seed,
+                           throttle_rate=config.stub_throttle_rate,
+                           max_rps=config.stub_max_rps,
+                           capacity=config.stub_capacity)
+
+    if config.backend == GoogleWebBackend.name:
+        return GoogleWebBackend(base_url=config.backend_url,
+                                max_connections=config.http_pool_size,
+                                keepalive=config.http_keepalive,
+                                http2=config.http2)
+
+    return BACKENDS[config.backend]()
+
+class BackendPool:
+    """
+    Pool de threads com um cliente de backend por worker
+
+    O cliente do googletrans não é thread-safe, então cada thread do pool
+    cria (na primeira chamada) e reutiliza o seu próprio backend. Os
+    resultados de map() saem na mesma ordem dos itens de entrada.
+    """
+
+    def __init__(self, config, workers: int):
+        self.config = config
+        self.workers = max(1, workers)
+        self.clients: List[TranslationBackend] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tradutor')
+
+    def backend(self) -> TranslationBackend:
+        """Retorna o backend da thread atual, criando-o se necessário"""
+        client = getattr(self._local, 'backend', None)
+        if client is None:
+            with self._lock:
+                # Semente diferente por worker para o backend stub não repetir as mesmas falhas
+                worker_config = dataclasses.replace(self.config, stub_seed=self.config.stub_seed + len(self.clients))
+                client = create_backend(worker_config)
+                self.clients.append(client)
+            self._local.backend = client
+        return client
+
+    def submit(self, func: Callable[[TranslationBackend, T], R], item: T) -> 'Future[R]':
+        """Agenda func(backend, item) em um worker do pool"""
+        return self._executor.submit(lambda: func(self.backend(), item))
+
+    def imap(self, func: Callable[[TranslationBackend, T], R], items: Iterable[T]) -> Iterator[R]:
+        """Executa func(backend, item) em paralelo, devolvendo resultados em ordem"""
+        return self._executor.map(lambda item: func(self.backend(), item), items)
+
+    def map(self, func: Callable[[TranslationBackend, T], R], items: Iterable[T]) -> List[R]:
+        return list(self.imap(func, items))
+
+    def close(self):
+        """Encerra as threads e libera os clientes"""
+        self._executor.shutdown(wait=True)
+        for client in self.clients:
+            client.close()
+        self.clients = []
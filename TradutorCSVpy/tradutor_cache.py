@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de Traduções - Cache em memória (LRU) e armazenamento persistente
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+LRUTranslationCache limita o cache em memória por número de entradas e por
+bytes, com chaves compactas (hash) e contadores de acertos, faltas e remoções.
+
+PersistentTranslationCache guarda as traduções finais (já restauradas e com moeda tratada) em um
+arquivo SQLite, para que reexportações do Illustrator não traduzam de novo
+os mesmos nomes de produto, slogans e textos legais. A chave combina texto
+de origem, idiomas e os campos da configuração que alteram a saída.
+
+O banco usa modo WAL, então vários processos do CLI podem ler e gravar o
+mesmo arquivo ao mesmo tempo.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.traduzai', 'cache_traducoes.sqlite3')
+
+# Campos da configuração que mudam o texto final de uma tradução
+OUTPUT_CONFIG_FIELDS = (
+    'backend',
+    'preserve_numbers',
+    'preserve_urls',
+    'preserve_emails',
+    'convert_currency',
+    'currency_symbol',
+    'currency_conversion_rate',
+    'number_treatment',
+    'source_currency_symbol',
+    'target_currency_symbol',
+    'case_mode',
+)
+
+# Limite de parâmetros por consulta em versões antigas do SQLite
+MAX_QUERY_PARAMS = 900
+
+def config_fingerprint(config) -> str:
+    """Resume os campos da configuração que afetam a saída"""
+    values = {field: getattr(config, field) for field in OUTPUT_CONFIG_FIELDS if hasattr(config, field)}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def cache_key(text: str, source_language: str, target_language: str, fingerprint: str) -> str:
+    """Chave compacta de uma tradução"""
+    payload = json.dumps([text, source_language, target_language, fingerprint], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def memory_key(text: str, source_language: str, target_language: str) -> bytes:
+    """Chave compacta (16 bytes) do cache em memória"""
+    payload = f"{source_language}\x00{target_language}\x00{text}".encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+class LRUTranslationCache:
+    """
+    Cache de traduções em memória com limite de entradas e de bytes
+
+    Quando algum dos limites é ultrapassado, as entradas usadas há mais
+    tempo são removidas. Seguro para uso entre threads.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._data: 'OrderedDict[bytes, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    @staticmethod
+    def _entry_size(key: bytes, value: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Retorna a tradução e a marca como usada recentemente"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: str):
+        """Armazena uma tradução, removendo as menos usadas se preciso"""
+        size = self._entry_size(key, value)
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= self._entry_size(key, previous)
+
+            self._data[key] = value
+            self.bytes += size
+
+            while self._data and (len(self._data) > self.max_entries or self.bytes > self.max_bytes):
+                old_key, old_value = self._data.popitem(last=False)
+                self.bytes -= self._entry_size(old_key, old_value)
+                self.evictions += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        """Verifica a presença sem alterar contadores nem a ordem de uso"""
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        """Contadores para dimensionar o cache"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+class PersistentTranslationCache:
+    """Cache de traduções em SQLite (modo WAL), seguro entre threads e processos"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual (sqlite3 não compartilha conexões entre threads)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Busca várias chaves de uma vez (uma consulta por bloco de chaves)"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        connection = self._connection()
+
+        for start in range(0, len(keys), MAX_QUERY_PARAMS):
+            chunk = keys[start:start + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            rows = connection.execute(
+                f'SELECT key, translated_text FROM translations WHERE key IN ({placeholders})', chunk
+            )
+            found.update(rows)
+
+        return found
+
+    def put_many(self, entries: List[Tuple[str, str, str, str, str, str]]):
+        """
+        Grava várias traduções em uma única transação
+        Cada entrada: (chave, idioma origem, idioma destino, fingerprint, texto, tradução)
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO translations '
+                '(key, source_language, target_language, fingerprint, source_text, translated_text, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [entry + (now,) for entry in entries]
+            )
+
+    def info(self) -> Dict:
+        """Resumo do conteúdo do cache"""
+        connection = self._connection()
+        total = connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        pairs = connection.execute(
+            'SELECT source_language, target_language, COUNT(*) FROM translations '
+            'GROUP BY source_language, target_language ORDER BY COUNT(*) DESC'
+        ).fetchall()
+
+        size = sum(os.path.getsize(self.path + suffix)
+                   for suffix in ('', '-wal', '-shm') if os.path.exists(self.path + suffix))
+
+        return {
+            'path': self.path,
+            'entries': total,
+            'size_bytes': size,
+            'language_pairs': {f"{src}->{dest}": count for src, dest, count in pairs},
+        }
+
+    def clear(self) -> int:
+        """Remove todas as traduções e retorna quantas foram apagadas"""
+        with self._connection() as connection:
+            removed = connection.execute('DELETE FROM translations').rowcount
+        connection = self._connection()
+        connection.execute('VACUUM')
+        connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return removed
+
+    def close(self):
+        """Fecha as conexões abertas por todas as threads"""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
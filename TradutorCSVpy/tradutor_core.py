@@ -0,0 +1,1551 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Núcleo de Tradução - Motor compartilhado pelo CLI e pela interface gráfica
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Reúne a configuração (TranslationConfig) e o motor de tradução
+(CSVTranslator): preservação de elementos, caixa, moeda, cache, lotes,
+concorrência e streaming. tradutor_csv.py e tradutor_csv_gui.py são apenas
+front ends deste módulo, então cada recurso de desempenho vale para os dois.
+
+Todas as expressões regulares são compiladas uma única vez, na importação.
+"""
+
+import contextlib
+import csv
+import json
+import re
+import os
+import threading
+import time
+from concurrent.futures import Future
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional
+from dataclasses import dataclass
+
+from tradutor_backends import BackendError, BackendPool, TranslationBackend, create_backend
+from tradutor_cache import (LRUTranslationCache, PersistentTranslationCache, cache_key,
+                            config_fingerprint, memory_key)
+from tradutor_estatisticas import RunStats, format_seconds, histogram_lines, stage_lines
+from tradutor_diario import TranslationJournal, file_hash, journal_path
+from tradutor_incremental import ManifestWriter, cell_hash, load_previous_translations
+from tradutor_fluxo import AdaptiveConcurrency, RateLimiter, backoff_delay
+from tradutor_lotes import (FlightClaim, InFlightRegistry, PackedRequest, dedupe_texts, pack_requests,
+                            unpack_results)
+from tradutor_placeholders import RESTORE_PATTERN, mask_elements, placeholder_kinds, restore_elements
+
+# Textos únicos traduzidos por etapa no planejamento de deduplicação
+PLAN_CHUNK_TEXTS = 5000
+
+# Expressões usadas pelo motor, compiladas uma única vez
+PATTERNS = {
+    'currency': re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)\s*(?:R\$|BRL|reais?)?', re.IGNORECASE),
+    'number': re.compile(r'\b\d+(?:[,\.]\d+)*\b'),
+    'url': re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+', re.IGNORECASE),
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'quotes': re.compile(r'["""\'\'`]'),
+    'punctuation': re.compile(r'[\.!?;:,\-—–…]'),
+    'parentheses': re.compile(r'[\(\)\[\]{}]'),
+    # Célula que é só um valor (provável preço) e valor dentro de um texto
+    'price': re.compile(r'^\s*\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?\s*$'),
+    'amount': re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)'),
+    # Símbolos de moeda trocados no modo 'change_symbol'
+    'currency_symbol': re.compile(r'\b(?:R\$|BRL|reais|real|\$|USD|€|EUR)\b', re.IGNORECASE),
+    # Letras: textos sem letras fora dos placeholders não vão ao backend
+    'letter': re.compile(r'[^\W\d_]'),
+}
+
+# Medição desligada (config.stats falso): um único context manager vazio
+NO_TIMER = contextlib.nullcontext()
+
+# Tratamento de números e moeda (number_treatment):
+#   'price'            - células de preço recebem currency_symbol (convertidas com convert_currency)
+#   'preserve'         - números preservados como estão
+#   'convert_currency' - valores com símbolo de moeda convertidos pela taxa, com target_currency_symbol
+#   'change_symbol'    - valores com símbolo de moeda só trocam para target_currency_symbol
+NUMBER_TREATMENTS = ('price', 'preserve', 'convert_currency', 'change_symbol')
+
+@dataclass
+class TranslationConfig:
+    """Configurações para tradução"""
+    source_language: str = 'pt'
+    target_language: str = 'en'
+    currency_symbol: str = '$'
+    convert_currency: bool = False
+    currency_conversion_rate: float = 1.0
+    preserve_numbers: bool = True
+    preserve_urls: bool = True
+    preserve_emails: bool = True
+    max_retries: int = 3
+    # Máximo de células enviadas por requisição ao backend
+    batch_size: int = 50
+    # Requisições simultâneas ao backend (threads de trabalho)
+    max_concurrency: int = 1
+    # Motor de execução: 'threads' (pool de workers) ou 'asyncio'
+    engine: str = 'threads'
+    # Arquivo SQLite do cache persistente (vazio = desativado)
+    cache_file: str = ''
+    # Limites do cache em memória (LRU)
+    memory_cache_entries: int = 10000
+    memory_cache_mb: float = 64.0
+    # Motor de tradução ('googletrans', 'google-web' ou 'stub')
+    backend: str = 'googletrans'
+    stub_latency: float = 0.0
+    stub_error_rate: float = 0.0
+    stub_seed: int = 0
+    # Backend stub: fração de respostas 429 e limite de requisições por segundo do servidor simulado
+    stub_throttle_rate: float = 0.0
+    stub_max_rps: float = 0.0
+    # Backend stub: requisições simultâneas atendidas sem aumento de latência (0 = sem limite)
+    stub_capacity: int = 0
+    # Backend google-web: URL do endpoint (vazio = Google), conexões no pool,
+    # segundos que uma conexão ociosa fica aberta (0 = uma conexão por requisição) e HTTP/2
+    backend_url: str = ''
+    http_pool_size: int = 100
+    http_keepalive: float = 30.0
+    http2: bool = False
+    # Ajustar as requisições em voo automaticamente (AIMD), até max_concurrency
+    adaptive_concurrency: bool = False
+    # Limite de taxa compartilhado por todos os workers (0 = sem limite)
+    requests_per_second: float = 0.0
+    chars_per_second: float = 0.0
+    # Espera entre tentativas: recuo exponencial com jitter, em segundos
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    # Modo streaming: traduz todas as linhas de dados, janela a janela
+    stream: bool = False
+    # Linhas de dados por janela do modo streaming
+    stream_window: int = 500
+    # Modo streaming: passada prévia que traduz cada texto único do arquivo uma vez
+    dedup: bool = False
+    # Diário ao lado da saída (<saída>.journal) para retomar execuções interrompidas;
+    # desligado por padrão: custa o SHA-256 da entrada e um fsync por janela
+    journal: bool = False
+    # Retomar a partir do diário de uma execução anterior com a mesma entrada e
+    # configuração (também grava o diário, então vale já na primeira execução)
+    resume: bool = False
+    # Copiar da saída anterior as traduções das células que não mudaram (manifesto <saída>.manifest)
+    incremental: bool = False
+    # Medir o tempo de cada etapa e a latência do backend (--stats)
+    stats: bool = False
+    # Tratamento de números e moeda (ver NUMBER_TREATMENTS)
+    number_treatment: str = 'price'
+    source_currency_symbol: str = 'R$'
+    target_currency_symbol: str = '$'
+    # Caixa do original reaplicada à tradução: 'upper' (só caixa alta) ou
+    # 'full' (caixa alta, baixa e título)
+    case_mode: str = 'upper'
+    
+    @property
+    def target_languages(self) -> List[str]:
+        """Idiomas de destino (target_language aceita vários separados por vírgula)"""
+        return [language.strip() for language in self.target_language.split(',') if language.strip()]
+
+@dataclass
+class PendingTranslation:
+    """Célula preparada, aguardando resposta do backend"""
+    text: str
+    modified_text: str
+    placeholders: Dict[str, str]
+    case_pattern: str
+    cache_key: bytes
+    target_language: str
+
+@dataclass
+class TranslationJob:
+    """Tradução de uma linha para um idioma de destino"""
+    target_language: str
+    results: List[str]
+    pending_cells: List[Tuple[int, PendingTranslation]]
+    requests: List[PackedRequest]
+    # Posição de cada célula pendente na lista de textos únicos empacotados
+    unique_positions: List[int]
+    # Single-flight: textos únicos enviados por esta chamada e os que esperam outra
+    claim: Optional[FlightClaim] = None
+    # Tradução de cada texto único (preenchida por _publish_flights)
+    translations: Optional[List[Optional[str]]] = None
+
+def is_likely_price(text: str) -> bool:
+    """Verifica se é provável que o texto seja um preço"""
+    return PATTERNS['price'].match(text) is not None
+
+def detect_case_pattern(text: str) -> str:
+    """Detecta o padrão de caixa do texto original"""
+    if text.isupper():
+        return "UPPER"
+    elif text.islower():
+        return "LOWER"
+    elif text.istitle():
+        return "TITLE"
+    else:
+        return "MIXED"
+
+def apply_case_pattern(translated_text: str, original_pattern: str) -> str:
+    """Aplica o padrão de caixa do texto original ao texto traduzido"""
+    if original_pattern == "UPPER":
+        return translated_text.upper()
+    elif original_pattern == "LOWER":
+        return translated_text.lower()
+    elif original_pattern == "TITLE":
+        return translated_text.title()
+    else:
+        return translated_text
+
+def convert_currency_value(currency_text: str, config: TranslationConfig) -> str:
+    """Converte um valor monetário pela taxa, com o símbolo de destino"""
+    match = PATTERNS['amount'].search(currency_text)
+    if not match:
+        return currency_text
+    
+    # Normalizar formato (converter vírgula para ponto)
+    try:
+        converted_value = float(match.group(1).replace(',', '.')) * config.currency_conversion_rate
+    except ValueError:
+        # Se não conseguir converter, apenas troca símbolo
+        return change_currency_symbol(currency_text, config)
+    
+    if config.target_currency_symbol in ['$', 'USD']:
+        return f"${converted_value:.2f}"
+    elif config.target_currency_symbol in ['€', 'EUR']:
+        return f"€{converted_value:.2f}"
+    return f"{config.target_currency_symbol}{converted_value:.2f}"
+
+def change_currency_symbol(currency_text: str, config: TranslationConfig) -> str:
+    """Troca o símbolo de moeda sem converter o valor"""
+    return PATTERNS['currency_symbol'].sub(lambda match: config.target_currency_symbol, currency_text)
+
+def preserve_elements(text: str, config: TranslationConfig) -> Tuple[str, Dict[str, str]]:
+    """
+    Preserva URLs, emails, moedas e números substituindo por placeholders
+    Retorna o texto modificado e um dicionário de mapeamento
+    
+    Nos modos 'convert_currency' e 'change_symbol' o placeholder de cada
+    valor monetário já guarda o valor convertido (ou com o novo símbolo).
+    """
+    currency_handler = None
+    if config.number_treatment == 'convert_currency':
+        currency_handler = lambda value: convert_currency_value(value, config)
+    elif config.number_treatment == 'change_symbol':
+        currency_handler = lambda value: change_currency_symbol(value, config)
+    
+    kinds = placeholder_kinds(urls=config.preserve_urls,
+                              emails=config.preserve_emails,
+                              currency=currency_handler is not None,
+                              numbers=config.preserve_numbers or currency_handler is not None)
+    return mask_elements(text, kinds, currency_handler)
+
+def needs_backend(modified_text: str) -> bool:
+    """Verifica se sobra algo para traduzir fora dos placeholders"""
+    return PATTERNS['letter'].search(RESTORE_PATTERN.sub('', modified_text)) is not None
+
+class CSVTranslator:
+    """Classe principal para tradução de arquivos CSV"""
+    
+    def __init__(self, config: TranslationConfig, log: Callable[[str], None] = print,
+                 progress: Callable[[int, int], None] = None):
+        """
+        Args:
+            config: Configurações da tradução
+            log: Recebe as mensagens de andamento (padrão: print)
+            progress: Chamado com (requisições concluídas, total) a cada resposta do backend
+        """
+        self.config = config
+        self.log = log
+        self.progress = progress
+        self.backend = None
+        self.pool = None
+        self.translation_cache = LRUTranslationCache(config.memory_cache_entries,
+                                                     int(config.memory_cache_mb * 1024 * 1024))
+        self.backend_requests = 0
+        # Células que a tradução alterou (resumo e relatório do modo --batch)
+        self.translated_cells = 0
+        # Itens e caracteres enviados, novas tentativas e requisições que falharam de vez
+        self.backend_items = 0
+        self.backend_chars = 0
+        self.backend_retries = 0
+        self.failed_requests = 0
+        # Contadores e estado da execução que chamadas simultâneas alteram juntas
+        # (diário e gravações do cache persistente pendentes, textos que falharam,
+        # contagem do incremental)
+        self._counter_lock = threading.Lock()
+        
+        # Tempo por etapa e latência do backend (só com `stats`)
+        self.stats = RunStats() if config.stats else None
+        
+        # Limite de taxa compartilhado pelos workers e respostas 429 recebidas
+        self.rate_limiter = RateLimiter(config.requests_per_second, config.chars_per_second)
+        self.throttled_responses = 0
+        self.retry_wait_seconds = 0.0
+        self.concurrency = None
+        
+        # Deduplicação: células pendentes x textos únicos enviados ao backend
+        self.dedup_cells = 0
+        self.dedup_unique = 0
+        # Single-flight: textos em andamento no backend, compartilhados entre
+        # chamadas simultâneas, e quantos deixaram de ser enviados de novo
+        self.in_flight = InFlightRegistry()
+        self.in_flight_collapsed = 0
+        # Traduções resolvidas pelo planejamento do arquivo inteiro (--dedup)
+        # e pelo diário de uma execução interrompida (--resume)
+        self.planned_translations: Dict[bytes, str] = {}
+        
+        # Diário da execução atual e traduções concluídas ainda não registradas
+        self.journal = None
+        self._journal_writes: Dict[str, List[Tuple[str, str]]] = {}
+        
+        # Modo incremental: traduções da execução anterior por hash da célula,
+        # manifesto da execução atual e textos cuja tradução falhou
+        self.previous_translations: Dict[str, Dict[str, str]] = {}
+        self.manifest = None
+        self.failed_texts = set()
+        self.incremental_cells = 0
+        self.incremental_reused = 0
+        
+        # Cache persistente compartilhado entre execuções
+        self.persistent_cache = None
+        self.persistent_cache_hits = 0
+        self._cache_fingerprint = config_fingerprint(config)
+        self._cache_writes = []
+        if config.cache_file:
+            self.persistent_cache = PersistentTranslationCache(config.cache_file)
+        self.patterns = PATTERNS
+        
+        try:
+            self.backend = create_backend(config)
+        except BackendError as e:
+            self.log(f"⚠️  {e}")
+        
+        # Concorrência adaptativa: o limite de requisições em voo varia entre 1 e o máximo
+        if config.adaptive_concurrency and self.backend is not None:
+            self.concurrency = AdaptiveConcurrency(self._max_in_flight())
+    
+    def _max_in_flight(self) -> int:
+        """Máximo de requisições simultâneas ao backend"""
+        return max(1, min(self.config.max_concurrency, self.backend.limits.max_concurrency))
+    
+    def _concurrency_label(self) -> str:
+        """Limite atual de requisições em voo, para as mensagens de andamento"""
+        if self.concurrency is None:
+            return ''
+        return f" (concorrência: {self.concurrency.current}/{self.concurrency.max_limit})"
+    
+    def measure(self, stage: str):
+        """
+        Context manager que mede o bloco como uma chamada da etapa `stage`
+        Sem `stats` na configuração não mede nada
+        """
+        if self.stats is None:
+            return NO_TIMER
+        return self.stats.timer(stage)
+    
+    def _preserve_elements(self, text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Preserva elementos específicos do texto substituindo por placeholders
+        Retorna o texto modificado e um dicionário de mapeamento
+        """
+        return preserve_elements(text, self.config)
+    
+    def _detect_case_pattern(self, text: str) -> str:
+        """Detecta o padrão de caixa considerado pelo case_mode configurado"""
+        pattern = detect_case_pattern(text)
+        if self.config.case_mode != 'full' and pattern != "UPPER":
+            return "MIXED"
+        return pattern
+    
+    def _apply_case_pattern(self, translated_text: str, original_pattern: str) -> str:
+        """Aplica o padrão de caixa do texto original ao texto traduzido"""
+        return apply_case_pattern(translated_text, original_pattern)
+    
+    def _preserve_csv_quotes(self, text: str) -> Tuple[str, bool]:
+        """Preserva aspas e formatação CSV"""
+        # Verificar se o texto está entre aspas
+        if text.startswith('"') and text.endswith('"'):
+            # Remover aspas para tradução, mas lembrar de recolocar
+            return text[1:-1], True
+        return text, False
+    
+    def _restore_elements(self, translated_text: str, placeholders: Dict[str, str]) -> str:
+        """Restaura elementos preservados no texto traduzido"""
+        return restore_elements(translated_text, placeholders)
+    
+    def _convert_currency(self, text: str) -> str:
+        """Converte valores monetários conforme configuração"""
+        def currency_replacer(match):
+            value_str = match.group(1)
+            
+            # Normalizar formato de número (converter vírgula para ponto)
+            normalized_value = value_str.replace(',', '.')
+            
+            try:
+                value = float(normalized_value)
+                
+                if self.config.convert_currency:
+                    converted_value = value * self.config.currency_conversion_rate
+                    return f"{self.config.currency_symbol}{converted_value:.2f}"
+                else:
+                    # Apenas trocar símbolo, manter formato original
+                    return f"{self.config.currency_symbol}{value_str}"
+                    
+            except ValueError:
+                # Se não conseguir converter, mantém original com novo símbolo
+                return f"{self.config.currency_symbol}{value_str}"
+        
+        return self.patterns['currency'].sub(currency_replacer, text)
+    
+    def _handle_currency_in_text(self, text: str) -> str:
+        """Trata especificamente valores monetários no texto (modo 'price')"""
+        if self.config.number_treatment != 'price':
+            return text
+        
+        # Se há um padrão de preço (números isolados que parecem preços)
+        if self.patterns['amount'].search(text) and len(text.strip()) < 20:  # Provavelmente um preço
+            return self._convert_currency(text)
+        
+        return text
+    
+    def _memory_key(self, text: str, target_language: str) -> bytes:
+        """Chave do cache em memória"""
+        return memory_key(text, self.config.source_language, target_language)
+    
+    def _persistent_key(self, text: str, target_language: str) -> str:
+        """Chave do cache persistente (inclui a configuração que afeta a saída)"""
+        return cache_key(text, self.config.source_language, target_language, self._cache_fingerprint)
+    
+    def _load_persistent_cache(self, texts: List[str], target_language: str):
+        """Aquece o cache em memória com uma única consulta ao cache persistente"""
+        if self.persistent_cache is None:
+            return
+        
+        missing = {}
+        for text in texts:
+            if text and text.strip():
+                key = self._memory_key(text, target_language)
+                if key not in self.translation_cache:
+                    missing[self._persistent_key(text, target_language)] = key
+        
+        if not missing:
+            return
+        
+        found = self.persistent_cache.get_many(missing)
+        for key, translated in found.items():
+            self.translation_cache.put(missing[key], translated)
+        with self._counter_lock:
+            self.persistent_cache_hits += len(found)
+    
+    def _flush_persistent_cache(self):
+        """Grava no cache persistente as traduções novas, em uma transação"""
+        if self.persistent_cache is not None and self._cache_writes:
+            # Troca a lista sob a trava: outra chamada simultânea pode continuar acrescentando
+            with self._counter_lock:
+                writes, self._cache_writes = self._cache_writes, []
+            if writes:
+                self.persistent_cache.put_many(writes)
+    
+    def open_journal(self, input_file: str, output_file: str, layout: str = 'csv') -> Optional[TranslationJournal]:
+        """
+        Abre o diário da execução ao lado do arquivo de saída
+        
+        Com `resume`, um diário anterior da mesma entrada e configuração é
+        reaproveitado: as traduções registradas passam a valer como
+        planejadas e o chamador pula as linhas já gravadas (rows_done,
+        output_bytes). `layout` distingue front ends que gravam a saída de
+        formas diferentes. Retorna None sem `journal` nem `resume`.
+        """
+        if not (self.config.journal or self.config.resume):
+            return None
+        
+        header = {
+            'input': file_hash(input_file),
+            'config': self._cache_fingerprint,
+            'source': self.config.source_language,
+            'languages': self.config.target_languages,
+            'stream': self.config.stream,
+            'layout': layout,
+        }
+        journal = TranslationJournal(journal_path(output_file), header, resume=self.config.resume)
+        
+        if journal.mismatch:
+            self.log(f"⚠️  Diário {journal.path} é de outra entrada ou configuração: recomeçando do início")
+        elif journal.resumed:
+            for (language, text), translated in journal.translations.items():
+                self.planned_translations[self._memory_key(text, language)] = translated
+            self.log(f"⏯️  Retomando: {journal.rows_done} linhas de dados já gravadas, "
+                     f"{len(journal.translations)} traduções no diário")
+            journal.translations.clear()
+        elif self.config.resume:
+            self.log(f"ℹ️  Nenhum diário em {journal.path}: começando do início")
+        
+        self.journal = journal
+        return journal
+    
+    def start_incremental(self, output_file: str, layout: str = 'csv'):
+        """
+        Modo incremental: carrega as traduções da execução anterior e abre o manifesto desta
+        
+        Deve ser chamado antes de a saída anterior ser sobrescrita. Numa
+        retomada (--resume) a saída já foi sobrescrita em parte: as células
+        copiadas antes da queda estão no diário e o restante é traduzido.
+        """
+        if not self.config.incremental:
+            return
+        
+        header = {
+            'config': self._cache_fingerprint,
+            'source': self.config.source_language,
+            'languages': self.config.target_languages,
+            'stream': self.config.stream,
+            'layout': layout,
+        }
+        if self.journal is not None and self.journal.resumed:
+            self.log("ℹ️  Incremental: retomada usa as traduções do diário")
+        else:
+            translations, message = load_previous_translations(output_file, header)
+            if translations is None:
+                self.log(f"ℹ️  Incremental: {message}, traduzindo tudo")
+            else:
+                self.previous_translations = translations
+                self.log(f"♻️  Incremental: {message}")
+        
+        self.manifest = ManifestWriter(output_file, header)
+    
+    def record_manifest_rows(self, rows: Iterable[List[str]]):
+        """Registra no manifesto as linhas de dados gravadas na saída"""
+        if self.manifest is not None:
+            self.manifest.add_rows(rows, self.failed_texts)
+    
+    def skip_written_rows(self, rows: Iterator[List[str]], count: int):
+        """Retomada: pula as linhas de dados já gravadas, registrando-as no manifesto"""
+        skipped = islice(rows, count)
+        if self.manifest is not None:
+            self.record_manifest_rows(skipped)
+        else:
+            next(islice(skipped, count, count), None)
+    
+    def finish_incremental(self):
+        """Publica o manifesto e mostra quantas células foram reaproveitadas"""
+        if self.manifest is None:
+            return
+        self.manifest.commit()
+        self.manifest = None
+        if self.incremental_cells:
+            self.log(f"♻️  Incremental: {self.incremental_reused} de {self.incremental_cells} traduções "
+                     f"(células × idiomas) reaproveitadas da execução anterior, "
+                     f"{self.incremental_cells - self.incremental_reused} novas ou alteradas")
+    
+    def _record_journal(self, target_language: str, text: str, translated: str):
+        """Guarda uma tradução concluída para o próximo registro no diário"""
+        with self._counter_lock:
+            self._journal_writes.setdefault(target_language, []).append((text, translated))
+    
+    def _flush_journal(self):
+        """Registra no diário as traduções concluídas desde o último lote"""
+        if self.journal is not None and self._journal_writes:
+            # Troca o dicionário antes de gravar: outra chamada simultânea pode continuar acrescentando
+            with self._counter_lock:
+                writes, self._journal_writes = self._journal_writes, {}
+            for language, items in writes.items():
+                self.journal.record_cells(language, items)
+    
+    def close_journal(self, completed: bool = False):
+        """Fecha o diário; uma execução completa apaga o arquivo"""
+        if self.journal is not None:
+            self._flush_journal()
+            self.journal.close(completed)
+            self.journal = None
+    
+    def reset_run_state(self):
+        """
+        Prepara o tradutor para outro arquivo sem perder o que está aquecido
+    
+        Usado por processos de longa duração (--watch): zera os contadores e o
+        estado de uma execução (planejamento, modo incremental, diário e
+        manifesto de uma execução que falhou), mas mantém o backend, o pool de
+        workers, a conexão do cache persistente e o cache em memória.
+        """
+        self.close_journal()
+        if self.manifest is not None:
+            self.manifest.discard()
+            self.manifest = None
+        with self._counter_lock:
+            self.backend_requests = 0
+            self.translated_cells = 0
+            self.backend_items = 0
+            self.backend_chars = 0
+            self.backend_retries = 0
+            self.failed_requests = 0
+            self.throttled_responses = 0
+            self.retry_wait_seconds = 0.0
+            self.dedup_cells = 0
+            self.dedup_unique = 0
+            self.in_flight_collapsed = 0
+            self._journal_writes = {}
+            self.failed_texts = set()
+            self.incremental_cells = 0
+            self.incremental_reused = 0
+            self.persistent_cache_hits = 0
+        self.stats = RunStats() if self.config.stats else None
+        self.planned_translations = {}
+        self.previous_translations = {}
+
+    def take_failed_texts(self) -> Set[str]:
+        """Retira os textos sem tradução acumulados até agora (chamadas concorrentes do serviço)"""
+        with self._counter_lock:
+            failed, self.failed_texts = self.failed_texts, set()
+        return failed
+
+    def _print_cache_stats(self):
+        """Mostra os contadores do cache em memória"""
+        stats = self.translation_cache.stats()
+        self.log(f"🧠 Cache em memória: {stats['hits']} acertos, {stats['misses']} faltas "
+                 f"({stats['hit_rate']:.0%}), {stats['evictions']} remoções, "
+                 f"{stats['entries']}/{stats['max_entries']} entradas, "
+                 f"{stats['bytes'] / 1024:.1f}/{stats['max_bytes'] / 1024:.0f} KB")
+    
+    def stats_report(self) -> Dict:
+        """
+        Relatório da execução para --stats-file (JSON)
+        
+        Tempos por etapa e histograma da latência do backend (com `stats`),
+        requisições, caracteres, novas tentativas e acertos de cada cache.
+        """
+        report = self.stats.summary() if self.stats is not None else {}
+        counters = report.pop('counters', {})
+        cache = self.translation_cache.stats()
+        report['requests'] = {
+            'sent': self.backend_requests,
+            'items': self.backend_items,
+            'chars': self.backend_chars,
+            'retries': self.backend_retries,
+            'failed': self.failed_requests,
+            'throttled': self.throttled_responses,
+            'retry_wait_seconds': self.retry_wait_seconds,
+            'rate_limit_waits': self.rate_limiter.waits,
+            'rate_limit_wait_seconds': self.rate_limiter.wait_seconds,
+        }
+        report['cache'] = {
+            'memory_hits': cache['hits'],
+            'memory_misses': cache['misses'],
+            'memory_hit_rate': cache['hit_rate'],
+            'persistent_hits': self.persistent_cache_hits,
+            'planned_hits': counters.get('planned_hits', 0),
+            'incremental_reused': self.incremental_reused,
+        }
+        report['dedup'] = {'pending_cells': self.dedup_cells, 'unique_texts': self.dedup_unique,
+                           'in_flight_collapsed': self.in_flight_collapsed}
+        http = self.http_stats()
+        if http is not None:
+            report['http'] = http
+        return report
+    
+    def _backends(self) -> List[TranslationBackend]:
+        """Backend principal e os clientes de cada worker"""
+        backends = [self.backend] if self.backend is not None else []
+        if self.pool is not None:
+            backends += self.pool.clients
+        return backends
+    
+    def http_stats(self) -> Optional[Dict]:
+        """Requisições e conexões HTTP (abertas, reaproveitadas) somadas entre os workers"""
+        snapshots = [stats for stats in (backend.connection_stats() for backend in self._backends()) if stats]
+        if not snapshots:
+            return None
+        from tradutor_http import HTTPStats
+        return HTTPStats.combine(snapshots)
+    
+    def _print_http_stats(self):
+        """Mostra o reaproveitamento de conexões HTTP (backends HTTP diretos)"""
+        stats = self.http_stats()
+        if stats is None or not stats['requests']:
+            return
+        versions = ', '.join(f"{version}: {count}" for version, count in sorted(stats['http_versions'].items()))
+        if not stats['connections_opened'] and not stats['reused']:
+            # Clientes httpx (HTTP/2, asyncio) não expõem as conexões
+            self.log(f"🔌 Conexões HTTP: {stats['requests']} requisições ({versions})")
+            return
+        self.log(f"🔌 Conexões HTTP: {stats['requests']} requisições, {stats['connections_opened']} conexões abertas, "
+                 f"{stats['reused']} reaproveitadas ({stats['reuse_rate']:.0%}), "
+                 f"{stats['expired']} expiradas, {stats['stale']} reabertas ({versions})")
+    
+    def print_stats(self):
+        """Mostra no log o tempo por etapa, a latência do backend e os contadores (--stats)"""
+        report = self.stats_report()
+        if 'stages' in report:
+            self.log(f"📊 Estatísticas da execução ({format_seconds(report['elapsed_seconds'])}):")
+            for line in stage_lines(report):
+                self.log(line)
+            if 'backend' in report['stages']:
+                self.log("   (tempos do backend somam todos os workers)")
+            if 'planejamento' in report['stages']:
+                self.log("   (o planejamento inclui as etapas que ele chama)")
+        
+        requests = report['requests']
+        self.log(f"📡 Backend: {requests['sent']} requisições ({requests['items']} itens, "
+                 f"{requests['chars']} caracteres), {requests['retries']} novas tentativas, "
+                 f"{requests['failed']} falhas, {requests['throttled']} respostas 429")
+        cache = report['cache']
+        self.log(f"🗃️  Acertos de cache: memória {cache['memory_hits']} ({cache['memory_hit_rate']:.0%}), "
+                 f"persistente {cache['persistent_hits']}, planejamento/diário {cache['planned_hits']}, "
+                 f"incremental {cache['incremental_reused']}")
+        
+        histogram = histogram_lines(report.get('backend_latency_histogram', []))
+        if histogram:
+            self.log("⏱️  Latência do backend por tentativa:")
+            for line in histogram:
+                self.log(line)
+    
+    def write_stats(self, path: str):
+        """Grava stats_report() em JSON (--stats-file)"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.stats_report(), file, indent=2, ensure_ascii=False)
+            file.write('\n')
+    
+    def _is_price_cell(self, text: str) -> bool:
+        """Célula de preço tratada sem tradução (modo 'price')"""
+        return self.config.number_treatment == 'price' and is_likely_price(text)
+    
+    def _is_translatable(self, text: str) -> bool:
+        """Verifica se o texto precisa ir ao backend (não vazio e não é preço)"""
+        return bool(text and text.strip()) and not self._is_price_cell(text)
+    
+    def _print_dedup_stats(self):
+        """Mostra quantas células pendentes foram resolvidas por textos repetidos"""
+        if self.dedup_cells:
+            self.log(f"🧮 Deduplicação: {self.dedup_cells} células pendentes → {self.dedup_unique} textos únicos "
+                     f"({self.dedup_cells / max(1, self.dedup_unique):.1f}x, "
+                     f"{1 - self.dedup_unique / self.dedup_cells:.0%} a menos no backend)")
+        if self.in_flight_collapsed:
+            self.log(f"🛬 Single-flight: {self.in_flight_collapsed} textos aguardaram a resposta de uma "
+                     f"requisição que já estava em andamento, em vez de irem de novo ao backend")
+    
+    def _print_flow_stats(self):
+        """Mostra as esperas do limite de taxa, das novas tentativas e a concorrência adaptativa"""
+        limiter = self.rate_limiter
+        if limiter.waits or self.throttled_responses or self.retry_wait_seconds:
+            self.log(f"🚦 Controle de fluxo: {limiter.waits} esperas no limite de taxa ({limiter.wait_seconds:.1f}s), "
+                     f"{self.throttled_responses} respostas 429, {self.retry_wait_seconds:.1f}s entre tentativas")
+        if self.concurrency is not None:
+            concurrency = self.concurrency
+            self.log(f"📶 Concorrência adaptativa: limite final {concurrency.current}, "
+                     f"máximo atingido {concurrency.peak_limit} de {concurrency.max_limit}, "
+                     f"{concurrency.decreases} reduções")
+    
+    def _prepare_text(self, text: str, target_language: str,
+                      preserved: Dict[str, Tuple[str, Dict[str, str]]] = None
+                      ) -> Tuple[Optional[str], Optional[PendingTranslation]]:
+        """
+        Prepara um texto para tradução
+        Retorna (resultado, None) quando o texto não precisa ir ao backend
+        ou (None, pendente) com os elementos já preservados
+        
+        `preserved` guarda o resultado de _preserve_elements por texto, para
+        que cada célula seja preservada uma única vez entre vários idiomas.
+        """
+        if not text or not text.strip():
+            return text, None
+        
+        if self._is_price_cell(text):
+            with self.measure('moeda'):
+                return self._handle_currency_in_text(text), None
+        
+        # Célula igual à da execução anterior: copiar a tradução que está na saída
+        if self.previous_translations:
+            previous = self.previous_translations.get(cell_hash(text))
+            reused = previous is not None and target_language in previous
+            with self._counter_lock:
+                self.incremental_cells += 1
+                self.incremental_reused += reused
+            if reused:
+                if self.journal is not None:
+                    self._record_journal(target_language, text, previous[target_language])
+                return previous[target_language], None
+        
+        # Verificar planejamento e cache
+        key = self._memory_key(text, target_language)
+        result = self.planned_translations.get(key)
+        if result is not None:
+            if self.stats is not None:
+                self.stats.count('planned_hits')
+            return result, None
+        result = self.translation_cache.get(key)
+        if result is not None:
+            return result, None
+        
+        if not self.backend:
+            self.log(f"⚠️  Tradução não disponível para: {text[:50]}...")
+            return text, None
+        
+        # Preservar elementos específicos
+        if preserved is not None and text in preserved:
+            modified_text, placeholders = preserved[text]
+        else:
+            with self.measure('preservacao'):
+                modified_text, placeholders = self._preserve_elements(text)
+            if preserved is not None:
+                preserved[text] = (modified_text, placeholders)
+        
+        # Detectar a caixa no texto já preservado (URLs e emails não contam)
+        pending = PendingTranslation(text, modified_text, placeholders, self._detect_case_pattern(modified_text),
+                                     key, target_language)
+        
+        # Só placeholders, números e pontuação: nada para o backend traduzir
+        if not needs_backend(modified_text):
+            return self._finish_text(pending, modified_text), None
+        
+        return None, pending
+    
+    def _finish_text(self, pending: PendingTranslation, translated: str) -> str:
+        """Aplica caixa, restauração e moeda a um texto devolvido pelo backend"""
+        # Aplicar a caixa do original antes de restaurar URLs e emails
+        translated = self._apply_case_pattern(translated, pending.case_pattern)
+        
+        # Restaurar elementos preservados
+        with self.measure('restauracao'):
+            translated = self._restore_elements(translated, pending.placeholders)
+        
+        # Converter moedas se necessário
+        with self.measure('moeda'):
+            translated = self._handle_currency_in_text(translated)
+        
+        # Armazenar no cache
+        self.translation_cache.put(pending.cache_key, translated)
+        if self.journal is not None:
+            self._record_journal(pending.target_language, pending.text, translated)
+        if self.persistent_cache is not None:
+            write = (self._persistent_key(pending.text, pending.target_language),
+                     self.config.source_language,
+                     pending.target_language,
+                     self._cache_fingerprint,
+                     pending.text,
+                     translated)
+            with self._counter_lock:
+                self._cache_writes.append(write)
+        
+        return translated
+    
+    def _get_pool(self) -> Optional[BackendPool]:
+        """Cria sob demanda o pool de workers, se houver concorrência configurada"""
+        workers = self._max_in_flight()
+        if workers <= 1:
+            return None
+        
+        if self.pool is None:
+            if workers < self.config.max_concurrency:
+                self.log(f"ℹ️  Backend {self.backend.name} aceita até {workers} requisições simultâneas")
+            self.pool = BackendPool(self.config, workers)
+        return self.pool
+    
+    def close(self):
+        """Encerra o pool de workers e libera os backends"""
+        # Execução interrompida: o diário fica para um --resume e o manifesto anterior é mantido
+        self.close_journal()
+        if self.manifest is not None:
+            self.manifest.discard()
+            self.manifest = None
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.backend is not None:
+            self.backend.close()
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+    
+    def _retry_delay(self, attempt: int, error: Optional[Exception]) -> Optional[float]:
+        """
+        Decide se a requisição que falhou deve ser repetida
+        
+        Retorna a espera antes da próxima tentativa (recuo exponencial com
+        jitter, pelo menos o Retry-After do servidor) ou None para desistir:
+        última tentativa ou erro que não adianta repetir (4xx exceto 408/429).
+        Um Retry-After pausa o limite de taxa para todos os workers.
+        """
+        retry_after = None
+        if isinstance(error, BackendError):
+            if error.throttled:
+                with self._counter_lock:
+                    self.throttled_responses += 1
+            retry_after = error.retry_after
+            if not error.retryable:
+                self.log(f"❌ Erro na tradução (sem nova tentativa): {error}")
+                with self._counter_lock:
+                    self.failed_requests += 1
+                return None
+        
+        if attempt >= self.config.max_retries - 1:
+            reason = error if error is not None else "resposta vazia"
+            self.log(f"❌ Erro na tradução após {self.config.max_retries} tentativas: {reason}")
+            with self._counter_lock:
+                self.failed_requests += 1
+            return None
+        
+        if retry_after is not None:
+            self.rate_limiter.pause(retry_after)
+        delay = backoff_delay(attempt, self.config.backoff_base, self.config.backoff_max, retry_after)
+        with self._counter_lock:
+            self.retry_wait_seconds += delay
+            self.backend_retries += 1
+        self.log(f"⚠️  Tentativa {attempt + 1} falhou"
+                 f"{f' ({error})' if error is not None else ''}, nova tentativa em {delay:.1f}s...")
+        return delay
+    
+    def _count_request(self, texts: List[str], chars: int):
+        """Contabiliza uma tentativa enviada ao backend"""
+        with self._counter_lock:
+            self.backend_requests += 1
+            self.backend_items += len(texts)
+            self.backend_chars += chars
+    
+    def _record_latency(self, started: float):
+        """Registra a latência de uma tentativa (time.monotonic() do envio) com `stats`"""
+        if self.stats is not None:
+            self.stats.record('backend', time.monotonic() - started)
+    
+    def _release_slot(self, started: float, error: Optional[Exception]):
+        """Devolve a vaga da concorrência adaptativa com o resultado da tentativa"""
+        if self.concurrency is None:
+            return
+        congested = isinstance(error, BackendError) and error.congested
+        self.concurrency.release(started, time.monotonic() - started,
+                                 congested=congested, failed=error is not None)
+    
+    def _request_translations(self, texts: List[str], backend: TranslationBackend = None,
+                              target_language: str = None) -> Optional[List[str]]:
+        """
+        Envia uma requisição ao backend com retry
+        
+        Cada tentativa passa antes pelo limite de taxa compartilhado e, com
+        `adaptive_concurrency`, espera uma vaga do limite AIMD; entre
+        tentativas espera o recuo calculado por _retry_delay.
+        Retorna None se todas as tentativas falharem
+        """
+        backend = backend or self.backend
+        target_language = target_language or self.config.target_language
+        chars = sum(len(text) for text in texts)
+        
+        for attempt in range(self.config.max_retries):
+            # Vaga antes do limite de taxa: uma pausa por Retry-After vale também
+            # para quem já estava na fila por uma vaga
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+            self.rate_limiter.acquire(chars)
+            started = time.monotonic()
+            translated = None
+            error = None
+            try:
+                self._count_request(texts, chars)
+                if len(texts) == 1:
+                    translated = [backend.translate(texts[0],
+                                                    src=self.config.source_language,
+                                                    dest=target_language)]
+                else:
+                    translated = backend.translate_batch(texts,
+                                                         src=self.config.source_language,
+                                                         dest=target_language)
+            except Exception as e:
+                error = e
+            self._record_latency(started)
+            self._release_slot(started, error)
+            
+            if translated and all(translated):
+                return translated
+            
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                return None
+            time.sleep(delay)
+        
+        return None
+    
+    def _prepare_cells(self, cells: List[str], target_language: str,
+                       preserved: Dict[str, Tuple[str, Dict[str, str]]] = None
+                       ) -> Tuple[List[str], List[Tuple[int, PendingTranslation]]]:
+        """
+        Prepara as células de uma linha para um idioma de destino
+        Retorna os resultados já resolvidos (preço, cache, vazias) e a lista
+        de células pendentes com seus índices
+        """
+        results = list(cells)
+        pending_cells = []
+        
+        self._load_persistent_cache(cells, target_language)
+        
+        for index, cell in enumerate(cells):
+            result, pending = self._prepare_text(cell, target_language, preserved)
+            if pending is None:
+                results[index] = result
+            else:
+                pending_cells.append((index, pending))
+        
+        return results, pending_cells
+    
+    def _pack_cells(self, pending_cells: List[Tuple[int, PendingTranslation]], target_language: str
+                    ) -> Tuple[List[PackedRequest], List[int], Optional[FlightClaim]]:
+        """
+        Empacota os textos pendentes até o limite de caracteres do backend
+        
+        Textos repetidos (já com placeholders) vão uma única vez e textos que
+        outra chamada simultânea já está enviando ficam esperando por ela;
+        retorna as requisições, a posição de cada célula na lista de textos
+        únicos e a reserva no registro single-flight.
+        """
+        if not pending_cells:
+            return [], [], None
+        
+        unique_texts, unique_positions = dedupe_texts([pending.modified_text for _, pending in pending_cells])
+        with self._counter_lock:
+            self.dedup_cells += len(pending_cells)
+            self.dedup_unique += len(unique_texts)
+        
+        claim = self.in_flight.claim(target_language, unique_texts)
+        self._count_collapsed(claim)
+        
+        limits = self.backend.limits
+        requests = pack_requests([unique_texts[position] for position in claim.led],
+                                 max_chars=limits.max_chars_per_request,
+                                 max_items=max(1, min(self.config.batch_size, limits.max_items_per_request)),
+                                 item_overhead=limits.item_overhead_chars)
+        # Trechos apontam para a posição na lista de textos únicos
+        if claim.waiting:
+            for request in requests:
+                for segment in request.segments:
+                    segment.cell_index = claim.led[segment.cell_index]
+        return requests, unique_positions, claim
+    
+    def _count_collapsed(self, claim: FlightClaim):
+        if claim.waiting:
+            with self._counter_lock:
+                self.in_flight_collapsed += len(claim.waiting)
+    
+    def _finish_cells(self, results: List[str], pending_cells: List[Tuple[int, PendingTranslation]],
+                      unique_translations: List[Optional[str]], unique_positions: List[int]):
+        """Distribui as traduções dos textos únicos de volta às células pendentes"""
+        translated_texts = [unique_translations[position] for position in unique_positions]
+        
+        failed = []
+        for (index, pending), translated in zip(pending_cells, translated_texts):
+            try:
+                if translated is None:
+                    results[index] = pending.text
+                    failed.append(pending.text)
+                else:
+                    results[index] = self._finish_text(pending, translated)
+            except Exception as e:
+                self.log(f"❌ Erro na tradução: {e}")
+                results[index] = pending.text
+                failed.append(pending.text)
+        if failed:
+            with self._counter_lock:
+                self.failed_texts.update(failed)
+        
+        self._flush_persistent_cache()
+        self._flush_journal()
+    
+    def _send_requests(self, tasks: List[Tuple[str, PackedRequest]]) -> List[Optional[List[str]]]:
+        """
+        Envia requisições (idioma, lote) ao backend
+        Com `max_concurrency` > 1 rodam no pool de workers; a ordem das
+        respostas é a mesma das requisições
+        """
+        pool = self._get_pool() if len(tasks) > 1 else None
+        if pool is not None:
+            responses = pool.imap(lambda backend, task: self._request_translations(task[1].texts, backend, task[0]),
+                                  tasks)
+        else:
+            responses = (self._request_translations(request.texts, target_language=language)
+                         for language, request in tasks)
+        
+        results = []
+        for response in responses:
+            results.append(response)
+            self._report_progress(len(results), len(tasks))
+        return results
+    
+    def _report_progress(self, done: int, total: int):
+        """Repassa o andamento das requisições ao callback `progress`, se houver"""
+        if self.progress is not None:
+            self.progress(done, total)
+    
+    def _prepare_jobs(self, cells: List[str], target_languages: List[str]) -> List[TranslationJob]:
+        """Prepara e empacota uma linha para cada idioma, preservando cada célula uma vez"""
+        preserved = {}
+        jobs = []
+        for language in target_languages:
+            results, pending_cells = self._prepare_cells(cells, language, preserved)
+            requests, unique_positions, claim = self._pack_cells(pending_cells, language)
+            jobs.append(TranslationJob(language, results, pending_cells, requests, unique_positions, claim))
+        return jobs
+    
+    def _publish_flights(self, jobs: List[TranslationJob], responses: List[Optional[List[str]]]) -> List[Future]:
+        """
+        Single-flight: entrega as traduções enviadas por esta chamada a quem espera
+        
+        Todos os idiomas são publicados antes de qualquer espera, então duas
+        chamadas que esperam uma pela outra nunca ficam presas. Retorna os
+        Futures dos textos que outra chamada está enviando.
+        """
+        waiting = []
+        position = 0
+        for job in jobs:
+            job_responses = responses[position:position + len(job.requests)]
+            position += len(job.requests)
+            if job.claim is None or job.translations is not None:
+                continue
+            job.translations = unpack_results(job.requests, job_responses, len(job.claim.texts))
+            self.in_flight.publish(job.claim, job.translations)
+            waiting.extend(job.claim.waiting.values())
+        return waiting
+    
+    def _abandon_flights(self, jobs: List[TranslationJob]):
+        """Envio interrompido: libera quem espera pelos textos desta chamada (como falha)"""
+        for job in jobs:
+            if job.claim is not None:
+                self.in_flight.publish(job.claim, [None] * len(job.claim.texts))
+    
+    def _send_job_requests(self, jobs: List[TranslationJob]) -> List[Optional[List[str]]]:
+        """Envia as requisições dos jobs; se o envio falhar, as reservas single-flight são liberadas"""
+        try:
+            return self._send_requests(self._job_tasks(jobs))
+        except BaseException:
+            self._abandon_flights(jobs)
+            raise
+    
+    def _finish_jobs(self, jobs: List[TranslationJob], responses: List[Optional[List[str]]]) -> Dict[str, List[str]]:
+        """Distribui as respostas (na ordem de _job_tasks) e retorna as linhas por idioma"""
+        self._publish_flights(jobs, responses)
+        for job in jobs:
+            if job.pending_cells:
+                for unique_position, flight in job.claim.waiting.items():
+                    job.translations[unique_position] = flight.result()
+                self._finish_cells(job.results, job.pending_cells, job.translations, job.unique_positions)
+        return {job.target_language: job.results for job in jobs}
+    
+    @staticmethod
+    def _job_tasks(jobs: List[TranslationJob]) -> List[Tuple[str, PackedRequest]]:
+        """Lista de requisições (idioma, lote) de todos os idiomas"""
+        return [(job.target_language, request) for job in jobs for request in job.requests]
+    
+    def _translate_cells_multi(self, cells: List[str], target_languages: List[str]) -> Dict[str, List[str]]:
+        """
+        Traduz as células de uma linha para vários idiomas de uma vez
+        
+        Cada célula é preparada individualmente (preço, cache, preservação),
+        os textos pendentes são empacotados em requisições até o limite de
+        caracteres do backend (e no máximo `batch_size` itens) e restauração,
+        caixa e moeda são aplicadas célula a célula no retorno. A preservação
+        roda uma vez por célula e as requisições de todos os idiomas seguem
+        juntas para o pool de workers. A ordem das células é mantida e
+        células cujo lote falhar mantêm o texto original.
+        """
+        jobs = self._prepare_jobs(cells, target_languages)
+        responses = self._send_job_requests(jobs)
+        return self._finish_jobs(jobs, responses)
+    
+    def _translate_cells(self, cells: List[str]) -> List[str]:
+        """Traduz várias células para o (primeiro) idioma de destino"""
+        target_language = self.config.target_languages[0]
+        return self._translate_cells_multi(cells, [target_language])[target_language]
+    
+    def translate_row(self, cells: List[str]) -> List[str]:
+        """
+        Traduz as células de uma linha (ou de uma janela de linhas)
+        
+        Ponto de entrada dos front ends que cuidam da leitura e escrita do
+        arquivo, como a interface gráfica.
+        """
+        return self._translate_cells(cells)
+    
+    def translate_texts(self, cells: List[str], target_languages: List[str] = None) -> Dict[str, List[str]]:
+        """
+        Traduz células avulsas para vários idiomas (padrão: os da configuração)
+    
+        Ponto de entrada do serviço HTTP (tradutor_servico.py), que junta as
+        células de várias requisições em uma única chamada.
+        """
+        return self._translate_cells_multi(cells, target_languages or self.config.target_languages)
+    
+    def _window_rows(self, rows: Iterable[List[str]]) -> Iterator[List[List[str]]]:
+        """Etapa de leitura: agrupa as linhas em janelas de `stream_window` linhas"""
+        rows = iter(rows)
+        window_size = max(1, self.config.stream_window)
+        while True:
+            with self.measure('leitura_csv'):
+                window = list(islice(rows, window_size))
+            if not window:
+                return
+            yield window
+    
+    def _preserve_windows(self, windows: Iterable[List[List[str]]], target_languages: List[str]
+                          ) -> Iterator[Tuple[List[List[str]], List[TranslationJob]]]:
+        """
+        Etapa de preservação: prepara e empacota as células de cada janela
+        
+        As células da janela inteira formam uma única lista, então os lotes
+        enviados ao backend juntam células de várias linhas.
+        """
+        for window in windows:
+            cells = [cell for row in window for cell in row]
+            yield window, self._prepare_jobs(cells, target_languages)
+    
+    def _translate_windows(self, prepared: Iterable[Tuple[List[List[str]], List[TranslationJob]]]
+                           ) -> Iterator[Tuple[List[List[str]], List[TranslationJob], List[Optional[List[str]]]]]:
+        """Etapa de tradução: envia os lotes da janela (pool de workers ou asyncio)"""
+        for window, jobs in prepared:
+            yield window, jobs, self._send_job_requests(jobs)
+    
+    def _restore_windows(self, translated: Iterable[Tuple[List[List[str]], List[TranslationJob],
+                                                          List[Optional[List[str]]]]],
+                         target_languages: List[str]) -> Iterator[Tuple[List[List[str]], List[List[str]]]]:
+        """
+        Etapa de restauração: devolve (linhas originais, linhas traduzidas)
+        com uma linha traduzida por idioma para cada linha da janela
+        """
+        for window, jobs, responses in translated:
+            results = self._finish_jobs(jobs, responses)
+            output_rows = []
+            position = 0
+            for row in window:
+                for language in target_languages:
+                    output_rows.append(results[language][position:position + len(row)])
+                position += len(row)
+            yield window, output_rows
+    
+    def _has_previous(self, text: str, target_languages: List[str]) -> bool:
+        """Modo incremental: o texto tem tradução da execução anterior em todos os idiomas"""
+        previous = self.previous_translations.get(cell_hash(text)) if self.previous_translations else None
+        return previous is not None and all(language in previous for language in target_languages)
+    
+    def _plan_translations(self, rows: Iterable[List[str]], target_languages: List[str]):
+        """
+        Planejamento do arquivo inteiro: traduz cada texto único uma única vez
+        
+        Percorre as linhas de dados juntando os textos traduzíveis (sem vazios
+        e preços), traduz os únicos em etapas de PLAN_CHUNK_TEXTS textos e
+        guarda o resultado em `planned_translations`, de onde a passada de
+        escrita distribui a tradução a todas as células que usam o texto. Os
+        que falharam não entram no plano e seguem o caminho normal da escrita.
+        A memória usada cresce com o número de textos únicos, não de linhas.
+        """
+        unique_texts: Dict[str, None] = {}
+        translatable_cells = 0
+        for row in rows:
+            for cell in row:
+                if self._is_translatable(cell) and not self._has_previous(cell, target_languages):
+                    translatable_cells += 1
+                    unique_texts.setdefault(cell, None)
+        
+        if not translatable_cells:
+            return
+        self.log(f"🧮 Planejamento: {translatable_cells} células traduzíveis, {len(unique_texts)} textos únicos "
+                 f"({translatable_cells / len(unique_texts):.1f}x, "
+                 f"{1 - len(unique_texts) / translatable_cells:.0%} a menos no backend)")
+        
+        texts = list(unique_texts)
+        del unique_texts
+        # Textos que o backend não traduziu voltam como estão: ficam fora do plano
+        # e a passada de escrita tenta de novo (e os registra se falharem outra vez)
+        earlier_failures = self.take_failed_texts()
+        unplanned = 0
+        for start in range(0, len(texts), PLAN_CHUNK_TEXTS):
+            chunk = texts[start:start + PLAN_CHUNK_TEXTS]
+            translated = self._translate_cells_multi(chunk, target_languages)
+            failed = self.take_failed_texts()
+            unplanned += len(failed)
+            for language in target_languages:
+                for text, translated_text in zip(chunk, translated[language]):
+                    if text not in failed:
+                        self.planned_translations[self._memory_key(text, language)] = translated_text
+            self.log(f"✅ Textos únicos {start + 1}-{start + len(chunk)}: traduzidos")
+        with self._counter_lock:
+            self.failed_texts.update(earlier_failures)
+        if unplanned:
+            self.log(f"⚠️  {unplanned} textos únicos sem tradução no planejamento: tentados de novo na escrita")
+    
+    def translate_csv_stream(self, input_file: str, output_file: str, delimiter: Optional[str] = None,
+                             quoting: int = csv.QUOTE_MINIMAL, layout: str = 'csv',
+                             window_progress: Callable[[int, float], None] = None) -> int:
+        """
+        Traduz todas as linhas de dados do CSV em modo streaming
+        
+        As etapas (leitura → preservação → tradução em lotes → restauração →
+        escrita) são geradores encadeados: só uma janela de `stream_window`
+        linhas fica em memória e cada janela é gravada assim que fica pronta.
+        A saída tem o cabeçalho seguido, para cada linha de dados, de uma
+        linha traduzida por idioma de destino.
+        
+        Cada janela gravada é registrada no diário; com `resume`, a saída é
+        cortada no último registro e só as linhas restantes são traduzidas.
+        
+        Os front ends mudam só o formato: `delimiter` (None = detectado),
+        `quoting` da saída e `layout` do diário e do manifesto (a interface
+        gráfica grava com QUOTE_ALL). `window_progress` recebe, a cada janela
+        gravada, as linhas de dados até ela e a fração da entrada já lida.
+        
+        Returns:
+            Número de linhas escritas no arquivo de saída
+        """
+        target_languages = self.config.target_languages
+        
+        journal = self.open_journal(input_file, output_file, layout=layout)
+        self.start_incremental(output_file, layout=layout)
+        resume_rows = 0
+        if (journal is not None and journal.resumed and journal.output_bytes is not None
+                and os.path.exists(output_file)):
+            resume_rows = journal.rows_done
+        
+        with open(input_file, 'r', encoding='utf-8', newline='') as infile:
+            # Detectar delimitador e configurações do CSV
+            if delimiter is None:
+                sample = infile.read(1024)
+                infile.seek(0)
+                delimiter = csv.Sniffer().sniff(sample).delimiter
+            reader = csv.reader(infile, delimiter=delimiter, quotechar='"')
+            
+            on_window = None
+            if window_progress is not None:
+                total_bytes = max(1, os.path.getsize(input_file))
+                
+                def on_window(data_rows: int):
+                    # Posição do arquivo binário: avança em blocos, suficiente para o progresso
+                    window_progress(data_rows, min(1.0, infile.buffer.tell() / total_bytes))
+            
+            # Passada de planejamento: cada texto único vai ao backend uma vez
+            if self.config.dedup:
+                next(reader, None)
+                with self.measure('planejamento'):
+                    self._plan_translations(reader, target_languages)
+                infile.seek(0)
+                reader = csv.reader(infile, delimiter=delimiter, quotechar='"')
+            
+            # Retomada: manter só o que o diário garante que foi gravado
+            if resume_rows:
+                os.truncate(output_file, journal.output_bytes)
+            
+            with open(output_file, 'a' if resume_rows else 'w', encoding='utf-8', newline='') as outfile:
+                writer = csv.writer(outfile, delimiter=delimiter, quotechar='"', quoting=quoting)
+                
+                header = next(reader, None)
+                if header is None:
+                    self.close_journal(completed=True)
+                    return 0
+                if resume_rows:
+                    self.skip_written_rows(reader, resume_rows)
+                    self.log(f"⏭️  Linhas de dados 1-{resume_rows}: já gravadas")
+                else:
+                    writer.writerow(header)
+                    self.log("📋 Linha 1 (cabeçalho): mantida original")
+                
+                data_rows, output_rows, translated_cells = self._write_translated_windows(
+                    reader, writer, outfile, resume_rows, journal, on_window)
+                total_rows = 1 + resume_rows * len(target_languages) + output_rows
+        
+        self.translated_cells = translated_cells
+        self.log(f"🔤 Células traduzidas: {translated_cells}")
+        self.log(f"📡 Requisições ao backend: {self.backend_requests}")
+        if self.persistent_cache is not None:
+            self.log(f"💾 Acertos no cache persistente: {self.persistent_cache_hits}")
+        self._print_dedup_stats()
+        self._print_flow_stats()
+        self._print_http_stats()
+        self._print_cache_stats()
+        self.finish_incremental()
+        self.close_journal(completed=True)
+        
+        return total_rows
+    
+    def _write_translated_windows(self, rows: Iterable[List[str]], writer, outfile, data_rows: int = 0,
+                                  journal: Optional[TranslationJournal] = None,
+                                  on_window: Callable[[int], None] = None) -> Tuple[int, int, int]:
+        """
+        Traduz as linhas de dados janela a janela e grava cada janela pronta
+        
+        `data_rows` é o número de linhas de dados antes da primeira (retomada
+        ou partição), usado no log e no diário; `on_window` o recebe a cada
+        janela gravada.
+        
+        Returns:
+            (linhas de dados até a última gravada, linhas escritas, células traduzidas)
+        """
+        target_languages = self.config.target_languages
+        output_rows = 0
+        translated_cells = 0
+        
+        windows = self._window_rows(rows)
+        prepared = self._preserve_windows(windows, target_languages)
+        translated = self._translate_windows(prepared)
+        
+        for window, translated_rows in self._restore_windows(translated, target_languages):
+            with self.measure('escrita_csv'):
+                writer.writerows(translated_rows)
+                outfile.flush()
+            
+            data_rows += len(window)
+            self.record_manifest_rows(window)
+            if journal is not None:
+                journal.record_window(data_rows, outfile.tell())
+            
+            for index, translated_row in enumerate(translated_rows):
+                row = window[index // len(target_languages)]
+                translated_cells += sum(1 for cell, translated_cell in zip(row, translated_row)
+                                        if translated_cell != cell)
+            
+            output_rows += len(translated_rows)
+            self.log(f"✅ Linhas de dados {data_rows - len(window) + 1}-{data_rows}: "
+                     f"traduzidas para {', '.join(target_languages)}{self._concurrency_label()}")
+            if on_window is not None:
+                on_window(data_rows)
+        
+        return data_rows, output_rows, translated_cells
+    
+    def translate_rows_stream(self, open_rows: Callable[[], Iterable[List[str]]], output_file: str,
+                              delimiter: str = ',', first_row: int = 0) -> Tuple[int, int]:
+        """
+        Traduz linhas de dados (sem cabeçalho) para `output_file`, em modo streaming
+        
+        Usado por cada partição do modo --partitions (tradutor_particoes.py):
+        `open_rows` abre um leitor das linhas da partição (chamado de novo para
+        a passada de planejamento com `dedup`) e `first_row` é o número de
+        linhas de dados antes dela. Sem diário nem manifesto.
+        
+        Returns:
+            (linhas escritas, células traduzidas)
+        """
+        target_languages = self.config.target_languages
+        if self.config.dedup:
+            with self.measure('planejamento'):
+                self._plan_translations(open_rows(), target_languages)
+        
+        with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.writer(outfile, delimiter=delimiter, quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            _, output_rows, translated_cells = self._write_translated_windows(open_rows(), writer, outfile,
+                                                                              first_row)
+        
+        self.translated_cells = translated_cells
+        return output_rows, translated_cells
+    
+    def translate_csv(self, input_file: str, output_file: str = None) -> str:
+        """
+        Traduz um arquivo CSV completo
+        
+        Args:
+            input_file: Caminho do arquivo CSV de entrada
+            output_file: Caminho do arquivo CSV de saída (opcional)
+        
+        Returns:
+            Caminho do arquivo de saída criado
+        """
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Arquivo não encontrado: {input_file}")
+        
+        target_languages = self.config.target_languages
+        
+        # Gerar nome do arquivo de saída se não fornecido
+        if not output_file:
+            base_name = os.path.splitext(input_file)[0]
+            output_file = f"{base_name}_translated_{'-'.join(target_languages)}.csv"
+        
+        if self.config.stream:
+            self.log(f"🔄 Iniciando tradução de: {input_file} (streaming, janelas de "
+                     f"{max(1, self.config.stream_window)} linhas)")
+            self.log(f"📄 Arquivo de saída: {output_file}")
+            self.log(f"🌐 Traduzindo de {self.config.source_language} para {', '.join(target_languages)}")
+            try:
+                total_rows = self.translate_csv_stream(input_file, output_file)
+            except Exception as e:
+                self.log(f"❌ Erro durante a tradução: {e}")
+                raise
+            self.log(f"✅ Tradução concluída!")
+            self.log(f"📈 Total de linhas no arquivo final: {total_rows}")
+            self.log(f"💾 Arquivo salvo em: {output_file}")
+            return output_file
+        
+        self.log(f"🔄 Iniciando tradução de: {input_file}")
+        self.log(f"📄 Arquivo de saída: {output_file}")
+        self.log(f"🌐 Traduzindo de {self.config.source_language} para {', '.join(target_languages)}")
+        
+        try:
+            # Traduções de uma execução interrompida (--resume) não voltam ao backend
+            self.open_journal(input_file, output_file)
+            # Modo incremental: lê a saída anterior antes de sobrescrevê-la
+            self.start_incremental(output_file)
+            
+            with open(input_file, 'r', encoding='utf-8', newline='') as infile:
+                # Detectar delimitador e configurações do CSV
+                sample = infile.read(1024)
+                infile.seek(0)
+                sniffer = csv.Sniffer()
+                delimiter = sniffer.sniff(sample).delimiter
+                
+                # Usar configurações que preservam aspas originais
+                reader = csv.reader(infile, delimiter=delimiter, quotechar='"')
+                with self.measure('leitura_csv'):
+                    rows = list(reader)
+                
+                with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+                    writer = csv.writer(outfile, delimiter=delimiter, quotechar='"', 
+                                      quoting=csv.QUOTE_MINIMAL)
+                    
+                    # Escrever linha 1 (cabeçalho) - mantém original
+                    if len(rows) > 0:
+                        writer.writerow(rows[0])
+                        self.log("📋 Linha 1 (cabeçalho): mantida original")
+                    
+                    # Escrever linha 2 (dados originais) - mantém original  
+                    if len(rows) > 1:
+                        writer.writerow(rows[1])
+                        self.log("� Linha 2 (dados originais): mantida original")
+                    
+                    # Traduzir linha 2 para os idiomas solicitados e adicionar como linha 3+
+                    if len(rows) > 1:
+                        original_data_row = rows[1]
+                        
+                        self.log(f"🔄 Traduzindo dados da linha 2 para {', '.join(target_languages)}...")
+                        
+                        translated_rows = self._translate_cells_multi(original_data_row, target_languages)
+                        translated_cells = 0
+                        
+                        # Escrever uma linha traduzida por idioma
+                        for line_number, language in enumerate(target_languages, start=3):
+                            translated_row = translated_rows[language]
+                            translated_cells += sum(1 for cell, translated_cell in zip(original_data_row, translated_row)
+                                                    if translated_cell != cell)
+                            with self.measure('escrita_csv'):
+                                writer.writerow(translated_row)
+                            self.log(f"✅ Linha {line_number} ({language}): tradução adicionada")
+                        
+                        self.translated_cells = translated_cells
+                        self.log(f"🔤 Células traduzidas: {translated_cells}")
+                        self.log(f"📡 Requisições ao backend: {self.backend_requests}")
+                        if self.persistent_cache is not None:
+                            self.log(f"💾 Acertos no cache persistente: {self.persistent_cache_hits}")
+                        self._print_dedup_stats()
+                        self._print_flow_stats()
+                        self._print_http_stats()
+                        self._print_cache_stats()
+                    
+                    # Cabeçalho + original + uma tradução por idioma
+                    total_rows = 2 + len(target_languages) if len(rows) > 1 else len(rows)
+            
+            if len(rows) > 1:
+                self.record_manifest_rows([rows[1]])
+            self.finish_incremental()
+            self.close_journal(completed=True)
+            
+            self.log(f"✅ Tradução concluída!")
+            self.log(f"📈 Total de linhas no arquivo final: {total_rows}")
+            self.log(f"💾 Arquivo salvo em: {output_file}")
+            
+            return output_file
+            
+        except Exception as e:
+            self.log(f"❌ Erro durante a tradução: {e}")
+            raise
+
+def create_translator(config: TranslationConfig, log: Callable[[str], None] = print,
+                      progress: Callable[[int, int], None] = None) -> CSVTranslator:
+    """Cria o tradutor do motor de execução configurado"""
+    if config.engine == 'asyncio':
+        from tradutor_async import AsyncCSVTranslator
+        return AsyncCSVTranslator(config, log, progress)
+    return CSVTranslator(config, log, progress)
+
@@ -10,328 +10,21 @@ Este script permite traduzir textos em arquivos CSV mantendo:
 - Padrões de pontuação e aspas
 - Formatação de valores monetários
 - Opções de conversão de valores numéricos
+
+O motor de tradução fica em tradutor_core (compartilhado com a interface
+gráfica); este módulo é o front end de linha de comando. As bibliotecas do
+backend só são carregadas quando uma tradução começa.
 """
 
-import csv
-import re
 import json
 import argparse
 import os
 import sys
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from datetime import datetime
-
-try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except ImportError:
-    GOOGLETRANS_AVAILABLE = False
-    print("⚠️  Aviso: googletrans não está instalado. Execute: pip install googletrans==4.0.0rc1")
-
-@dataclass
-class TranslationConfig:
-    """Configurações para tradução"""
-    source_language: str = 'pt'
-    target_language: str = 'en'
-    currency_symbol: str = '$'
-    convert_currency: bool = False
-    currency_conversion_rate: float = 1.0
-    preserve_numbers: bool = True
-    preserve_urls: bool = True
-    preserve_emails: bool = True
-    max_retries: int = 3
-
-class CSVTranslator:
-    """Classe principal para tradução de arquivos CSV"""
-    
-    def __init__(self, config: TranslationConfig):
-        self.config = config
-        self.translator = None
-        self.translation_cache = {}
-        self.patterns = self._compile_patterns()
-        
-        if GOOGLETRANS_AVAILABLE:
-            self.translator = Translator()
-    
-    def _compile_patterns(self) -> Dict[str, re.Pattern]:
-        """Compila padrões regex para preservar elementos específicos"""
-        return {
-            'currency': re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)\s*(?:R\$|BRL|reais?)?', re.IGNORECASE),
-            'number': re.compile(r'\b\d+(?:[,\.]\d+)*\b'),
-            'url': re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+', re.IGNORECASE),
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'quotes': re.compile(r'["""\'\'`]'),
-            'punctuation': re.compile(r'[\.!?;:,\-—–…]'),
-            'parentheses': re.compile(r'[\(\)\[\]{}]'),
-        }
-    
-    def _preserve_elements(self, text: str) -> Tuple[str, Dict[str, str]]:
-        """
-        Preserva elementos específicos do texto substituindo por placeholders
-        Retorna o texto modificado e um dicionário de mapeamento
-        """
-        placeholders = {}
-        modified_text = text
-        counter = 0
-        
-        # Preservar URLs
-        if self.config.preserve_urls:
-            for match in self.patterns['url'].finditer(text):
-                placeholder = f"__URL_{counter}__"
-                placeholders[placeholder] = match.group()
-                modified_text = modified_text.replace(match.group(), placeholder)
-                counter += 1
-        
-        # Preservar emails
-        if self.config.preserve_emails:
-            for match in self.patterns['email'].finditer(modified_text):
-                placeholder = f"__EMAIL_{counter}__"
-                placeholders[placeholder] = match.group()
-                modified_text = modified_text.replace(match.group(), placeholder)
-                counter += 1
-        
-        # Preservar números se configurado
-        if self.config.preserve_numbers:
-            for match in self.patterns['number'].finditer(modified_text):
-                # Verificar se não é parte de uma URL ou email já preservada
-                if not any(match.group() in value for value in placeholders.values()):
-                    placeholder = f"__NUMBER_{counter}__"
-                    placeholders[placeholder] = match.group()
-                    modified_text = modified_text.replace(match.group(), placeholder)
-                    counter += 1
-        
-        return modified_text, placeholders
-    
-    def _detect_case_pattern(self, text: str) -> str:
-        """Detecta o padrão de caixa do texto original"""
-        if text.isupper():
-            return "UPPER"
-        elif text.islower():
-            return "LOWER"
-        elif text.istitle():
-            return "TITLE"
-        else:
-            return "MIXED"
-    
-    def _apply_case_pattern(self, translated_text: str, original_pattern: str) -> str:
-        """Aplica o padrão de caixa do texto original ao texto traduzido"""
-        if original_pattern == "UPPER":
-            return translated_text.upper()
-        elif original_pattern == "LOWER":
-            return translated_text.lower()
-        elif original_pattern == "TITLE":
-            return translated_text.title()
-        else:
-            return translated_text
-    
-    def _preserve_csv_quotes(self, text: str) -> Tuple[str, bool]:
-        """Preserva aspas e formatação CSV"""
-        # Verificar se o texto está entre aspas
-        if text.startswith('"') and text.endswith('"'):
-            # Remover aspas para tradução, mas lembrar de recolocar
-            return text[1:-1], True
-        return text, False
-    
-    def _restore_elements(self, translated_text: str, placeholders: Dict[str, str]) -> str:
-        """Restaura elementos preservados no texto traduzido"""
-        restored_text = translated_text
-        
-        for placeholder, original_value in placeholders.items():
-            restored_text = restored_text.replace(placeholder, original_value)
-        
-        return restored_text
-    
-    def _convert_currency(self, text: str) -> str:
-        """Converte valores monetários conforme configuração"""
-        def currency_replacer(match):
-            value_str = match.group(1)
-            
-            # Normalizar formato de número (converter vírgula para ponto)
-            normalized_value = value_str.replace(',', '.')
-            
-            try:
-                value = float(normalized_value)
-                
-                if self.config.convert_currency:
-                    converted_value = value * self.config.currency_conversion_rate
-                    return f"{self.config.currency_symbol}{converted_value:.2f}"
-                else:
-                    # Apenas trocar símbolo, manter formato original
-                    return f"{self.config.currency_symbol}{value_str}"
-                    
-            except ValueError:
-                # Se não conseguir converter, mantém original com novo símbolo
-                return f"{self.config.currency_symbol}{value_str}"
-        
-        return self.patterns['currency'].sub(currency_replacer, text)
-    
-    def _handle_currency_in_text(self, text: str) -> str:
-        """Trata especificamente valores monetários no texto"""
-        # Padrão mais específico para valores monetários
-        currency_pattern = re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)')
-        
-        # Se há um padrão de preço (números isolados que parecem preços)
-        if currency_pattern.search(text) and len(text.strip()) < 20:  # Provavelmente um preço
-            return self._convert_currency(text)
-        
-        return text
-    
-    def _translate_text(self, text: str) -> str:
-        """Traduz um texto individual"""
-        if not text or not text.strip():
-            return text
-        
-        # Verificar se é provável que seja um preço
-        is_likely_price = (re.match(r'^\s*\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?\s*$', text.strip()) is not None)
-        
-        if is_likely_price:
-            return self._handle_currency_in_text(text)
-        
-        # Detectar se o texto inteiro está em caixa alta
-        is_all_uppercase = text.isupper()
-        
-        # Verificar cache
-        cache_key = f"{text}_{self.config.source_language}_{self.config.target_language}"
-        if cache_key in self.translation_cache:
-            result = self.translation_cache[cache_key]
-            # Aplicar caixa alta se necessário
-            return result.upper() if is_all_uppercase else result
-        
-        if not GOOGLETRANS_AVAILABLE or not self.translator:
-            print(f"⚠️  Tradução não disponível para: {text[:50]}...")
-            return text
-        
-        # Preservar elementos específicos
-        modified_text, placeholders = self._preserve_elements(text)
-        
-        try:
-            # Tentar traduzir com retry
-            for attempt in range(self.config.max_retries):
-                try:
-                    result = self.translator.translate(
-                        modified_text,
-                        src=self.config.source_language,
-                        dest=self.config.target_language
-                    )
-                    
-                    if result and result.text:
-                        translated = result.text
-                        break
-                        
-                except Exception as e:
-                    if attempt == self.config.max_retries - 1:
-                        print(f"❌ Erro na tradução após {self.config.max_retries} tentativas: {e}")
-                        return text
-                    else:
-                        print(f"⚠️  Tentativa {attempt + 1} falhou, tentando novamente...")
-                        continue
-            else:
-                return text
-            
-            # Restaurar elementos preservados
-            translated = self._restore_elements(translated, placeholders)
-            
-            # Aplicar caixa alta se o texto original estava todo em maiúscula
-            if is_all_uppercase:
-                translated = translated.upper()
-            
-            # Converter moedas se necessário
-            translated = self._handle_currency_in_text(translated)
-            
-            # Armazenar no cache
-            self.translation_cache[cache_key] = translated
-            
-            return translated
-            
-        except Exception as e:
-            print(f"❌ Erro na tradução: {e}")
-            return text
-    
-    def translate_csv(self, input_file: str, output_file: str = None) -> str:
-        """
-        Traduz um arquivo CSV completo
-        
-        Args:
-            input_file: Caminho do arquivo CSV de entrada
-            output_file: Caminho do arquivo CSV de saída (opcional)
-        
-        Returns:
-            Caminho do arquivo de saída criado
-        """
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Arquivo não encontrado: {input_file}")
-        
-        # Gerar nome do arquivo de saída se não fornecido
-        if not output_file:
-            base_name = os.path.splitext(input_file)[0]
-            output_file = f"{base_name}_translated_{self.config.target_language}.csv"
-        
-        print(f"🔄 Iniciando tradução de: {input_file}")
-        print(f"📄 Arquivo de saída: {output_file}")
-        print(f"🌐 Traduzindo de {self.config.source_language} para {self.config.target_language}")
-        
-        try:
-            with open(input_file, 'r', encoding='utf-8', newline='') as infile:
-                # Detectar delimitador e configurações do CSV
-                sample = infile.read(1024)
-                infile.seek(0)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-                
-                # Usar configurações que preservam aspas originais
-                reader = csv.reader(infile, delimiter=delimiter, quotechar='"')
-                rows = list(reader)
-                
-                with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
-                    writer = csv.writer(outfile, delimiter=delimiter, quotechar='"', 
-                                      quoting=csv.QUOTE_MINIMAL)
-                    
-                    # Escrever linha 1 (cabeçalho) - mantém original
-                    if len(rows) > 0:
-                        writer.writerow(rows[0])
-                        print("📋 Linha 1 (cabeçalho): mantida original")
-                    
-                    # Escrever linha 2 (dados originais) - mantém original  
-                    if len(rows) > 1:
-                        writer.writerow(rows[1])
-                        print("� Linha 2 (dados originais): mantida original")
-                    
-                    # Traduzir linha 2 para os idiomas solicitados e adicionar como linha 3+
-                    if len(rows) > 1:
-                        original_data_row = rows[1]
-                        translated_cells = 0
-                        
-                        print(f"🔄 Traduzindo dados da linha 2 para {self.config.target_language}...")
-                        
-                        translated_row = []
-                        for cell in original_data_row:
-                            if cell and cell.strip():
-                                translated_cell = self._translate_text(cell)
-                                translated_row.append(translated_cell)
-                                
-                                if translated_cell != cell:
-                                    translated_cells += 1
-                            else:
-                                translated_row.append(cell)
-                        
-                        # Escrever linha traduzida
-                        writer.writerow(translated_row)
-                        print(f"✅ Linha 3 ({self.config.target_language}): tradução adicionada")
-                        
-                        print(f"🔤 Células traduzidas: {translated_cells}")
-                    
-                    total_rows = len(rows) + 1 if len(rows) > 1 else len(rows)  # Original + 1 tradução
-            
-            print(f"✅ Tradução concluída!")
-            print(f"📈 Total de linhas no arquivo final: {total_rows}")
-            print(f"💾 Arquivo salvo em: {output_file}")
-            
-            return output_file
-            
-        except Exception as e:
-            print(f"❌ Erro durante a tradução: {e}")
-            raise
+
+from tradutor_backends import BACKENDS, GOOGLETRANS_AVAILABLE
+from tradutor_cache import DEFAULT_CACHE_FILE, PersistentTranslationCache
+from tradutor_core import NUMBER_TREATMENTS, TranslationConfig, create_translator
+from tradutor_estatisticas import profile_call
 
 def create_config_file(filename: str = "translation_config.json"):
     """Cria um arquivo de configuração de exemplo"""
@@ -344,7 +37,29 @@ def create_config_file(filename: str = "translation_config.json"):
         "preserve_numbers": True,
         "preserve_urls": True,
         "preserve_emails": True,
-        "max_retries": 3
+        "max_retries": 3,
+        "requests_per_second": 0.0,
+        "chars_per_second": 0.0,
+        "backoff_base": 0.5,
+        "backoff_max": 30.0,
+        "batch_size": 50,
+        "max_concurrency": 1,
+        "adaptive_concurrency": False,
+        "engine": "threads",
+        "cache_file": "",
+        "memory_cache_entries": 10000,
+        "memory_cache_mb": 64.0,
+        "backend": "googletrans",
+        "backend_url": "",
+        "http_pool_size": 100,
+        "http_keepalive": 30.0,
+        "http2": False,
+        "stream": False,
+        "stream_window": 500,
+        "dedup": False,
+        "journal": False,
+        "stats": False,
+        "number_treatment": "price"
     }
     
     with open(filename, 'w', encoding='utf-8') as f:
@@ -363,6 +78,99 @@ def load_config_from_file(filename: str) -> TranslationConfig:
         print(f"⚠️  Erro ao carregar configuração: {e}")
         return TranslationConfig()
 
+def run_batch_mode(args, config: TranslationConfig):
+    """Modo --batch: traduz os arquivos em processos e termina com erro se algum falhar"""
+    # Import local: o pool de processos (multiprocessing) só é carregado neste modo
+    from tradutor_arquivos import expand_batch, run_batch
+    
+    files = expand_batch(args.batch)
+    if not files:
+        print(f"❌ Nenhum arquivo CSV encontrado em: {args.batch}")
+        sys.exit(1)
+    
+    report = run_batch(config, files, output_dir=args.output or '', processes=args.processes)
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"📊 Relatório do lote salvo em: {args.stats_file}")
+    if report['failed']:
+        sys.exit(1)
+    print("\n🎉 Lote concluído com sucesso!")
+
+def run_partitioned_mode(args, config: TranslationConfig):
+    """Modo --partitions: um arquivo dividido em faixas de bytes, uma por processo"""
+    # Import local: o pool de processos (multiprocessing) só é carregado neste modo
+    from tradutor_particoes import translate_partitioned
+    
+    if not os.path.exists(args.input_file):
+        print(f"❌ Arquivo não encontrado: {args.input_file}")
+        sys.exit(1)
+    output_file = args.output
+    if not output_file:
+        base_name = os.path.splitext(args.input_file)[0]
+        output_file = f"{base_name}_translated_{'-'.join(config.target_languages)}.csv"
+    
+    try:
+        report = translate_partitioned(config, args.input_file, output_file, args.partitions)
+    except Exception as e:
+        print(f"\n❌ Erro durante a execução: {e}")
+        sys.exit(1)
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"📊 Estatísticas salvas em: {args.stats_file}")
+    
+    print("\n🎉 Tradução concluída com sucesso!")
+    print(f"📂 Arquivo traduzido salvo em: {output_file}")
+
+def run_watch_mode(args, config: TranslationConfig):
+    """Modo --watch: traduz os CSVs que chegam à pasta até Ctrl+C (ou SIGTERM)"""
+    # Import local: o monitoramento só é carregado neste modo
+    import signal
+    import threading
+    from tradutor_pasta import FolderWatcher
+    
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    watcher = FolderWatcher(config, args.watch, interval=args.watch_interval, settle=args.settle,
+                            queue_size=args.queue_size)
+    try:
+        totals = watcher.run(stop)
+    except Exception as e:
+        print(f"\n❌ Erro durante a execução: {e}")
+        sys.exit(1)
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding='utf-8') as file:
+            json.dump(totals, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"📊 Totais do monitoramento salvos em: {args.stats_file}")
+
+def run_serve_mode(args, config: TranslationConfig):
+    """Modo --serve: serviço HTTP local com o tradutor aquecido, até Ctrl+C"""
+    # Import local: o servidor HTTP só é carregado neste modo
+    from tradutor_servico import TranslationServer, TranslationService
+    
+    service = TranslationService(config, window=args.serve_window, dispatchers=args.serve_dispatchers)
+    try:
+        server = TranslationServer(service, args.host, args.serve)
+    except OSError as e:
+        print(f"❌ Não foi possível abrir a porta {args.serve}: {e}")
+        sys.exit(1)
+    print(f"🌐 Serviço de tradução em {server.url} "
+          f"(POST /translate, POST /translate/csv, GET /metrics; Ctrl+C para encerrar)")
+    print(f"📦 Micro-lotes: janela de {args.serve_window * 1000:g} ms, {service.dispatchers} despacho(s), "
+          f"idiomas padrão {', '.join(config.target_languages)}")
+    try:
+        server.serve_forever()
+    except Exception as e:
+        print(f"\n❌ Erro durante a execução: {e}")
+        sys.exit(1)
+    metrics = service.metrics()
+    print(f"🛑 Serviço encerrado: {metrics['cells']} células em {metrics['batching']['dispatches']} lotes, "
+          f"{metrics['errors']} erros")
+
 def main():
     """Função principal do script"""
     parser = argparse.ArgumentParser(
@@ -377,27 +185,177 @@ Exemplos de uso:
   # Especificar idiomas e arquivo de saída
   python tradutor_csv.py arquivo.csv -s pt -t es -o arquivo_espanhol.csv
 
+  # Vários idiomas de uma vez (uma linha traduzida por idioma)
+  python tradutor_csv.py arquivo.csv -t en,es,fr,de
+
   # Converter moedas com taxa específica
   python tradutor_csv.py arquivo.csv -t en --convert-currency --rate 5.5
 
+  # Converter valores com símbolo (ex.: "82,00 R$") em qualquer texto, como na interface gráfica
+  python tradutor_csv.py arquivo.csv --number-treatment convert_currency --rate 0.18 --currency-symbol US$
+
   # Usar arquivo de configuração
   python tradutor_csv.py arquivo.csv --config config.json
 
   # Criar arquivo de configuração
   python tradutor_csv.py --create-config
 
+  # Motor assíncrono com até 200 requisições em voo
+  python tradutor_csv.py arquivo.csv --engine asyncio --backend google-web --workers 200
+
+  # Reaproveitar traduções de execuções anteriores
+  python tradutor_csv.py arquivo.csv --cache-file
+  python tradutor_csv.py --cache-info
+
+  # Campanha inteira: todos os CSVs da pasta em 4 processos, saídas em traduzidos/
+  python tradutor_csv.py --batch campanha/ -t en,es --stream -o traduzidos --processes 4
+
+  # Traduzir cada CSV exportado para a pasta, com o tradutor e o cache sempre aquecidos
+  python tradutor_csv.py --watch exportacoes/ -t en,es --stream --incremental --cache-file
+
+  # Serviço HTTP local para outras ferramentas (JSX do Illustrator, exportador do CMS)
+  python tradutor_csv.py --serve 8080 -t en,es --workers 8 --cache-file
+
+  # Catálogo de vários GB: índice das linhas e 8 faixas traduzidas em paralelo
+  python tradutor_csv.py catalogo.csv --partitions 8 --workers 8
+
+  # Traduzir todas as linhas de um catálogo grande, janela a janela
+  python tradutor_csv.py catalogo.csv --stream --stream-window 1000
+
+  # Reexportação com poucas alterações: traduzir só as células novas ou alteradas
+  python tradutor_csv.py arquivo.csv -o arquivo_en.csv --incremental
+
+  # Tradução longa que pode ser interrompida: grava o diário e, na segunda vez,
+  # continua de onde parou (queda de rede, computador desligado)
+  python tradutor_csv.py catalogo.csv --stream --resume
+
+  # Traduzir cada texto repetido do catálogo uma única vez
+  python tradutor_csv.py catalogo.csv --stream --dedup
+
+  # Respeitar o limite do endpoint: no máximo 5 requisições e 20000 caracteres por segundo
+  python tradutor_csv.py catalogo.csv --stream --workers 8 --rps 5 --cps 20000
+
+  # Deixar o número de requisições em voo se ajustar ao endpoint (até 32)
+  python tradutor_csv.py catalogo.csv --stream --workers 32 --adaptive
+
+  # Onde está o tempo: etapas, percentis e latência do backend (e perfil do cProfile)
+  python tradutor_csv.py catalogo.csv --stream --stats --stats-file estatisticas.json
+  python tradutor_csv.py catalogo.csv --stream --profile perfil.prof
+
+  # Backend HTTP direto com 16 workers reaproveitando conexões (keep-alive) do pool
+  python tradutor_csv.py catalogo.csv --stream --backend google-web --workers 16 --http-pool 16
+
+  # Testar o pipeline sem rede com o backend local (latência de 50ms, 5% de erros)
+  python tradutor_csv.py arquivo.csv --backend stub --stub-latency 0.05 --stub-error-rate 0.05
+
 Idiomas suportados: pt, en, es, fr, de, it, ja, zh, ko, ru, ar, hi
         """
     )
     
     parser.add_argument('input_file', nargs='?', help='Arquivo CSV de entrada')
-    parser.add_argument('-o', '--output', help='Arquivo CSV de saída')
+    parser.add_argument('-o', '--output', help='Arquivo CSV de saída (com --batch, pasta das saídas)')
+    parser.add_argument('--batch', metavar='PASTA|GLOB',
+                        help='Traduzir todos os CSVs de uma pasta ou padrão (ex.: "campanha/*.csv") '
+                             'em um pool de processos com cache persistente compartilhado')
+    parser.add_argument('--watch', metavar='PASTA',
+                        help='Monitorar a pasta e traduzir cada CSV novo ou alterado (saída ao lado da entrada) '
+                             'até Ctrl+C, com o tradutor e os caches aquecidos entre os arquivos')
+    parser.add_argument('--watch-interval', type=float, default=2.0,
+                        help='Segundos entre as varreduras da pasta do modo --watch (padrão: 2)')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help='Segundos sem mudança de tamanho e data antes de traduzir um arquivo '
+                             'do modo --watch (padrão: 2)')
+    parser.add_argument('--queue-size', type=int, default=16,
+                        help='Arquivos prontos aguardando tradução no modo --watch (padrão: 16)')
+    parser.add_argument('--serve', type=int, metavar='PORTA',
+                        help='Servir traduções por HTTP (POST /translate, POST /translate/csv, GET /metrics) '
+                             'com o tradutor e os caches aquecidos, até Ctrl+C')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Endereço do modo --serve (padrão: 127.0.0.1, só a máquina local)')
+    parser.add_argument('--serve-window', type=float, default=0.01, metavar='SEG',
+                        help='Tempo que o modo --serve espera para juntar requisições em um lote (padrão: 0.01)')
+    parser.add_argument('--serve-dispatchers', type=int, default=2, metavar='N',
+                        help='Lotes do modo --serve enviados ao motor ao mesmo tempo; textos do lote em '
+                             'andamento não são reenviados (padrão: 2; 1 com --engine asyncio)')
+    parser.add_argument('--partitions', type=int, default=0, metavar='N',
+                        help='Dividir um CSV muito grande em N faixas traduzidas em processos separados '
+                             '(modo streaming; 0 = desligado)')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='Processos do modo --batch (padrão: um por núcleo, até o número de arquivos)')
     parser.add_argument('-s', '--source', default='pt', help='Idioma de origem (padrão: pt)')
-    parser.add_argument('-t', '--target', default='en', help='Idioma de destino (padrão: en)')
+    parser.add_argument('-t', '--target', default='en',
+                        help='Idioma(s) de destino, separados por vírgula (padrão: en)')
     parser.add_argument('--currency-symbol', default='$', help='Símbolo da moeda (padrão: $)')
     parser.add_argument('--convert-currency', action='store_true', help='Converter valores monetários')
     parser.add_argument('--rate', type=float, default=1.0, help='Taxa de conversão de moeda')
+    parser.add_argument('--number-treatment', default='price', choices=NUMBER_TREATMENTS,
+                        help='Tratamento de números e moeda: price (células de preço recebem o símbolo), '
+                             'preserve, convert_currency ou change_symbol (padrão: price)')
     parser.add_argument('--preserve-numbers', action='store_true', default=True, help='Preservar números')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='Máximo de células por requisição ao backend (padrão: 50)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='Requisições simultâneas ao backend (padrão: 1)')
+    parser.add_argument('--engine', default='threads', choices=['threads', 'asyncio'],
+                        help='Motor de execução das requisições (padrão: threads)')
+    parser.add_argument('--backend', default='googletrans', choices=sorted(BACKENDS),
+                        help='Motor de tradução (padrão: googletrans)')
+    parser.add_argument('--stub-latency', type=float, default=0.0,
+                        help='Latência simulada por requisição do backend stub, em segundos')
+    parser.add_argument('--stub-error-rate', type=float, default=0.0,
+                        help='Fração de requisições que falham no backend stub (0 a 1)')
+    parser.add_argument('--stub-seed', type=int, default=0, help='Semente dos erros simulados do backend stub')
+    parser.add_argument('--stub-throttle-rate', type=float, default=0.0,
+                        help='Fração de requisições respondidas com HTTP 429 pelo backend stub (0 a 1)')
+    parser.add_argument('--stub-max-rps', type=float, default=0.0,
+                        help='Requisições por segundo aceitas pelo servidor simulado do stub (0 = sem limite)')
+    parser.add_argument('--stub-capacity', type=int, default=0,
+                        help='Requisições simultâneas que o servidor simulado do stub atende sem ficar mais lento')
+    parser.add_argument('--backend-url', default='',
+                        help='URL do endpoint do backend google-web (padrão: Google; ex.: servidor de tradutor_http.py)')
+    parser.add_argument('--http-pool', type=int, default=100,
+                        help='Máximo de conexões HTTP abertas pelo backend google-web, somando os workers (padrão: 100)')
+    parser.add_argument('--keepalive', type=float, default=30.0,
+                        help='Segundos que uma conexão ociosa fica aberta para reuso (0 = uma conexão por requisição; padrão: 30)')
+    parser.add_argument('--http2', action='store_true',
+                        help='Usar HTTP/2 no backend google-web (requer httpx e h2)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Ajustar automaticamente as requisições em voo (AIMD), até --workers')
+    parser.add_argument('--rps', type=float, default=0.0,
+                        help='Máximo de requisições por segundo ao backend, somando todos os workers (0 = sem limite)')
+    parser.add_argument('--cps', type=float, default=0.0,
+                        help='Máximo de caracteres por segundo enviados ao backend (0 = sem limite)')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Tentativas por requisição, com recuo exponencial entre elas (padrão: 3)')
+    parser.add_argument('--backoff', type=float, default=0.5,
+                        help='Espera base entre tentativas em segundos, dobrada a cada falha (padrão: 0.5)')
+    parser.add_argument('--cache-file', nargs='?', const=DEFAULT_CACHE_FILE, default='',
+                        help=f'Usar cache persistente de traduções (padrão: {DEFAULT_CACHE_FILE})')
+    parser.add_argument('--memory-cache-entries', type=int, default=10000,
+                        help='Máximo de traduções no cache em memória (padrão: 10000)')
+    parser.add_argument('--memory-cache-mb', type=float, default=64.0,
+                        help='Máximo de memória do cache em MB (padrão: 64)')
+    parser.add_argument('--cache-info', action='store_true', help='Mostrar o conteúdo do cache persistente')
+    parser.add_argument('--cache-clear', action='store_true', help='Apagar o cache persistente')
+    parser.add_argument('--stream', action='store_true',
+                        help='Traduzir todas as linhas de dados em modo streaming (memória limitada)')
+    parser.add_argument('--stream-window', type=int, default=500,
+                        help='Linhas de dados por janela do modo streaming (padrão: 500)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='No modo streaming, traduzir cada texto único do arquivo uma única vez')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Traduzir só as células novas ou alteradas desde a execução anterior '
+                             '(copia as demais da saída anterior, com o manifesto <saída>.manifest)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Retomar uma execução interrompida a partir do diário <saída>.journal '
+                             '(grava o diário; pode ser usado já na primeira execução)')
+    parser.add_argument('--journal', action='store_true',
+                        help='Gravar o diário de retomada <saída>.journal ao lado da saída')
+    parser.add_argument('--stats', action='store_true',
+                        help='Mostrar ao final o tempo de cada etapa, percentis e a latência do backend')
+    parser.add_argument('--stats-file', help='Gravar as estatísticas da execução em JSON')
+    parser.add_argument('--profile', metavar='ARQUIVO',
+                        help='Executar a tradução sob o cProfile e gravar o perfil (pstats) em ARQUIVO')
     parser.add_argument('--config', help='Arquivo de configuração JSON')
     parser.add_argument('--create-config', action='store_true', help='Criar arquivo de configuração')
     
@@ -408,8 +366,24 @@ Idiomas suportados: pt, en, es, fr, de, it, ja, zh, ko, ru, ar, hi
         create_config_file()
         return
     
+    # Inspecionar ou limpar o cache persistente
+    if args.cache_info or args.cache_clear:
+        cache = PersistentTranslationCache(args.cache_file or DEFAULT_CACHE_FILE)
+        if args.cache_clear:
+            removed = cache.clear()
+            print(f"🧹 {removed} traduções removidas de {cache.path}")
+        if args.cache_info:
+            info = cache.info()
+            print(f"💾 Cache: {info['path']}")
+            print(f"   Traduções: {info['entries']}")
+            print(f"   Tamanho: {info['size_bytes'] / 1024:.1f} KB")
+            for pair, count in info['language_pairs'].items():
+                print(f"   {pair}: {count}")
+        cache.close()
+        return
+    
     # Verificar se arquivo de entrada foi fornecido
-    if not args.input_file:
+    if not args.input_file and not args.batch and not args.watch and not args.serve:
         print("❌ Erro: Arquivo de entrada é obrigatório")
         parser.print_help()
         sys.exit(1)
@@ -424,22 +398,88 @@ Idiomas suportados: pt, en, es, fr, de, it, ja, zh, ko, ru, ar, hi
             currency_symbol=args.currency_symbol,
             convert_currency=args.convert_currency,
             currency_conversion_rate=args.rate,
-            preserve_numbers=args.preserve_numbers
+            number_treatment=args.number_treatment,
+            target_currency_symbol=args.currency_symbol,
+            preserve_numbers=args.preserve_numbers,
+            batch_size=args.batch_size,
+            max_concurrency=args.workers,
+            engine=args.engine,
+            cache_file=args.cache_file,
+            memory_cache_entries=args.memory_cache_entries,
+            memory_cache_mb=args.memory_cache_mb,
+            backend=args.backend,
+            stub_latency=args.stub_latency,
+            stub_error_rate=args.stub_error_rate,
+            stub_seed=args.stub_seed,
+            stub_throttle_rate=args.stub_throttle_rate,
+            stub_max_rps=args.stub_max_rps,
+            stub_capacity=args.stub_capacity,
+            backend_url=args.backend_url,
+            http_pool_size=args.http_pool,
+            http_keepalive=args.keepalive,
+            http2=args.http2,
+            adaptive_concurrency=args.adaptive,
+            requests_per_second=args.rps,
+            chars_per_second=args.cps,
+            max_retries=args.retries,
+            backoff_base=args.backoff,
+            stream=args.stream,
+            stream_window=args.stream_window,
+            dedup=args.dedup,
+            incremental=args.incremental,
+            journal=args.journal,
+            resume=args.resume
         )
     
+    # Diário, retomada e modo incremental valem também com arquivo de configuração
+    if args.journal:
+        config.journal = True
+    if args.resume:
+        config.resume = True
+    if args.incremental:
+        config.incremental = True
+    if (args.stats or args.stats_file) and not (args.batch or args.partitions or args.watch or args.serve):
+        config.stats = True
+    
     print("🚀 Tradutor CSV v1.0")
     print("=" * 50)
     
     # Verificar dependências
-    if not GOOGLETRANS_AVAILABLE:
+    if config.backend == 'googletrans' and not GOOGLETRANS_AVAILABLE:
         print("❌ Google Translate não está disponível. Instale com:")
         print("pip install googletrans==4.0.0rc1")
         sys.exit(1)
     
+    if args.batch:
+        run_batch_mode(args, config)
+        return
+    if args.serve:
+        run_serve_mode(args, config)
+        return
+    if args.watch:
+        run_watch_mode(args, config)
+        return
+    if args.partitions:
+        run_partitioned_mode(args, config)
+        return
+    
     try:
         # Criar tradutor e executar
-        translator = CSVTranslator(config)
-        output_file = translator.translate_csv(args.input_file, args.output)
+        translator = create_translator(config)
+        try:
+            if args.profile:
+                output_file = profile_call(lambda: translator.translate_csv(args.input_file, args.output),
+                                           args.profile)
+            else:
+                output_file = translator.translate_csv(args.input_file, args.output)
+            
+            if args.stats:
+                translator.print_stats()
+            if args.stats_file:
+                translator.write_stats(args.stats_file)
+                print(f"📊 Estatísticas salvas em: {args.stats_file}")
+        finally:
+            translator.close()
         
         print("\n🎉 Tradução concluída com sucesso!")
         print(f"📂 Arquivo traduzido salvo em: {output_file}")
@@ -12,38 +12,14 @@ usando Google Translate com preservação de formatação.
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import csv
-import re
-import json
 import os
-import sys
 import threading
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
 from datetime import datetime
 import queue
 
-try:
-    from googletrans import Translator, LANGUAGES
-    GOOGLETRANS_AVAILABLE = True
-except ImportError:
-    GOOGLETRANS_AVAILABLE = False
-
-@dataclass
-class TranslationConfig:
-    """Configurações para tradução"""
-    source_language: str = 'pt'
-    target_language: str = 'en'
-    currency_symbol: str = '$'
-    convert_currency: bool = False
-    currency_conversion_rate: float = 1.0
-    preserve_numbers: bool = True
-    preserve_urls: bool = True
-    preserve_emails: bool = True
-    max_retries: int = 3
-    # Novas opções para tratamento de números/moeda
-    number_treatment: str = 'preserve'  # 'preserve', 'convert_currency', 'change_symbol'
-    source_currency_symbol: str = 'R$'
-    target_currency_symbol: str = '$'
+from tradutor_backends import GOOGLETRANS_AVAILABLE
+from tradutor_cache import DEFAULT_CACHE_FILE
+from tradutor_core import CSVTranslator, TranslationConfig
 
 class CSVTranslatorGUI:
     """Interface gráfica para tradução de CSV"""
@@ -73,14 +49,30 @@ class CSVTranslatorGUI:
         self.source_currency_symbol = tk.StringVar(value="R$")
         self.target_currency_symbol = tk.StringVar(value="$")
         
+        # Requisições simultâneas ao backend
+        self.max_workers = tk.IntVar(value=4)
+        
+        # Ajustar as requisições em voo automaticamente (até o valor acima)
+        self.adaptive_concurrency = tk.BooleanVar(value=False)
+        
+        # Limite de requisições por segundo, somando todos os workers (0 = sem limite)
+        self.requests_per_second = tk.DoubleVar(value=0.0)
+        
+        # Cache persistente de traduções (compartilhado com o CLI)
+        self.use_cache = tk.BooleanVar(value=True)
+        
+        # Traduzir todas as linhas de dados (streaming) em vez de só a linha 2
+        self.translate_all_rows = tk.BooleanVar(value=False)
+        
+        # Continuar uma tradução interrompida a partir do diário ao lado da saída
+        self.resume = tk.BooleanVar(value=False)
+        
+        # Traduzir só as células novas ou alteradas desde a tradução anterior da mesma saída
+        self.incremental = tk.BooleanVar(value=False)
+        
         # Queue para comunicação entre threads
         self.progress_queue = queue.Queue()
         
-        # Translator
-        self.translator = None
-        if GOOGLETRANS_AVAILABLE:
-            self.translator = Translator()
-        
         self.setup_ui()
         self.check_dependencies()
         
@@ -139,6 +131,8 @@ class CSVTranslatorGUI:
         
         # Configurar comboboxes com idiomas
         if GOOGLETRANS_AVAILABLE:
+            # Importado só aqui: o googletrans (com httpx) é pesado de carregar
+            from googletrans import LANGUAGES
             languages = [(code, name.title()) for code, name in LANGUAGES.items()]
             languages.sort(key=lambda x: x[1])
             lang_values = [f"{code} - {name}" for code, name in languages]
@@ -159,6 +153,24 @@ class CSVTranslatorGUI:
                        variable=self.preserve_urls).grid(row=0, column=0, sticky=tk.W)
         ttk.Checkbutton(advanced_frame, text="Preservar emails", 
                        variable=self.preserve_emails).grid(row=0, column=1, sticky=tk.W)
+        ttk.Label(advanced_frame, text="Requisições simultâneas:").grid(row=0, column=2, sticky=tk.W, padx=(20, 5))
+        ttk.Spinbox(advanced_frame, from_=1, to=16, textvariable=self.max_workers, width=5).grid(row=0, column=3, sticky=tk.W)
+        ttk.Checkbutton(advanced_frame, text="Usar cache de traduções", 
+                       variable=self.use_cache).grid(row=0, column=4, sticky=tk.W, padx=(20, 0))
+        ttk.Checkbutton(advanced_frame, text="Traduzir todas as linhas (arquivos grandes)", 
+                       variable=self.translate_all_rows,
+                       command=self.update_resume_option).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        ttk.Checkbutton(advanced_frame, text="Ajustar requisições simultâneas automaticamente", 
+                       variable=self.adaptive_concurrency).grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        # O diário de retomada só existe no modo "Traduzir todas as linhas"
+        self.resume_check = ttk.Checkbutton(advanced_frame, text="Retomar tradução interrompida", 
+                                            variable=self.resume)
+        self.resume_check.grid(row=3, column=3, columnspan=2, sticky=tk.W, padx=(20, 0), pady=(10, 0))
+        self.update_resume_option()
+        ttk.Checkbutton(advanced_frame, text="Traduzir só células novas ou alteradas", 
+                       variable=self.incremental).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        ttk.Label(advanced_frame, text="Requisições por segundo (0 = sem limite):").grid(row=2, column=3, sticky=tk.W, padx=(20, 5), pady=(10, 0))
+        ttk.Spinbox(advanced_frame, from_=0, to=100, increment=0.5, textvariable=self.requests_per_second, width=5).grid(row=2, column=4, sticky=tk.W, pady=(10, 0))
         
         # Configurações de números/moeda
         number_frame = ttk.LabelFrame(advanced_frame, text="Tratamento de Números e Moeda", padding="10")
@@ -232,6 +244,14 @@ class CSVTranslatorGUI:
         # Configurar expansão
         main_frame.rowconfigure(8, weight=1)
         
+    def update_resume_option(self):
+        """Retomar só vale com "Traduzir todas as linhas" (o diário é gravado janela a janela)"""
+        if self.translate_all_rows.get():
+            self.resume_check.config(state='normal')
+        else:
+            self.resume.set(False)
+            self.resume_check.config(state='disabled')
+        
     def select_file(self):
         """Seleciona arquivo CSV de entrada"""
         filename = filedialog.askopenfilename(
@@ -355,11 +375,33 @@ class CSVTranslatorGUI:
                 number_treatment=self.number_treatment.get(),
                 source_currency_symbol=self.source_currency_symbol.get(),
                 target_currency_symbol=self.target_currency_symbol.get(),
-                currency_conversion_rate=self.currency_rate.get()
+                currency_conversion_rate=self.currency_rate.get(),
+                max_concurrency=self.max_workers.get(),
+                adaptive_concurrency=self.adaptive_concurrency.get(),
+                requests_per_second=self.requests_per_second.get(),
+                cache_file=DEFAULT_CACHE_FILE if self.use_cache.get() else '',
+                stream=self.translate_all_rows.get(),
+                resume=self.resume.get() and self.translate_all_rows.get(),
+                incremental=self.incremental.get(),
+                # Resumo de tempos por etapa no log ao final
+                stats=True,
+                # Reaplicar caixa alta, baixa e título do original
+                case_mode='full'
             )
             
             self.progress_queue.put({'type': 'log', 'value': f'Iniciando tradução de {config.source_language} para {config.target_language}'})
             
+            if self.translate_all_rows.get():
+                translator = self.create_translator(config)
+                try:
+                    self.translate_csv_stream(translator)
+                    translator.print_stats()
+                finally:
+                    translator.close()
+                self.progress_queue.put({'type': 'log', 'value': f'Arquivo salvo: {self.output_file_path.get()}'})
+                self.progress_queue.put({'type': 'complete', 'value': True})
+                return
+            
             # Ler arquivo CSV
             with open(self.csv_file_path.get(), 'r', encoding='utf-8') as file:
                 reader = csv.reader(file)
@@ -375,29 +417,26 @@ class CSVTranslatorGUI:
             original_data = rows[1]
             
             # Traduzir dados
-            translated_data = []
-            total_fields = len(original_data)
-            
-            for i, field in enumerate(original_data):
-                progress = (i / total_fields) * 100
-                self.progress_queue.put({'type': 'progress', 'value': progress})
-                self.progress_queue.put({'type': 'status', 'value': f'Traduzindo campo {i+1} de {total_fields}'})
+            translator = self.create_translator(config, self.report_requests)
+            try:
+                # Modo incremental: lê a tradução anterior antes de sobrescrevê-la
+                translator.start_incremental(self.output_file_path.get(), layout='gui')
+                translated_data = self.translate_fields(original_data, translator)
                 
-                if field.strip():
-                    translated_field = self.translate_text(field, config)
-                    translated_data.append(translated_field)
-                    self.progress_queue.put({'type': 'log', 'value': f'Campo {i+1}: "{field}" → "{translated_field}"'})
-                else:
-                    translated_data.append(field)
-                    
-            # Salvar arquivo
-            self.progress_queue.put({'type': 'status', 'value': 'Salvando arquivo...'})
-            
-            with open(self.output_file_path.get(), 'w', encoding='utf-8', newline='') as file:
-                writer = csv.writer(file, quoting=csv.QUOTE_ALL)
-                writer.writerow(header)
-                writer.writerow(original_data)
-                writer.writerow(translated_data)
+                # Salvar arquivo
+                self.progress_queue.put({'type': 'status', 'value': 'Salvando arquivo...'})
+                
+                with open(self.output_file_path.get(), 'w', encoding='utf-8', newline='') as file:
+                    writer = csv.writer(file, quoting=csv.QUOTE_ALL)
+                    writer.writerow(header)
+                    writer.writerow(original_data)
+                    writer.writerow(translated_data)
+                
+                translator.record_manifest_rows([original_data])
+                translator.finish_incremental()
+                translator.print_stats()
+            finally:
+                translator.close()
                 
             self.progress_queue.put({'type': 'log', 'value': f'Arquivo salvo: {self.output_file_path.get()}'})
             self.progress_queue.put({'type': 'complete', 'value': True})
@@ -405,188 +444,57 @@ class CSVTranslatorGUI:
         except Exception as e:
             self.progress_queue.put({'type': 'error', 'value': str(e)})
             
-    def translate_text(self, text, config):
-        """Traduz um texto individual"""
-        try:
-            # Garantir que text é string
-            text_str = str(text).strip()
-            
-            if not text_str:
-                return text_str
-            
-            # Preservar elementos (agora inclui processamento de moeda)
-            clean_text, placeholders = self.preserve_elements(text_str, config)
-            
-            # Detectar padrão de caixa
-            case_pattern = self.detect_case_pattern(clean_text)
-            
-            # Traduzir
-            if clean_text.strip():
-                result = self.translator.translate(clean_text, 
-                                                 src=config.source_language, 
-                                                 dest=config.target_language)
-                translated = result.text
-            else:
-                translated = clean_text
-                
-            # Aplicar padrão de caixa
-            translated = self.apply_case_pattern(translated, case_pattern)
-            
-            # Restaurar elementos (já processados na preserve_elements)
-            translated = self.restore_elements(translated, placeholders)
-                
-            return translated
-            
-        except Exception as e:
-            self.progress_queue.put({'type': 'log', 'value': f'Erro ao traduzir "{text}": {str(e)}'})
-            return str(text)  # Retornar o texto original como string
-            
-    def preserve_elements(self, text, config):
-        """Preserva elementos específicos do texto"""
-        placeholders = {}
-        modified_text = str(text)  # Garantir que é string
-        counter = 0
-        
-        patterns = {
-            'url': re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+', re.IGNORECASE),
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'number': re.compile(r'\b\d+(?:[,\.]\d+)*\b'),
-            'currency': re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)\s*(?:R\$|BRL|reais?|USD|\$|€|EUR)', re.IGNORECASE)
-        }
-        
-        # Preservar URLs
-        if config.preserve_urls:
-            for match in patterns['url'].finditer(modified_text):
-                placeholder = f"__URL_{counter}__"
-                placeholders[placeholder] = match.group()
-                modified_text = modified_text.replace(match.group(), placeholder)
-                counter += 1
-        
-        # Preservar emails
-        if config.preserve_emails:
-            for match in patterns['email'].finditer(modified_text):
-                placeholder = f"__EMAIL_{counter}__"
-                placeholders[placeholder] = match.group()
-                modified_text = modified_text.replace(match.group(), placeholder)
-                counter += 1
-        
-        # Tratar números/moeda baseado na configuração
-        if config.number_treatment == 'preserve':
-            # Preservar números como antes
-            if config.preserve_numbers:
-                for match in patterns['number'].finditer(modified_text):
-                    if not any(match.group() in value for value in placeholders.values()):
-                        placeholder = f"__NUMBER_{counter}__"
-                        placeholders[placeholder] = match.group()
-                        modified_text = modified_text.replace(match.group(), placeholder)
-                        counter += 1
-        
-        elif config.number_treatment in ['convert_currency', 'change_symbol']:
-            # Identificar valores monetários e preservá-los para processamento posterior
-            for match in patterns['currency'].finditer(modified_text):
-                placeholder = f"__CURRENCY_{counter}__"
-                original_value = match.group()
-                
-                if config.number_treatment == 'convert_currency':
-                    # Converter valor e trocar símbolo
-                    processed_value = self.process_currency_conversion(original_value, config)
-                elif config.number_treatment == 'change_symbol':
-                    # Apenas trocar símbolo sem converter
-                    processed_value = self.process_currency_symbol_change(original_value, config)
-                
-                placeholders[placeholder] = processed_value
-                modified_text = modified_text.replace(original_value, placeholder)
-                counter += 1
-            
-            # Preservar números não monetários
-            for match in patterns['number'].finditer(modified_text):
-                if not any(match.group() in value for value in placeholders.values()):
-                    placeholder = f"__NUMBER_{counter}__"
-                    placeholders[placeholder] = match.group()
-                    modified_text = modified_text.replace(match.group(), placeholder)
-                    counter += 1
-        
-        return modified_text, placeholders
-        
-    def detect_case_pattern(self, text):
-        """Detecta o padrão de caixa do texto"""
-        text_str = str(text)  # Garantir que é string
-        if text_str.isupper():
-            return "UPPER"
-        elif text_str.islower():
-            return "LOWER"
-        elif text_str.istitle():
-            return "TITLE"
-        else:
-            return "MIXED"
-            
-    def apply_case_pattern(self, text, pattern):
-        """Aplica o padrão de caixa ao texto"""
-        text_str = str(text)  # Garantir que é string
-        if pattern == "UPPER":
-            return text_str.upper()
-        elif pattern == "LOWER":
-            return text_str.lower()
-        elif pattern == "TITLE":
-            return text_str.title()
-        else:
-            return text_str
-            
-    def restore_elements(self, text, placeholders):
-        """Restaura elementos preservados"""
-        restored_text = str(text)  # Garantir que é string
-        for placeholder, original_value in placeholders.items():
-            restored_text = restored_text.replace(placeholder, str(original_value))
-        return restored_text
-        
-    def process_currency_conversion(self, currency_text, config):
-        """Processa conversão de moeda com nova taxa e símbolo"""
-        # Padrão para extrair valor numérico
-        number_pattern = re.compile(r'(\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?)')
-        
-        match = number_pattern.search(currency_text)
-        if match:
-            value_str = match.group(1)
-            # Normalizar formato (converter vírgula para ponto)
-            normalized = value_str.replace(',', '.')
-            
-            try:
-                value = float(normalized)
-                converted_value = value * config.currency_conversion_rate
-                
-                # Formatar com o símbolo de destino
-                if config.target_currency_symbol in ['$', 'USD']:
-                    return f"${converted_value:.2f}"
-                elif config.target_currency_symbol in ['€', 'EUR']:
-                    return f"€{converted_value:.2f}"
-                else:
-                    return f"{config.target_currency_symbol}{converted_value:.2f}"
-                    
-            except ValueError:
-                # Se não conseguir converter, apenas troca símbolo
-                return self.process_currency_symbol_change(currency_text, config)
-        
-        return currency_text
-    
-    def process_currency_symbol_change(self, currency_text, config):
-        """Processa apenas troca de símbolo sem conversão de valor"""
-        # Substituir símbolos conhecidos
-        symbol_replacements = {
-            'R$': config.target_currency_symbol,
-            'BRL': config.target_currency_symbol,
-            'reais': config.target_currency_symbol,
-            'real': config.target_currency_symbol,
-            '$': config.target_currency_symbol,
-            'USD': config.target_currency_symbol,
-            '€': config.target_currency_symbol,
-            'EUR': config.target_currency_symbol
-        }
-        
-        result = currency_text
-        for old_symbol, new_symbol in symbol_replacements.items():
-            result = re.sub(r'\b' + re.escape(old_symbol) + r'\b', new_symbol, result, flags=re.IGNORECASE)
-        
-        return result
+    def translate_csv_stream(self, translator):
+        """
+        Traduz todas as linhas de dados com o modo streaming do motor
+        
+        Janelas, diário ("Retomar tradução interrompida") e modo incremental
+        são os do CLI (CSVTranslator.translate_csv_stream); aqui só mudam o
+        formato da saída (vírgula, QUOTE_ALL) e o progresso, atualizado a
+        cada janela gravada.
+        """
+        def window_done(data_rows, fraction):
+            self.progress_queue.put({'type': 'progress', 'value': fraction * 100})
+            status = f'{data_rows} linha(s) traduzida(s)'
+            if translator.concurrency is not None:
+                status += f' - concorrência: {translator.concurrency.current}/{translator.concurrency.max_limit}'
+            self.progress_queue.put({'type': 'status', 'value': status})
+        
+        total_rows = translator.translate_csv_stream(self.csv_file_path.get(), self.output_file_path.get(),
+                                                     delimiter=',', quoting=csv.QUOTE_ALL, layout='gui',
+                                                     window_progress=window_done)
+        if total_rows < 2:
+            raise ValueError("O arquivo CSV deve ter pelo menos 2 linhas (cabeçalho + dados)")
+        self.progress_queue.put({'type': 'log', 'value': f'{total_rows - 1} linha(s) de dados traduzidas'})
+        
+    def create_translator(self, config, progress=None):
+        """Cria o motor de tradução compartilhado com o CLI, com o log desta janela"""
+        return CSVTranslator(config,
+                             log=lambda message: self.progress_queue.put({'type': 'log', 'value': message}),
+                             progress=progress)
+        
+    def report_requests(self, done, total):
+        """Atualiza a barra de progresso a cada requisição concluída"""
+        self.progress_queue.put({'type': 'progress', 'value': done / total * 100})
+        self.progress_queue.put({'type': 'status', 'value': f'Requisição {done} de {total} concluída'})
+        
+    def translate_fields(self, fields, translator, verbose=True):
+        """
+        Traduz os campos de uma linha com o motor compartilhado
+        
+        Cache, lotes, deduplicação e requisições simultâneas ficam a cargo de
+        CSVTranslator; a ordem dos campos é mantida. Com `verbose` desligado
+        não registra cada campo (usado ao traduzir todas as linhas).
+        """
+        translated_data = translator.translate_row(list(fields))
+        
+        if verbose:
+            for i, (field, translated) in enumerate(zip(fields, translated_data)):
+                if field.strip():
+                    self.progress_queue.put({'type': 'log', 'value': f'Campo {i+1}: "{field}" → "{translated}"'})
+            self.progress_queue.put({'type': 'log', 'value': f'Requisições ao backend: {translator.backend_requests}'})
+        
+        return translated_data
 
 def main():
     """Função principal"""
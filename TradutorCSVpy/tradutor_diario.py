@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diário de Tradução - Ponto de retomada para execuções interrompidas
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+O diário é um arquivo JSON Lines gravado ao lado da saída
+(`<saída>.journal`), só com acréscimos:
+- cabeçalho: hash do arquivo de entrada e da configuração que muda a saída
+- "cells": traduções finais concluídas, gravadas a cada lote
+- "window": linhas de dados já gravadas na saída e o tamanho dela em bytes
+
+Com --resume, um diário com o mesmo cabeçalho é relido: a saída é cortada
+no último ponto registrado, as linhas já gravadas são puladas e as células
+já traduzidas do trecho restante não voltam ao backend. Uma última linha
+incompleta (queda no meio da gravação) é ignorada. Ao fim de uma execução
+completa o diário é apagado, assim como um diário sem nenhum registro (a
+entrada falhou antes da primeira tradução, como um CSV vazio no --batch).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = '.journal'
+
+def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 do conteúdo de um arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def journal_path(output_file: str) -> str:
+    return output_file + JOURNAL_SUFFIX
+
+class TranslationJournal:
+    """Diário só de acréscimos com as células e janelas concluídas"""
+
+    def __init__(self, path: str, header: Dict, resume: bool = False):
+        """
+        Args:
+            path: Arquivo do diário
+            header: Identificação da execução (entrada, configuração, idiomas)
+            resume: Reaproveitar um diário existente com o mesmo cabeçalho
+        """
+        self.path = path
+        self.header = dict(header, type='header', version=JOURNAL_VERSION)
+        # (idioma, texto original) -> tradução final
+        self.translations: Dict[Tuple[str, str], str] = {}
+        self.rows_done = 0
+        self.output_bytes: Optional[int] = None
+        self.resumed = False
+        self.mismatch = False
+        # Algum lote ou janela registrado nesta execução
+        self.recorded = False
+        # Chamadas simultâneas ao mesmo tradutor registram lotes ao mesmo tempo
+        self._lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            self._load()
+
+        self._file = open(path, 'a' if self.resumed else 'w', encoding='utf-8')
+        if not self.resumed:
+            self._write(self.header, sync=True)
+
+    def _load(self):
+        """Relê um diário existente; descarta-o se for de outra entrada ou configuração"""
+        with open(self.path, 'rb') as file:
+            data = file.read()
+
+        entries = []
+        valid_bytes = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                # Linha cortada por uma queda no meio da gravação
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            valid_bytes += len(line)
+
+        if not entries or entries[0] != self.header:
+            self.mismatch = bool(entries)
+            return
+
+        for entry in entries[1:]:
+            if entry.get('type') == 'cells':
+                language = entry['language']
+                for text, translated in entry['items']:
+                    self.translations[language, text] = translated
+            elif entry.get('type') == 'window':
+                self.rows_done = entry['rows']
+                self.output_bytes = entry['output_bytes']
+
+        # Novas entradas continuam depois da última linha completa
+        if valid_bytes < len(data):
+            os.truncate(self.path, valid_bytes)
+        self.resumed = True
+
+    def _write(self, entry: Dict, sync: bool = False):
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def record_cells(self, language: str, items: List[Tuple[str, str]]):
+        """Registra traduções concluídas (texto original, tradução final) de um idioma"""
+        if items:
+            self.recorded = True
+            self._write({'type': 'cells', 'language': language, 'items': items})
+
+    def record_window(self, rows_done: int, output_bytes: int):
+        """Registra que `rows_done` linhas de dados estão gravadas na saída, com `output_bytes` bytes"""
+        self.rows_done = rows_done
+        self.output_bytes = output_bytes
+        self.recorded = True
+        self._write({'type': 'window', 'rows': rows_done, 'output_bytes': output_bytes}, sync=True)
+
+    def close(self, completed: bool = False):
+        """Fecha o diário; apaga-o se a execução terminou ou se ele só tem o cabeçalho"""
+        if self._file.closed:
+            return
+        self._file.close()
+        if completed or not (self.resumed or self.recorded):
+            os.remove(self.path)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estatísticas da Execução - Tempo por etapa, latência do backend e perfil
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+RunStats acumula, para cada etapa do caminho quente (leitura do CSV,
+preservação, backend, restauração, moeda, escrita), o número de chamadas,
+o tempo total, mínimo, máximo e um histograma com faixas logarítmicas, de
+onde saem os percentis. A memória é fixa: nenhuma amostra é guardada.
+
+O tradutor só cria um RunStats com `stats` ligado na configuração; o
+resumo vai para o log (--stats, painel da interface) e em JSON para um
+arquivo (--stats-file). profile_call roda uma função sob o cProfile.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List
+
+# Nome de cada etapa no resumo, na ordem do pipeline
+STAGE_LABELS = {
+    'leitura_csv': 'Leitura do CSV',
+    'planejamento': 'Planejamento (--dedup)',
+    'preservacao': 'Preservação',
+    'backend': 'Backend (por tentativa)',
+    'restauracao': 'Restauração',
+    'moeda': 'Moeda',
+    'escrita_csv': 'Escrita do CSV',
+}
+
+class LatencyHistogram:
+    """
+    Histograma de durações com faixas por oitava
+
+    Cada oitava (de 1 µs a cerca de uma hora) é dividida em quatro faixas
+    iguais, então cada percentil tem erro de no máximo 25%; durações menores
+    ou maiores caem na primeira ou na última faixa. A faixa sai de
+    math.frexp, sem logaritmo, porque add() roda a cada célula.
+    """
+
+    MIN_SECONDS = 1e-6
+    BUCKETS_PER_OCTAVE = 4
+    OCTAVES = 32
+    BUCKETS = BUCKETS_PER_OCTAVE * OCTAVES
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+
+    @classmethod
+    def upper_bound(cls, index: int) -> float:
+        """Limite superior da faixa `index`, em segundos"""
+        octave, part = divmod(index, cls.BUCKETS_PER_OCTAVE)
+        return cls.MIN_SECONDS * 2 ** octave * (1 + (part + 1) / cls.BUCKETS_PER_OCTAVE)
+
+    def add(self, seconds: float):
+        # seconds / MIN_SECONDS = mantissa × 2^exponent, com mantissa em [0.5, 1)
+        mantissa, exponent = math.frexp(seconds / self.MIN_SECONDS)
+        index = (exponent - 1) * self.BUCKETS_PER_OCTAVE + int((mantissa - 0.5) * 2 * self.BUCKETS_PER_OCTAVE)
+        if index < 0:
+            index = 0
+        elif index >= self.BUCKETS:
+            index = self.BUCKETS - 1
+        self.counts[index] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Limite superior da faixa que contém o percentil `fraction` (0 a 1)"""
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+        rank = max(1, math.ceil(fraction * total))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.upper_bound(index)
+        return self.upper_bound(self.BUCKETS - 1)
+
+    def buckets(self) -> List[Dict]:
+        """Faixas não vazias: [{"le": limite superior em segundos, "count": n}]"""
+        return [{'le': self.upper_bound(index), 'count': count}
+                for index, count in enumerate(self.counts) if count]
+
+class StageStats:
+    """Contadores de uma etapa"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = LatencyHistogram()
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram.add(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        # A faixa do histograma nunca passa dos extremos observados
+        return min(self.max, max(self.min, self.histogram.percentile(fraction)))
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'min_seconds': self.min if self.count else 0.0,
+            'p50_seconds': self.percentile(0.50),
+            'p90_seconds': self.percentile(0.90),
+            'p99_seconds': self.percentile(0.99),
+            'max_seconds': self.max,
+        }
+
+class _StageTimer:
+    """Context manager que mede um trecho e registra na etapa"""
+
+    __slots__ = ('stats', 'stage', 'started')
+
+    def __init__(self, stats: 'RunStats', stage: str):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.record(self.stage, time.perf_counter() - self.started)
+        return False
+
+class RunStats:
+    """Tempo por etapa e contadores de uma execução, seguro entre threads"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """Registra uma duração da etapa `stage`"""
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.add(seconds)
+
+    def timer(self, stage: str) -> _StageTimer:
+        """Mede o bloco `with` como uma chamada da etapa `stage`"""
+        return _StageTimer(self, stage)
+
+    def count(self, name: str, amount: int = 1):
+        """Soma `amount` ao contador `name`"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def elapsed(self) -> float:
+        """Segundos desde a criação (início da execução)"""
+        return time.perf_counter() - self.started
+
+    def summary(self) -> Dict:
+        """Etapas (na ordem do pipeline), histograma do backend e contadores"""
+        with self._lock:
+            order = [stage for stage in STAGE_LABELS if stage in self.stages]
+            order += sorted(stage for stage in self.stages if stage not in STAGE_LABELS)
+            backend = self.stages.get('backend')
+            return {
+                'elapsed_seconds': self.elapsed(),
+                'stages': {stage: self.stages[stage].summary() for stage in order},
+                'backend_latency_histogram': backend.histogram.buckets() if backend else [],
+                'counters': dict(self.counters),
+            }
+
+def format_seconds(seconds: float) -> str:
+    """Duração curta legível: µs, ms ou s"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+def stage_lines(summary: Dict) -> List[str]:
+    """Tabela das etapas para o log"""
+    lines = [f"   {'Etapa':<26}{'chamadas':>10}{'total':>11}{'média':>11}{'p50':>11}{'p90':>11}{'p99':>11}{'máx':>11}"]
+    for stage, values in summary['stages'].items():
+        lines.append(f"   {STAGE_LABELS.get(stage, stage):<26}{values['count']:>10}"
+                     f"{format_seconds(values['total_seconds']):>11}{format_seconds(values['mean_seconds']):>11}"
+                     f"{format_seconds(values['p50_seconds']):>11}{format_seconds(values['p90_seconds']):>11}"
+                     f"{format_seconds(values['p99_seconds']):>11}{format_seconds(values['max_seconds']):>11}")
+    return lines
+
+def histogram_lines(buckets: List[Dict], width: int = 30) -> List[str]:
+    """Histograma da latência do backend agrupado por oitava (faixas de 2x)"""
+    octaves: Dict[int, int] = {}
+    for bucket in buckets:
+        octave = math.ceil(round(math.log2(bucket['le'] / LatencyHistogram.MIN_SECONDS), 6)) - 1
+        octaves[octave] = octaves.get(octave, 0) + bucket['count']
+    if not octaves:
+        return []
+
+    largest = max(octaves.values())
+    lines = []
+    for octave in range(min(octaves), max(octaves) + 1):
+        count = octaves.get(octave, 0)
+        bar = '█' * max(1 if count else 0, round(count / largest * width))
+        upper = LatencyHistogram.MIN_SECONDS * 2 ** (octave + 1)
+        lines.append(f"   ≤ {format_seconds(upper):>9} {bar:<{width}} {count}")
+    return lines
+
+def profile_call(function: Callable, output_file: str, log: Callable[[str], None] = print,
+                 top: int = 15):
+    """
+    Executa `function` sob o cProfile
+
+    Grava as estatísticas em `output_file` (para pstats ou snakeviz) e
+    mostra no log as `top` funções com maior tempo acumulado. Retorna o
+    resultado de `function`.
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function)
+    finally:
+        profiler.dump_stats(output_file)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top)
+        log(f"🔬 Perfil (cProfile) salvo em: {output_file}")
+        for line in report.getvalue().splitlines():
+            if line.strip() and not line.lstrip().startswith(('Ordered by', 'List reduced')):
+                log(f"   {line}")
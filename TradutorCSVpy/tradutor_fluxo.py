@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Controle de Fluxo - Limite de taxa, espera entre tentativas e concorrência adaptativa
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+RateLimiter combina dois baldes de fichas (requisições por segundo e
+caracteres por segundo) compartilhados por todos os workers de um tradutor.
+Cada requisição reserva as fichas de que precisa e recebe o tempo que deve
+esperar antes de ser enviada, então o mesmo limitador serve ao pool de
+threads (time.sleep) e ao motor asyncio (asyncio.sleep).
+
+Quando o backend responde 429 (ou pede para esperar com Retry-After), o
+limitador fica pausado para todos os workers até o prazo pedido, em vez de
+cada worker insistir por conta própria.
+
+AdaptiveConcurrency ajusta o número de requisições em voo por AIMD:
+aumento aditivo enquanto latência e erros estão saudáveis, redução
+multiplicativa em 429 e timeouts.
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+class TokenBucket:
+    """
+    Balde de fichas com reposição contínua
+
+    `rate` fichas por segundo, acumulando no máximo `capacity`. reserve()
+    pode deixar o saldo negativo: quem reserva depois espera também a
+    dívida de quem veio antes, o que mantém a ordem de chegada sem filas.
+
+    A capacidade padrão (uma ficha) espaça as requisições por igual: uma
+    rajada acumulada somada à taxa sustentada passaria do limite do servidor
+    em qualquer janela de um segundo.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, tokens: float, now: float) -> float:
+        """Retira as fichas e retorna quantos segundos esperar (chamar com o lock do limitador)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= tokens
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+class RateLimiter:
+    """
+    Limite de requisições e de caracteres por segundo, seguro entre threads
+
+    Um limite 0 (ou negativo) desativa o balde correspondente.
+    """
+
+    def __init__(self, requests_per_second: float = 0.0, chars_per_second: float = 0.0):
+        self.requests = TokenBucket(requests_per_second) if requests_per_second > 0 else None
+        self.chars = TokenBucket(chars_per_second) if chars_per_second > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Contadores para o resumo da execução
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.pauses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests is not None or self.chars is not None
+
+    def reserve(self, chars: int = 0) -> float:
+        """Reserva uma requisição de `chars` caracteres e retorna a espera em segundos"""
+        now = time.monotonic()
+        with self._lock:
+            delay = max(0.0, self._paused_until - now)
+            if self.requests is not None:
+                delay = max(delay, self.requests.reserve(1, now))
+            if self.chars is not None and chars:
+                delay = max(delay, self.chars.reserve(chars, now))
+            if delay > 0:
+                self.waits += 1
+                self.wait_seconds += delay
+        return delay
+
+    def acquire(self, chars: int = 0):
+        """Bloqueia a thread atual até a requisição caber no limite"""
+        delay = self.reserve(chars)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Suspende novas requisições de todos os workers por `seconds` (ex.: Retry-After)"""
+        if seconds <= 0:
+            return
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self.pauses += 1
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None,
+                  rng: random.Random = None) -> float:
+    """
+    Espera antes da tentativa `attempt` + 1 (attempt começa em 0)
+
+    Recuo exponencial com jitter completo: um valor sorteado entre 0 e
+    min(cap, base * 2^attempt), para os workers não voltarem todos juntos.
+    Se o servidor mandou Retry-After, espera pelo menos esse tempo.
+    """
+    rng = rng or random
+    delay = rng.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+class AdaptiveConcurrency:
+    """
+    Limite de requisições em voo ajustado por AIMD (aumento aditivo, redução multiplicativa)
+
+    Começa em `min_limit` e cresce uma vaga por resposta saudável (partida
+    lenta) até o primeiro sinal de congestionamento; depois cresce cerca de
+    uma vaga por rodada de `limit` respostas. Respostas 429 e timeouts cortam
+    o limite por `decrease_factor`; latência acima de `latency_tolerance`
+    vezes a menor latência observada corta por `latency_factor`. Só uma
+    redução vale por rodada: respostas de requisições enviadas antes do
+    último corte, ou que chegam antes de passar uma latência normal desde
+    ele, não cortam de novo.
+
+    acquire() bloqueia a thread até abrir uma vaga; o motor asyncio usa
+    try_acquire() com a sua própria condição.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_tolerance: float = 2.0,
+                 decrease_factor: float = 0.5, latency_factor: float = 0.9):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+
+        self.limit = float(self.min_limit)
+        self.in_flight = 0
+        self.slow_start = True
+        # Menor latência observada (referência de servidor sem carga)
+        self.baseline: Optional[float] = None
+        self._last_decrease = float('-inf')
+        self._condition = threading.Condition()
+
+        # Contadores para o resumo da execução
+        self.increases = 0
+        self.decreases = 0
+        self.peak_limit = self.min_limit
+
+    @property
+    def current(self) -> int:
+        """Vagas disponíveis no momento"""
+        return int(self.limit)
+
+    def try_acquire(self) -> bool:
+        """Ocupa uma vaga se houver; não bloqueia"""
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        """Bloqueia a thread atual até abrir uma vaga"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    def release(self, started: float, latency: float, congested: bool = False, failed: bool = False):
+        """
+        Libera a vaga e ajusta o limite com o resultado da requisição
+
+        Args:
+            started: time.monotonic() do envio da requisição
+            latency: duração da requisição, em segundos
+            congested: o servidor recusou por excesso (429) ou não respondeu a tempo
+            failed: outro erro (não aumenta nem reduz o limite)
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if congested:
+                self._decrease(started, self.decrease_factor)
+            elif not failed:
+                if self.baseline is None or latency < self.baseline:
+                    self.baseline = latency
+
+                if latency > self.baseline * self.latency_tolerance:
+                    self._decrease(started, self.latency_factor)
+                elif self.limit < self.max_limit:
+                    self.limit = min(self.max_limit, self.limit + (1.0 if self.slow_start else 1.0 / self.limit))
+                    self.increases += 1
+                    self.peak_limit = max(self.peak_limit, int(self.limit))
+            self._condition.notify_all()
+
+    def _decrease(self, started: float, factor: float):
+        """Redução multiplicativa, no máximo uma por rodada de requisições"""
+        now = time.monotonic()
+        if started < self._last_decrease or now - self._last_decrease < (self.baseline or 0.0):
+            return
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self.slow_start = False
+        self._last_decrease = now
+        self.decreases += 1
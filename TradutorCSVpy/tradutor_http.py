@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conexões HTTP - Pool de conexões persistentes para os backends HTTP
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+ConnectionPool mantém conexões HTTP/1.1 abertas (keep-alive) para uma
+origem e as empresta a cada requisição, então os workers de uma execução
+pagam o handshake TCP/TLS uma vez por conexão, não por requisição. O pool é
+compartilhado por todos os workers que falam com a mesma origem
+(connection_pool), tem tamanho máximo e fecha conexões ociosas por mais de
+`keepalive` segundos. HTTPStats conta conexões abertas e reaproveitadas.
+
+LocalTranslateServer imita o endpoint web do Google em 127.0.0.1 para
+testar o backend google-web sem rede, com latência e custo de handshake
+simulados:
+    python tradutor_http.py --port 8765 --latency 0.02 --handshake 0.05
+    python tradutor_csv.py arquivo.csv --backend google-web --backend-url http://127.0.0.1:8765/translate_a/single
+"""
+
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Falhas de uma conexão reaproveitada que o servidor fechou enquanto ociosa
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                           BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+class HTTPStats:
+    """Contadores de requisições e conexões, seguros entre threads"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.reused = 0
+        # Conexões ociosas que o servidor fechou (requisição repetida em uma nova)
+        self.stale = 0
+        # Conexões fechadas por passar do tempo de keep-alive
+        self.expired = 0
+        self.http_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, **amounts: int):
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def count_version(self, version: str):
+        with self._lock:
+            self.http_versions[version] = self.http_versions.get(version, 0) + 1
+
+    @staticmethod
+    def combine(snapshots: List[Dict]) -> Dict:
+        """Soma snapshots de vários workers em um só"""
+        total = {'requests': 0, 'connections_opened': 0, 'reused': 0, 'stale': 0, 'expired': 0, 'http_versions': {}}
+        for snapshot in snapshots:
+            for name in ('requests', 'connections_opened', 'reused', 'stale', 'expired'):
+                total[name] += snapshot[name]
+            for version, count in snapshot['http_versions'].items():
+                total['http_versions'][version] = total['http_versions'].get(version, 0) + count
+        total['reuse_rate'] = total['reused'] / total['requests'] if total['requests'] else 0.0
+        return total
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'reused': self.reused,
+                'reuse_rate': self.reused / self.requests if self.requests else 0.0,
+                'stale': self.stale,
+                'expired': self.expired,
+                'http_versions': dict(self.http_versions),
+            }
+
+class ConnectionPool:
+    """
+    Conexões HTTP/1.1 persistentes para uma origem (esquema, host e porta)
+
+    Cada requisição pega a conexão ociosa mais recente (ou abre uma nova) e
+    a devolve ao terminar de ler a resposta. No máximo `max_connections`
+    ficam em uso ao mesmo tempo; quem passar disso espera uma conexão livre.
+    Com `keepalive` 0 cada requisição abre e fecha a sua conexão.
+    """
+
+    def __init__(self, origin: str, max_connections: int = 100, keepalive: float = 30.0, timeout: float = 10.0):
+        parsed = urllib.parse.urlsplit(origin)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.max_connections = max(1, max_connections)
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.stats = HTTPStats()
+        # (conexão, time.monotonic() de quando ficou ociosa), a mais recente no fim
+        self._idle: List[Tuple[http.client.HTTPConnection, float]] = []
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+
+    def _count(self, stats: Optional[HTTPStats], **amounts: int):
+        self.stats.count(**amounts)
+        if stats is not None:
+            stats.count(**amounts)
+
+    def _new_connection(self, stats: Optional[HTTPStats]) -> http.client.HTTPConnection:
+        self._count(stats, connections_opened=1)
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self, stats: Optional[HTTPStats]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Conexão ociosa ainda dentro do keep-alive, ou uma nova; retorna (conexão, reaproveitada)"""
+        now = time.monotonic()
+        expired = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                candidate, idle_since = self._idle.pop()
+                if now - idle_since < self.keepalive:
+                    connection = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            stale.close()
+        if expired:
+            self._count(stats, expired=len(expired))
+        if connection is not None:
+            return connection, True
+        return self._new_connection(stats), False
+
+    def _checkin(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """Devolve a conexão ao pool, ou fecha se o servidor pediu ou keep-alive está desligado"""
+        if self.keepalive <= 0 or response.will_close:
+            connection.close()
+            return
+        with self._lock:
+            self._idle.append((connection, time.monotonic()))
+
+    def request(self, method: str, url: str, body: bytes = None,
+                headers: Dict[str, str] = None, stats: HTTPStats = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Envia uma requisição e lê a resposta inteira
+
+        Se uma conexão reaproveitada tiver sido fechada pelo servidor, a
+        requisição é repetida uma vez em uma conexão nova. Erros de rede
+        (OSError, http.client.HTTPException) sobem para o backend. Os
+        contadores vão para o pool e, se informado, para `stats` (do worker).
+
+        Returns:
+            (status, cabeçalhos, corpo)
+        """
+        parsed = urllib.parse.urlsplit(url)
+        target = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+        headers = dict(headers or {})
+        if self.keepalive <= 0:
+            headers['Connection'] = 'close'
+
+        with self._slots:
+            connection, reused = self._checkout(stats)
+            try:
+                try:
+                    connection.request(method, target, body=body, headers=headers)
+                    response = connection.getresponse()
+                except STALE_CONNECTION_ERRORS:
+                    if not reused:
+                        raise
+                    connection.close()
+                    self._count(stats, stale=1)
+                    connection, reused = self._new_connection(stats), False
+                    connection.request(method, target, body=body, headers=headers)
+                    response = connection.getresponse()
+                data = response.read()
+            except BaseException:
+                connection.close()
+                raise
+
+            self._count(stats, requests=1, reused=int(reused))
+            version = 'HTTP/1.1' if response.version == 11 else 'HTTP/1.0'
+            self.stats.count_version(version)
+            if stats is not None:
+                stats.count_version(version)
+            self._checkin(connection, response)
+            return response.status, dict(response.getheaders()), data
+
+    def close(self):
+        """Fecha as conexões ociosas"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            connection.close()
+
+@lru_cache(maxsize=None)
+def connection_pool(origin: str, max_connections: int, keepalive: float, timeout: float) -> ConnectionPool:
+    """
+    Pool compartilhado por origem e configuração
+
+    Os backends de cada worker (um por thread, ver BackendPool) recebem o
+    mesmo pool, que dura o processo inteiro: uma execução seguinte (ou o
+    próximo arquivo na interface) já encontra as conexões abertas.
+    """
+    return ConnectionPool(origin, max_connections, keepalive, timeout)
+
+def origin_of(url: str) -> str:
+    """Esquema, host e porta de uma URL"""
+    parsed = urllib.parse.urlsplit(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+class _TranslateHandler(BaseHTTPRequestHandler):
+    """Responde como translate_a/single: cada parte do texto recebe o prefixo "[idioma] " """
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo em um só envio (sem a espera do Nagle com ACK atrasado)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.stand_in.count_connection()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, params: Dict[str, List[str]]):
+        # Import local: tradutor_backends importa este módulo
+        from tradutor_backends import BATCH_SEPARATOR_PATTERN
+
+        stand_in = self.server.stand_in
+        stand_in.count_request()
+        if stand_in.latency > 0:
+            time.sleep(stand_in.latency)
+
+        text = params.get('q', [''])[0]
+        prefix = f"[{params.get('tl', ['?'])[0]}] "
+        # Prefixo depois de cada separador de lote, como o stub faz com cada texto
+        translated = prefix + BATCH_SEPARATOR_PATTERN.sub(lambda match: match.group(0) + prefix, text)
+        payload = json.dumps([[[translated, text, None, None]], None, params.get('sl', ['auto'])[0]],
+                             ensure_ascii=False).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._respond(urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        params.update(urllib.parse.parse_qs(self.rfile.read(length).decode('utf-8')))
+        self._respond(params)
+
+class LocalTranslateServer:
+    """
+    Servidor HTTP local no lugar do endpoint web do Google (testes e benchmarks)
+
+    Mantém as conexões abertas (HTTP/1.1) e conta quantas foram aceitas, o
+    que permite conferir do lado do servidor o reaproveitamento do pool.
+    `handshake` atrasa cada conexão nova, simulando o custo do TLS.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, handshake: float = 0.0):
+        self.latency = latency
+        self.handshake = handshake
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _TranslateHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL para backend_url (--backend-url)"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/translate_a/single"
+
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+        if self.handshake > 0:
+            time.sleep(self.handshake)
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> str:
+        """Atende em uma thread em segundo plano e retorna a URL"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor local que imita o endpoint web do Google (backend google-web)")
+    parser.add_argument('--port', type=int, default=8765, help='Porta (padrão: 8765)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência por requisição, em segundos')
+    parser.add_argument('--handshake', type=float, default=0.0,
+                        help='Atraso de cada conexão nova (custo do handshake TLS), em segundos')
+    args = parser.parse_args()
+
+    server = LocalTranslateServer(port=args.port, latency=args.latency, handshake=args.handshake)
+    print(f"🌐 Servidor local em {server.url} (Ctrl+C para encerrar)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"📊 {server.requests} requisições em {server.connections} conexões")
+
+if __name__ == "__main__":
+    main()
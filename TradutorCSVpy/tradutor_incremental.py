@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo Incremental - Reaproveita as traduções de células que não mudaram
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Cada execução incremental grava, ao lado da saída, um manifesto
+(`<saída>.manifest`, JSON Lines) com o hash do texto de cada célula de
+dados da entrada, linha a linha, na mesma ordem da saída. Na execução
+seguinte o manifesto e a saída anterior são lidos juntos: para cada hash,
+as traduções que estão na saída anterior (uma linha traduzida por idioma,
+no layout de translate_csv). Células da nova entrada com o mesmo hash
+recebem essas traduções sem passar pelo backend.
+
+Células cuja tradução falhou ficam sem hash no manifesto (null), para não
+serem copiadas sem tradução nas próximas execuções. Traduções corrigidas à
+mão na saída anterior são mantidas.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest'
+
+def cell_hash(text: str) -> str:
+    """Hash compacto do conteúdo de uma célula"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def manifest_path(output_file: str) -> str:
+    return output_file + MANIFEST_SUFFIX
+
+def _compatible(previous: Dict, header: Dict) -> bool:
+    """Mesma configuração e layout; os idiomas podem mudar"""
+    fields = ('config', 'source', 'stream', 'layout')
+    return (previous.get('version') == MANIFEST_VERSION
+            and all(previous.get(field) == header.get(field) for field in fields))
+
+def load_previous_translations(output_file: str, header: Dict) -> Tuple[Optional[Dict[str, Dict[str, str]]], str]:
+    """
+    Lê o manifesto e a saída anterior
+
+    Returns:
+        (hash da célula -> {idioma: tradução}, None se não houver execução
+        anterior compatível) e uma mensagem explicando o motivo
+    """
+    path = manifest_path(output_file)
+    if not os.path.exists(path) or not os.path.exists(output_file):
+        return None, f"nenhuma execução anterior em {path}"
+
+    with open(path, 'r', encoding='utf-8') as manifest_file:
+        try:
+            previous = json.loads(manifest_file.readline())
+        except ValueError:
+            return None, f"manifesto {path} inválido"
+        if not _compatible(previous, header):
+            return None, f"manifesto {path} é de outra configuração"
+
+        languages = previous['languages']
+        translations: Dict[str, Dict[str, str]] = {}
+
+        with open(output_file, 'r', encoding='utf-8', newline='') as output:
+            sample = output.read(1024)
+            output.seek(0)
+            delimiter = csv.Sniffer().sniff(sample).delimiter if sample else ','
+            reader = csv.reader(output, delimiter=delimiter, quotechar='"')
+
+            # Layout de translate_csv: cabeçalho, [linha original,] traduções por idioma
+            next(reader, None)
+            if not previous['stream']:
+                next(reader, None)
+
+            for line in manifest_file:
+                hashes = json.loads(line)
+                translated_rows = [next(reader, None) for _ in languages]
+                if any(row is None for row in translated_rows):
+                    return None, f"saída {output_file} não corresponde ao manifesto"
+                for column, digest in enumerate(hashes):
+                    if digest is None:
+                        continue
+                    cell = translations.setdefault(digest, {})
+                    for language, row in zip(languages, translated_rows):
+                        if column < len(row):
+                            cell[language] = row[column]
+
+    return translations, f"{len(translations)} textos da execução anterior"
+
+class ManifestWriter:
+    """
+    Grava o manifesto da execução atual
+
+    As linhas vão para um arquivo temporário, que só substitui o manifesto
+    anterior quando a execução termina (commit).
+    """
+
+    def __init__(self, output_file: str, header: Dict):
+        self.path = manifest_path(output_file)
+        self._temp_path = self.path + '.tmp'
+        self._file = open(self._temp_path, 'w', encoding='utf-8')
+        self._file.write(json.dumps(dict(header, version=MANIFEST_VERSION), ensure_ascii=False) + '\n')
+
+    def add_rows(self, rows: Iterable[List[str]], failed: Set[str] = frozenset()):
+        """Registra os hashes das células de dados; células em `failed` ficam sem hash"""
+        for row in rows:
+            hashes = [None if cell in failed else cell_hash(cell) for cell in row]
+            self._file.write(json.dumps(hashes) + '\n')
+
+    def commit(self):
+        """Fecha e publica o manifesto"""
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def discard(self):
+        """Execução interrompida: mantém o manifesto anterior"""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self._temp_path)
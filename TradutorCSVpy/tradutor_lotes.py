@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lotes de Tradução - Empacotamento de células em requisições ao backend
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Agrupa os textos já preservados (com placeholders) em requisições o mais
+próximas possível do limite de caracteres do backend, registrando a que
+célula pertence cada trecho para que o resultado seja dividido de volta.
+Textos maiores que o limite são quebrados em trechos, sempre em fronteiras
+de frase ou espaço e nunca no meio de um placeholder.
+"""
+
+import re
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+# Placeholders gerados por _preserve_elements (ex.: __URL_0__, __NUMBER_12__)
+PLACEHOLDER_PATTERN = re.compile(r'__[A-Z]+_\d+__')
+SENTENCE_BREAK_PATTERN = re.compile(r'[\.!?…]\s+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@dataclass
+class CellSegment:
+    """Trecho de uma célula dentro de uma requisição"""
+    cell_index: int
+    part_index: int
+    text: str
+    # Espaço que separava este trecho do anterior na célula original
+    joiner: str = ''
+
+@dataclass
+class PackedRequest:
+    """Requisição empacotada com as fronteiras de cada célula"""
+    segments: List[CellSegment] = field(default_factory=list)
+    chars: int = 0
+
+    @property
+    def texts(self) -> List[str]:
+        return [segment.text for segment in self.segments]
+
+def dedupe_texts(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Remove textos repetidos antes do empacotamento
+    Retorna (textos únicos na ordem de aparição, posição de cada texto na lista única)
+    """
+    positions: Dict[str, int] = {}
+    unique_positions = [positions.setdefault(text, len(positions)) for text in texts]
+    return list(positions), unique_positions
+
+@dataclass
+class FlightClaim:
+    """Textos únicos de uma chamada: os que ela envia e os que esperam outra chamada"""
+    language: str
+    texts: List[str]
+    # Posições (em `texts`) que esta chamada envia ao backend
+    led: List[int]
+    # Posição → resultado da chamada que já estava enviando o mesmo texto
+    waiting: Dict[int, Future]
+    published: bool = False
+
+class InFlightRegistry:
+    """
+    Textos enviados ao backend e ainda sem resposta (single-flight)
+
+    dedupe_texts só vale dentro de uma chamada. Quando várias chamadas ao
+    mesmo tradutor correm juntas (threads ou tarefas asyncio), a primeira
+    que precisa de um texto para um idioma o envia; as outras recebem um
+    Future e esperam o resultado dela em vez de repetir a requisição.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, language: str, texts: List[str]) -> FlightClaim:
+        """Reserva os textos que ninguém está enviando; os demais ficam esperando"""
+        led = []
+        waiting = {}
+        with self._lock:
+            for position, text in enumerate(texts):
+                flight = self._flights.get((language, text))
+                if flight is None:
+                    self._flights[(language, text)] = Future()
+                    led.append(position)
+                else:
+                    waiting[position] = flight
+        return FlightClaim(language, texts, led, waiting)
+
+    def publish(self, claim: FlightClaim, translations: List[Optional[str]]):
+        """
+        Entrega a quem espera o resultado dos textos enviados (None = falhou)
+
+        Deve ser chamado mesmo se o envio falhar (com None), senão as outras
+        chamadas esperam para sempre.
+        """
+        if claim.published:
+            return
+        claim.published = True
+        with self._lock:
+            flights = [self._flights.pop((claim.language, claim.texts[position])) for position in claim.led]
+        for flight, position in zip(flights, claim.led):
+            flight.set_result(translations[position])
+
+def _safe_cut(text: str, limit: int) -> Tuple[int, int]:
+    """
+    Encontra onde cortar um texto maior que o limite
+    Retorna (fim do trecho, início do próximo trecho)
+    """
+    window = text[:limit + 1]
+
+    # Preferir fim de frase, depois qualquer espaço
+    for pattern in (SENTENCE_BREAK_PATTERN, WHITESPACE_PATTERN):
+        matches = [match for match in pattern.finditer(window) if 0 < match.start() < limit]
+        if matches:
+            match = matches[-1]
+            if pattern is SENTENCE_BREAK_PATTERN:
+                # Manter a pontuação no trecho atual
+                whitespace = WHITESPACE_PATTERN.search(text, match.start())
+                return whitespace.start(), whitespace.end()
+            return match.start(), match.end()
+
+    # Sem espaços: corte seco, recuando para não partir um placeholder
+    cut = limit
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        if match.start() < cut < match.end():
+            cut = match.start() if match.start() > 0 else match.end()
+            break
+    return cut, cut
+
+def split_text(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """
+    Divide um texto em trechos de até max_chars caracteres
+    Retorna pares (separador anterior, trecho)
+    """
+    parts = []
+    joiner = ''
+    remaining = text
+
+    while len(remaining) > max_chars:
+        end, start = _safe_cut(remaining, max_chars)
+        parts.append((joiner, remaining[:end]))
+        joiner = remaining[end:start]
+        remaining = remaining[start:]
+
+    parts.append((joiner, remaining))
+    return parts
+
+def pack_requests(texts: List[str], max_chars: int, max_items: int = 100,
+                  item_overhead: int = 0) -> List[PackedRequest]:
+    """
+    Empacota textos em requisições respeitando o limite de caracteres
+
+    Usa first-fit decreasing: os trechos maiores são posicionados primeiro,
+    cada um na primeira requisição em que ainda cabe. `item_overhead` soma
+    o custo do separador que o backend insere entre itens do lote.
+    """
+    capacity = max(1, max_chars - item_overhead)
+
+    segments = []
+    for cell_index, text in enumerate(texts):
+        for part_index, (joiner, part) in enumerate(split_text(text, capacity)):
+            segments.append(CellSegment(cell_index, part_index, part, joiner))
+
+    requests: List[PackedRequest] = []
+    for segment in sorted(segments, key=lambda item: len(item.text), reverse=True):
+        size = len(segment.text) + item_overhead
+        for request in requests:
+            if request.chars + size <= max_chars and len(request.segments) < max_items:
+                break
+        else:
+            request = PackedRequest()
+            requests.append(request)
+
+        request.segments.append(segment)
+        request.chars += size
+
+    # Manter a ordem original dentro de cada requisição
+    for request in requests:
+        request.segments.sort(key=lambda item: (item.cell_index, item.part_index))
+    requests.sort(key=lambda item: (item.segments[0].cell_index, item.segments[0].part_index))
+
+    return requests
+
+def unpack_results(requests: List[PackedRequest], responses: List[Optional[List[str]]],
+                   cell_count: int) -> List[Optional[str]]:
+    """
+    Remonta o texto traduzido de cada célula a partir das respostas
+
+    Células com algum trecho em uma requisição que falhou (resposta None)
+    ficam como None.
+    """
+    parts: List[Optional[list]] = [[] for _ in range(cell_count)]
+
+    for request, response in zip(requests, responses):
+        for position, segment in enumerate(request.segments):
+            if parts[segment.cell_index] is None:
+                continue
+            if response is None:
+                parts[segment.cell_index] = None
+            else:
+                parts[segment.cell_index].append((segment.part_index, segment.joiner, response[position]))
+
+    results: List[Optional[str]] = []
+    for cell_parts in parts:
+        if cell_parts is None:
+            results.append(None)
+        else:
+            cell_parts.sort(key=lambda item: item[0])
+            results.append(''.join(joiner + text for _, joiner, text in cell_parts))
+    return results
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Partições - Um CSV muito grande traduzido em vários processos (--partitions)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+No modo streaming um catálogo de vários GB fica preso a um núcleo: leitura
+do csv.reader, preservação com expressões regulares e moeda rodam em um só
+processo. Aqui o arquivo é dividido em faixas de bytes:
+1. build_row_index percorre os bytes uma vez e grava o início de cada
+   registro, respeitando quebras de linha dentro de aspas (como a célula
+   "Mendoza/Argentina \\nLeve..." de teste_correcao.py)
+2. partition_ranges corta as linhas de dados em faixas de tamanho parecido,
+   sempre no início de um registro
+3. cada faixa é traduzida em um processo (CSVTranslator.translate_rows_stream)
+   para um arquivo parcial
+4. o cabeçalho e as partes são emendados na ordem, em um único arquivo
+
+O índice funciona em bytes porque a entrada é UTF-8: aspas e quebras de
+linha nunca aparecem dentro de um caractere multibyte.
+"""
+
+import array
+import bisect
+import csv
+import dataclasses
+import io
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List
+
+INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+PART_SUFFIX = '.part{:03d}'
+
+@dataclass
+class RowIndex:
+    """Início (em bytes) de cada registro do CSV; o primeiro é o cabeçalho"""
+    offsets: array.array
+    size: int
+
+    @property
+    def rows(self) -> int:
+        """Registros, incluindo o cabeçalho"""
+        return len(self.offsets)
+
+    def end_of(self, row: int) -> int:
+        """Byte logo depois do registro `row`"""
+        return self.offsets[row + 1] if row + 1 < len(self.offsets) else self.size
+
+@dataclass
+class Partition:
+    """Faixa de bytes [start, end) com as linhas de dados first_row+1 até first_row+rows"""
+    number: int
+    start: int
+    end: int
+    first_row: int
+    rows: int
+
+def _record_pattern(delimiter: str) -> 're.Pattern':
+    """
+    Um registro inteiro até a quebra de linha: texto sem aspas, campos entre
+    aspas (com quebras de linha e "" dentro) e aspas soltas no meio de um campo
+    """
+    starts = re.escape(delimiter.encode('utf-8')) + b'\r\n'
+    quoted = b'(?<=[' + starts + b'])"[^"]*(?:""[^"]*)*"'
+    # Aspas no meio de um campo sem aspas; depois de um campo entre aspas fechado,
+    # outra aspa só pode ser o "" de dentro dele, então o registro fica incompleto
+    literal = b'(?<![' + starts + b'"])"+'
+    return re.compile(b'[^"\n]*(?:(?:' + quoted + b'|' + literal + b')[^"\n]*)*\n')
+
+def build_row_index(path: str, delimiter: str = ',', chunk_size: int = INDEX_CHUNK_BYTES) -> RowIndex:
+    """
+    Índice do início de cada registro, em uma passada pelos bytes do arquivo
+
+    Segue as regras do csv.reader: aspas só abrem um campo no início dele
+    (depois do delimitador ou de uma quebra de linha), "" dentro do campo é
+    uma aspa literal e só a quebra de linha fora de aspas termina o registro.
+    A expressão regular consome um registro por vez; quando os registros
+    deixam de ser contíguos (campo entre aspas cortado no fim do bloco), o
+    resto do bloco é lido de novo junto com o seguinte.
+    """
+    pattern = _record_pattern(delimiter)
+    offsets = array.array('q', [0])
+    size = os.path.getsize(path)
+    # O byte 0 de `data` é só contexto (o anterior ao trecho); o arquivo começa em um campo
+    pending = b'\n'
+    base = -1
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            position = 1
+            for match in pattern.finditer(data, 1):
+                if match.start() != position:
+                    break
+                position = match.end()
+                offsets.append(base + position)
+            pending = data[position - 1:]
+            base += position - 1
+
+    # Quebra de linha no fim do arquivo não abre outro registro
+    if len(offsets) > 1 and offsets[-1] >= size:
+        offsets.pop()
+    return RowIndex(offsets, size)
+
+def partition_ranges(index: RowIndex, partitions: int) -> List[Partition]:
+    """Divide as linhas de dados (depois do cabeçalho) em até `partitions` faixas de bytes parecidas"""
+    if index.rows < 2:
+        return []
+    data_start = index.offsets[1]
+    step = (index.size - data_start) / max(1, partitions)
+
+    # Primeira linha de cada faixa: o registro que começa em (ou logo depois de) cada corte
+    firsts = [1]
+    for number in range(1, partitions):
+        row = bisect.bisect_left(index.offsets, data_start + number * step, lo=firsts[-1] + 1)
+        if row >= index.rows:
+            break
+        firsts.append(row)
+    firsts.append(index.rows)
+
+    return [Partition(number, index.offsets[first], index.end_of(last - 1), first - 1, last - first)
+            for number, (first, last) in enumerate(zip(firsts, firsts[1:]))]
+
+def sniff_delimiter(path: str) -> str:
+    """Delimitador pelo início do arquivo, como no modo streaming"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return csv.Sniffer().sniff(file.read(1024)).delimiter
+
+class _ByteRange(io.RawIOBase):
+    """Leitura só dos bytes [start, end) de um arquivo"""
+
+    def __init__(self, path: str, start: int, end: int):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:self._remaining]
+        count = self._file.readinto(view)
+        self._remaining -= count
+        return count
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+def read_range(path: str, start: int, end: int, delimiter: str) -> Iterator[List[str]]:
+    """Linhas CSV da faixa de bytes [start, end), lidas aos poucos"""
+    with io.TextIOWrapper(io.BufferedReader(_ByteRange(path, start, end)), encoding='utf-8', newline='') as text:
+        yield from csv.reader(text, delimiter=delimiter, quotechar='"')
+
+def part_path(output_file: str, number: int) -> str:
+    return output_file + PART_SUFFIX.format(number)
+
+def translate_partition(config, input_file: str, output_file: str, partition: Partition,
+                        delimiter: str) -> Dict:
+    """Traduz uma faixa para o arquivo parcial (roda no processo de trabalho)"""
+    # Import local: tradutor_core só é carregado nos processos de trabalho
+    from tradutor_core import create_translator
+
+    start = time.perf_counter()
+    translator = create_translator(config, log=lambda message: None)
+    try:
+        if translator.backend is None:
+            raise RuntimeError(f"backend {config.backend} indisponível")
+        output_rows, translated_cells = translator.translate_rows_stream(
+            lambda: read_range(input_file, partition.start, partition.end, delimiter),
+            part_path(output_file, partition.number), delimiter, partition.first_row)
+    finally:
+        translator.close()
+    return {
+        'partition': partition.number,
+        'rows': partition.rows,
+        'bytes': partition.end - partition.start,
+        'output_rows': output_rows,
+        'translated_cells': translated_cells,
+        'backend_requests': translator.backend_requests,
+        'failed_texts': len(translator.failed_texts),
+        'elapsed_seconds': time.perf_counter() - start,
+    }
+
+def translate_partitioned(config, input_file: str, output_file: str, partitions: int = 0,
+                          log: Callable[[str], None] = print) -> Dict:
+    """
+    Traduz `input_file` dividido em faixas de bytes, uma por processo
+
+    A saída é a mesma do modo streaming (cabeçalho e, para cada linha de
+    dados, uma linha por idioma). Diário, retomada e modo incremental não
+    valem por partição e ficam desligados. Se alguma partição falhar, as
+    partes são apagadas e a exceção sobe.
+
+    Returns:
+        Relatório: tempo do índice, de cada partição e da emenda
+    """
+    started = time.perf_counter()
+    partitions = max(1, partitions or os.cpu_count() or 1)
+    config = dataclasses.replace(config, journal=False, resume=False, incremental=False,
+                                 requests_per_second=config.requests_per_second / partitions,
+                                 chars_per_second=config.chars_per_second / partitions)
+
+    delimiter = sniff_delimiter(input_file)
+    index = build_row_index(input_file, delimiter)
+    index_seconds = time.perf_counter() - started
+    ranges = partition_ranges(index, partitions)
+    log(f"🗂️  Índice: {index.rows - 1} linhas de dados em {index.size / 1024 / 1024:.1f} MB "
+        f"({index_seconds:.2f}s)")
+    log(f"🧩 {len(ranges)} partições em {len(ranges) or 1} processos")
+
+    with open(input_file, 'r', encoding='utf-8', newline='') as infile:
+        header = next(csv.reader(infile, delimiter=delimiter, quotechar='"'), None)
+
+    results: List[Dict] = []
+    try:
+        if ranges:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(translate_partition, config, input_file, output_file, partition,
+                                           delimiter)
+                           for partition in ranges]
+                for partition, future in zip(ranges, futures):
+                    result = future.result()
+                    results.append(result)
+                    log(f"✅ Partição {partition.number + 1}/{len(ranges)}: linhas de dados "
+                        f"{partition.first_row + 1}-{partition.first_row + partition.rows} "
+                        f"({result['elapsed_seconds']:.1f}s, {result['backend_requests']} requisições)")
+
+        stitch_started = time.perf_counter()
+        with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+            if header is not None:
+                csv.writer(outfile, delimiter=delimiter, quotechar='"', quoting=csv.QUOTE_MINIMAL).writerow(header)
+        with open(output_file, 'ab') as outfile:
+            for partition in ranges:
+                with open(part_path(output_file, partition.number), 'rb') as part:
+                    shutil.copyfileobj(part, outfile, INDEX_CHUNK_BYTES)
+        stitch_seconds = time.perf_counter() - stitch_started
+    finally:
+        for partition in ranges:
+            if os.path.exists(part_path(output_file, partition.number)):
+                os.remove(part_path(output_file, partition.number))
+
+    elapsed = time.perf_counter() - started
+    cells = sum(result['translated_cells'] for result in results)
+    output_rows = sum(result['output_rows'] for result in results) + (header is not None)
+    log(f"🔤 Células traduzidas: {cells}")
+    log(f"📡 Requisições ao backend: {sum(result['backend_requests'] for result in results)}")
+    log(f"⏱️  Índice {index_seconds:.2f}s, emenda {stitch_seconds:.2f}s, total {elapsed:.1f}s")
+    return {
+        'input_bytes': index.size,
+        'data_rows': index.rows - 1,
+        'output_rows': output_rows,
+        'translated_cells': cells,
+        'index_seconds': index_seconds,
+        'stitch_seconds': stitch_seconds,
+        'elapsed_seconds': elapsed,
+        'partitions': results,
+    }
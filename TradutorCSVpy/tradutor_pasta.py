@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pasta Monitorada - Processo de longa duração que traduz os CSVs de uma pasta (--watch)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Na rotina da campanha os CSVs chegam um a um, exportados do Illustrator para
+a mesma pasta. Abrir o CLI para cada um paga de novo a partida a frio:
+importação do backend, conexões HTTP, pool de workers e cache em memória
+vazio. O FolderWatcher mantém um único CSVTranslator aberto e traduz cada
+arquivo novo ou alterado com ele:
+- clientes do backend, conexões, pool de workers e os caches (memória e
+  SQLite) continuam aquecidos de um arquivo para o outro
+- a pasta é varrida a cada `interval` segundos com os.scandir (sem
+  dependências); um arquivo só entra na fila quando tamanho e data de
+  modificação ficam iguais por `settle` segundos, porque a exportação é
+  gravada aos poucos
+- a fila é limitada: com a fila cheia, o arquivo espera a próxima varredura
+  em vez de acumular trabalho sem fim
+- a saída vai para o lado da entrada, com o nome padrão; na partida, entradas
+  com a saída mais nova que elas não são traduzidas de novo
+"""
+
+import collections
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from tradutor_arquivos import TRANSLATED_MARKER, FileResult, batch_output_path
+
+# Mensagens do log de um arquivo guardadas para mostrar quando ele falha
+LOG_TAIL_LINES = 5
+
+@dataclass
+class WatchedFile:
+    """Estado de um CSV da pasta entre as varreduras"""
+    # (data de modificação em ns, tamanho) na última varredura
+    signature: Tuple[int, int]
+    # Instante (time.monotonic) em que a assinatura mudou pela última vez
+    changed_at: float
+    # Assinatura já colocada na fila ou traduzida (None = nunca)
+    handled: Optional[Tuple[int, int]] = None
+
+def is_watched(name: str) -> bool:
+    """CSV de entrada: ignora saídas com o nome padrão e arquivos temporários/ocultos"""
+    return (name.lower().endswith('.csv') and TRANSLATED_MARKER not in name
+            and not name.startswith(('.', '~')))
+
+def file_signature(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_mtime_ns, stat.st_size
+
+class FolderWatcher:
+    """Traduz os CSVs que chegam a uma pasta com um tradutor sempre aberto"""
+
+    def __init__(self, config, folder: str, interval: float = 2.0, settle: float = 2.0,
+                 queue_size: int = 16, log: Callable[[str], None] = print):
+        """
+        Args:
+            config: Configuração de todas as traduções (TranslationConfig)
+            folder: Pasta monitorada (sem subpastas)
+            interval: Segundos entre as varreduras da pasta
+            settle: Segundos sem mudança de tamanho e data antes de traduzir um arquivo
+            queue_size: Arquivos prontos aguardando tradução, no máximo
+            log: Recebe uma mensagem por arquivo e o resumo ao encerrar
+        """
+        self.config = config
+        self.folder = folder
+        self.interval = max(0.05, interval)
+        self.settle = max(0.0, settle)
+        self.log = log
+        self.files: Dict[str, WatchedFile] = {}
+        self.jobs: 'queue.Queue[Tuple[str, Tuple[int, int]]]' = queue.Queue(maxsize=max(1, queue_size))
+        self.translator = None
+        self.totals = collections.Counter()
+        self._queue_full = False
+
+    def scan(self, now: float = None) -> int:
+        """
+        Uma varredura: atualiza o estado dos arquivos e enfileira os que assentaram
+
+        Returns:
+            Arquivos colocados na fila nesta varredura
+        """
+        now = time.monotonic() if now is None else now
+        seen = set()
+        queued = 0
+        full = False
+        with os.scandir(self.folder) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if not is_watched(entry.name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    signature = file_signature(entry.stat())
+                except OSError:
+                    # Apagado ou renomeado durante a varredura
+                    continue
+                seen.add(entry.path)
+
+                state = self.files.get(entry.path)
+                if state is None:
+                    state = self.files[entry.path] = WatchedFile(signature, now)
+                    if self._has_fresh_output(entry.path, signature):
+                        state.handled = signature
+                elif state.signature != signature:
+                    state.signature = signature
+                    state.changed_at = now
+
+                if (full or state.handled == signature or now - state.changed_at < self.settle
+                        or signature[1] == 0):
+                    continue
+                try:
+                    self.jobs.put_nowait((entry.path, signature))
+                except queue.Full:
+                    # Avisa uma vez por episódio de fila cheia, não a cada varredura
+                    if not self._queue_full:
+                        self.log(f"⏳ Fila cheia ({self.jobs.maxsize} arquivos): "
+                                 f"{entry.name} e os seguintes esperam a próxima varredura")
+                    full = True
+                    continue
+                state.handled = signature
+                queued += 1
+                self.log(f"📥 Na fila: {entry.name} ({self.jobs.qsize()}/{self.jobs.maxsize})")
+        self._queue_full = full
+
+        for path in set(self.files) - seen:
+            del self.files[path]
+        return queued
+
+    def _has_fresh_output(self, input_file: str, signature: Tuple[int, int]) -> bool:
+        """Saída com o nome padrão mais nova que a entrada (traduzida antes da partida)"""
+        output_file = batch_output_path(input_file, '', self.config.target_languages)
+        try:
+            return os.stat(output_file).st_mtime_ns >= signature[0]
+        except OSError:
+            return False
+
+    def start(self):
+        """Abre o tradutor que fica aquecido entre os arquivos"""
+        # Import local: tradutor_core só é carregado quando o monitoramento começa
+        from tradutor_core import create_translator
+
+        self.translator = create_translator(self.config, log=lambda message: None)
+        if self.translator.backend is None:
+            self.translator.close()
+            self.translator = None
+            raise RuntimeError(f"backend {self.config.backend} indisponível")
+
+    def close(self):
+        if self.translator is not None:
+            self.translator.close()
+            self.translator = None
+
+    def translate(self, input_file: str) -> FileResult:
+        """Traduz um arquivo com o tradutor aberto; erros viram um FileResult com `ok` falso"""
+        translator = self.translator
+        output_file = batch_output_path(input_file, '', self.config.target_languages)
+        log_tail = collections.deque(maxlen=LOG_TAIL_LINES)
+        result = FileResult(input_file, output_file)
+        start = time.perf_counter()
+
+        translator.reset_run_state()
+        translator.log = log_tail.append
+        cache_before = translator.translation_cache.stats()['hits']
+        try:
+            result.input_bytes = os.path.getsize(input_file)
+            translator.translate_csv(input_file, output_file)
+            result.memory_hits = translator.translation_cache.stats()['hits'] - cache_before
+            result.translated_cells = translator.translated_cells
+            result.backend_requests = translator.backend_requests
+            result.backend_items = translator.backend_items
+            result.persistent_hits = translator.persistent_cache_hits
+            result.failed_texts = len(translator.failed_texts)
+            result.ok = True
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+            result.log_tail = list(log_tail)
+        finally:
+            # Diário e manifesto de uma execução que falhou ficam como no CLI
+            translator.reset_run_state()
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _work(self, stop: threading.Event):
+        """Thread de trabalho: um arquivo da fila por vez"""
+        while not stop.is_set():
+            try:
+                input_file, signature = self.jobs.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                current = file_signature(os.stat(input_file))
+            except OSError:
+                current = None
+            # Alterado ou apagado depois de entrar na fila: a varredura decide de novo
+            if current == signature:
+                self._record(self.translate(input_file))
+            self.jobs.task_done()
+
+    def _record(self, result: FileResult):
+        self.totals['files'] += 1
+        name = os.path.basename(result.input_file)
+        if not result.ok:
+            self.totals['failed'] += 1
+            self.log(f"❌ {name}: {result.error}")
+            for line in result.log_tail:
+                self.log(f"      {line}")
+            return
+        self.totals['succeeded'] += 1
+        self.totals['translated_cells'] += result.translated_cells
+        self.totals['backend_requests'] += result.backend_requests
+        self.totals['backend_items'] += result.backend_items
+        self.totals['memory_hits'] += result.memory_hits
+        self.totals['persistent_hits'] += result.persistent_hits
+        warning = f", {result.failed_texts} textos sem tradução" if result.failed_texts else ''
+        self.log(f"✅ {name} → {os.path.basename(result.output_file)} "
+                 f"({result.translated_cells} células, {result.backend_requests} requisições, "
+                 f"{result.memory_hits + result.persistent_hits} acertos de cache, "
+                 f"{result.elapsed:.1f}s{warning})")
+
+    def run(self, stop: threading.Event = None) -> Dict:
+        """
+        Monitora a pasta até `stop` ser sinalizado (ou Ctrl+C)
+
+        O arquivo em tradução termina antes de o tradutor ser fechado; os que
+        ainda estavam na fila são traduzidos na próxima execução.
+
+        Returns:
+            Totais: arquivos, falhas, células, requisições e acertos de cache
+        """
+        stop = stop or threading.Event()
+        if not os.path.isdir(self.folder):
+            raise FileNotFoundError(f"Pasta não encontrada: {self.folder}")
+        self.start()
+        self.log(f"👀 Monitorando {self.folder} a cada {self.interval:g}s "
+                 f"(arquivo pronto após {self.settle:g}s sem mudanças, fila de {self.jobs.maxsize})")
+        self.log(f"🌐 {self.config.source_language} → {', '.join(self.config.target_languages)}, "
+                 f"backend {self.config.backend}, cache {self.config.cache_file or 'só em memória'}")
+
+        started = time.perf_counter()
+        worker = threading.Thread(target=self._work, args=(stop,), name='tradutor-pasta', daemon=True)
+        worker.start()
+        try:
+            while not stop.is_set():
+                self.scan()
+                stop.wait(self.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            worker.join()
+            self.close()
+
+        totals = dict(self.totals)
+        totals['pending'] = self.jobs.qsize()
+        totals['elapsed_seconds'] = time.perf_counter() - started
+        self.log(f"🛑 Monitoramento encerrado: {totals.get('succeeded', 0)} arquivos traduzidos, "
+                 f"{totals.get('failed', 0)} falhas, {totals['pending']} ainda na fila")
+        self.log(f"🗃️  Acertos de cache: memória {totals.get('memory_hits', 0)}, "
+                 f"persistente {totals.get('persistent_hits', 0)}; "
+                 f"{totals.get('backend_items', 0)} textos enviados ao backend")
+        return totals
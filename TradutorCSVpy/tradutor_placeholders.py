@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Placeholders - Preservação de URLs, emails, moedas e números
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Os elementos que não devem ser traduzidos são trocados por placeholders
+(__URL_0__, __EMAIL_1__, __CURRENCY_2__, __NUMBER_3__), um tipo por vez
+(URLs, depois emails, moedas e números), com as expressões compiladas uma
+vez na importação, e restaurados com um único re.sub.
+
+As regras são as das versões anteriores, então o texto enviado ao backend
+não muda:
+- a numeração segue a ordem dos tipos e, dentro de cada tipo, a do texto
+- ocorrências repetidas de um mesmo valor recebem o mesmo placeholder (os
+  números repetidos não ocupam um novo índice)
+- um número contido em um valor já preservado (URL, email, moeda ou número
+  anterior) fica como está
+
+A única diferença é onde a versão anterior, com str.replace, trocava um
+valor também dentro de outro maior ("8,96" em "8,96 e 218,96").
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+URL_PATTERN = r'(?i:https?://[^\s<>"]+|www\.[^\s<>"]+)'
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+CURRENCY_PATTERN = r'(?i:\d+(?:[,\.]\d+)*(?:[,\.]\d{2})?\s*(?:R\$|BRL|reais?|USD|\$|€|EUR))'
+NUMBER_PATTERN = r'\b\d+(?:[,\.]\d+)*\b'
+
+# Ordem de numeração dos placeholders
+PLACEHOLDER_KINDS = (
+    ('url', 'URL', re.compile(URL_PATTERN)),
+    ('email', 'EMAIL', re.compile(EMAIL_PATTERN)),
+    ('currency', 'CURRENCY', re.compile(CURRENCY_PATTERN)),
+    ('number', 'NUMBER', re.compile(NUMBER_PATTERN)),
+)
+
+RESTORE_PATTERN = re.compile(r'__(?:URL|EMAIL|CURRENCY|NUMBER)_\d+__')
+
+DIGITS = re.compile(r'\d')
+WWW = re.compile(r'(?i:www\.)')
+
+@lru_cache(maxsize=None)
+def placeholder_kinds(urls: bool = True, emails: bool = True, currency: bool = False,
+                      numbers: bool = True) -> Tuple[str, ...]:
+    """Tipos de elemento ativos, na ordem de numeração"""
+    enabled = {'url': urls, 'email': emails, 'currency': currency, 'number': numbers}
+    return tuple(kind for kind, _, _ in PLACEHOLDER_KINDS if enabled[kind])
+
+def _may_contain(kind: str, text: str) -> bool:
+    """Verificação barata antes da expressão: a maioria das células não tem URL, email ou número"""
+    if kind == 'url':
+        return '://' in text or WWW.search(text) is not None
+    if kind == 'email':
+        return '@' in text
+    return DIGITS.search(text) is not None
+
+def mask_elements(text: str, kinds: Tuple[str, ...],
+                  currency_handler: Callable[[str], str] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Troca os elementos dos tipos `kinds` por placeholders, um tipo por vez
+
+    `currency_handler` transforma o valor monetário guardado no placeholder
+    (conversão ou troca de símbolo); sem ele o valor original é mantido.
+    Retorna o texto modificado e o mapeamento placeholder -> valor.
+    """
+    placeholders: Dict[str, str] = {}
+    names: Dict[Tuple[str, str], str] = {}
+    # Valores já preservados, separados por \0 (um número nunca contém o separador)
+    kept = ''
+    counter = 0
+
+    def replace(match: re.Match, kind: str, label: str) -> str:
+        nonlocal counter, kept
+        value = match.group()
+        name = names.get((kind, value))
+        if kind == 'number':
+            # Números repetidos não ocupam índice; contidos em outro valor ficam como estão
+            if name is None:
+                if value in kept:
+                    return value
+                name = names[kind, value] = f"__{label}_{counter}__"
+                placeholders[name] = value
+                kept += '\0' + value
+                counter += 1
+            return name
+        if name is None:
+            name = names[kind, value] = f"__{label}_{counter}__"
+            placeholders[name] = currency_handler(value) if kind == 'currency' and currency_handler else value
+            kept += '\0' + placeholders[name]
+        counter += 1
+        return name
+
+    for kind, label, pattern in PLACEHOLDER_KINDS:
+        if kind in kinds and _may_contain(kind, text):
+            text = pattern.sub(lambda match: replace(match, kind, label), text)
+    return text, placeholders
+
+def restore_elements(text: str, placeholders: Dict[str, str]) -> str:
+    """Restaura os placeholders em uma única passada"""
+    if not placeholders:
+        return text
+    return RESTORE_PATTERN.sub(lambda match: str(placeholders.get(match.group(), match.group())), text)
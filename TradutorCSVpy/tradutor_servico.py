@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviço de Tradução - O motor do CSVTranslator atrás de um servidor HTTP local (--serve)
+Autor: Wedny Fernandes
+Data: 2025-08-17
+
+Outras ferramentas da campanha (o script JSX do Illustrator, o exportador do
+CMS) também precisam de traduções, e chamar o CLI a cada pedido paga a
+partida a frio. O serviço mantém um único CSVTranslator aberto e atende:
+
+    POST /translate        {"texts": [...], "targets": "en,es"} → {"translations": {"en": [...], ...}}
+    POST /translate/csv    corpo CSV (?targets=en,es) → CSV com uma linha por idioma, como no --stream
+    GET  /metrics          requisições, latência (p50/p90/p99), vazão, lotes, backend e caches
+    GET  /health           {"status": "ok"}
+
+Micro-lotes: cada requisição HTTP entra em uma fila limitada e uma thread
+de despacho espera até `window` segundos por outras requisições, junta as
+células de todas (até `max_batch_cells`) e faz uma só chamada ao motor.
+Textos repetidos entre clientes vão ao backend uma vez, os lotes ficam
+cheios e o cache em memória (e o SQLite, com --cache-file) é o mesmo para
+todos os clientes.
+
+Com `dispatchers` > 1 (padrão: 2), enquanto um despacho espera o backend o
+seguinte já junta e envia as requisições que chegaram nesse meio tempo, no
+mesmo tradutor. Um texto que está no lote em andamento não é enviado de
+novo: o segundo despacho espera a resposta do primeiro (registro
+single-flight do motor, contado em `dedup.in_flight_collapsed` do
+/metrics). O motor asyncio tem um único laço de eventos e usa um despacho.
+"""
+
+import collections
+import csv
+import io
+import json
+import queue
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tradutor_estatisticas import StageStats
+
+# Maior corpo aceito por requisição (413 acima disso)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+class ServiceBusy(Exception):
+    """Fila de despacho cheia: o cliente deve tentar de novo (503)"""
+
+@dataclass
+class CellJob:
+    """Células de uma requisição aguardando o despacho"""
+    cells: List[str]
+    languages: Tuple[str, ...]
+    future: Future = field(default_factory=Future)
+
+class TranslationService:
+    """Um tradutor aquecido compartilhado por todos os clientes, com micro-lotes entre requisições"""
+
+    def __init__(self, config, window: float = 0.01, max_batch_cells: int = 5000,
+                 queue_size: int = 1000, dispatchers: int = 2, csv_windows: int = 4,
+                 log: Callable[[str], None] = print):
+        """
+        Args:
+            config: Configuração do motor (TranslationConfig); os idiomas são o padrão das requisições
+            window: Segundos que o despacho espera por outras requisições antes de traduzir
+            max_batch_cells: Células por chamada ao motor, no máximo
+            queue_size: Requisições aguardando o despacho (503 acima disso)
+            dispatchers: Threads de despacho chamando o motor ao mesmo tempo
+            csv_windows: Janelas de um CSV enviado a /translate/csv na fila ao mesmo tempo
+            log: Mensagens do serviço e do motor
+        """
+        self.config = config
+        self.window = max(0.0, window)
+        self.max_batch_cells = max(1, max_batch_cells)
+        self.csv_windows = max(1, csv_windows)
+        self.log = log
+        self.jobs: 'queue.Queue[Optional[CellJob]]' = queue.Queue(maxsize=max(1, queue_size))
+        # O laço de eventos do motor asyncio não aceita chamadas de várias threads
+        self.dispatchers = 1 if config.engine == 'asyncio' else max(1, dispatchers)
+        self.translator = None
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.latency: Dict[str, StageStats] = {}
+        self.errors = 0
+        self.cells = 0
+        self.failed_texts = 0
+        self.dispatches = 0
+        self.dispatched_jobs = 0
+
+    def start(self):
+        """Abre o tradutor e as threads de despacho"""
+        # Import local: tradutor_core só é carregado quando o serviço sobe
+        from tradutor_core import create_translator
+
+        self.translator = create_translator(self.config, log=self.log)
+        if self.translator.backend is None:
+            self.translator.close()
+            self.translator = None
+            raise RuntimeError(f"backend {self.config.backend} indisponível")
+        self._started = time.monotonic()
+        self._threads = [threading.Thread(target=self._dispatch, name=f'tradutor-servico-{number}', daemon=True)
+                         for number in range(self.dispatchers)]
+        for thread in self._threads:
+            thread.start()
+
+    def close(self):
+        """Traduz o que já está na fila e fecha o tradutor"""
+        # Um aviso de parada por despacho, depois das requisições já na fila
+        for _ in self._threads:
+            self.jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.translator is not None:
+            self.translator.close()
+            self.translator = None
+
+    def languages(self, targets) -> Tuple[str, ...]:
+        """Idiomas de uma requisição: lista, texto separado por vírgulas ou vazio (os da configuração)"""
+        if not targets:
+            return tuple(self.config.target_languages)
+        if isinstance(targets, str):
+            targets = targets.split(',')
+        if not isinstance(targets, list) or not all(isinstance(language, str) for language in targets):
+            raise ValueError("'targets' deve ser uma lista de idiomas ou um texto como \"en,es\"")
+        languages = tuple(dict.fromkeys(language.strip() for language in targets if language.strip()))
+        if not languages:
+            raise ValueError("nenhum idioma de destino")
+        return languages
+
+    def submit(self, cells: List[str], languages: Tuple[str, ...], timeout: float = 5.0) -> Future:
+        """Coloca células na fila de despacho; ServiceBusy se a fila continuar cheia por `timeout` segundos"""
+        job = CellJob(cells, languages)
+        try:
+            self.jobs.put(job, timeout=timeout)
+        except queue.Full:
+            raise ServiceBusy(f"fila de despacho cheia ({self.jobs.maxsize} requisições)")
+        return job.future
+
+    def translate(self, cells: List[str], languages: Tuple[str, ...]) -> Dict[str, List[str]]:
+        """Traduz células (junto com as requisições que chegarem na mesma janela)"""
+        return self.submit(cells, languages).result()
+
+    def translate_csv_text(self, text: str, languages: Tuple[str, ...]) -> Tuple[str, int]:
+        """
+        Traduz um CSV inteiro, com a saída do modo streaming
+
+        As linhas de dados vão para a fila em janelas de `stream_window`
+        linhas, no máximo `csv_windows` por vez: a próxima entra quando a
+        mais antiga fica pronta e é gravada. Um CSV grande não enche a fila
+        de despacho, e se algo falhar as janelas que ainda não começaram são
+        canceladas (não gastam cota do backend com uma resposta descartada).
+
+        Returns:
+            (CSV traduzido, células traduzidas)
+        """
+        try:
+            delimiter = csv.Sniffer().sniff(text[:1024]).delimiter
+        except csv.Error:
+            delimiter = ','
+        rows = list(csv.reader(io.StringIO(text, newline=''), delimiter=delimiter, quotechar='"'))
+        output = io.StringIO(newline='')
+        writer = csv.writer(output, delimiter=delimiter, quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        if not rows:
+            return '', 0
+        writer.writerow(rows[0])
+
+        window_size = max(1, self.config.stream_window)
+        pending: 'collections.deque[Tuple[List[List[str]], Future]]' = collections.deque()
+        translated_cells = 0
+        try:
+            for start in range(1, len(rows), window_size):
+                if len(pending) >= self.csv_windows:
+                    translated_cells += self._write_window(writer, *pending.popleft(), languages)
+                window = rows[start:start + window_size]
+                pending.append((window, self.submit([cell for row in window for cell in row], languages)))
+            while pending:
+                translated_cells += self._write_window(writer, *pending.popleft(), languages)
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
+        return output.getvalue(), translated_cells
+
+    def _write_window(self, writer, window: List[List[str]], future: Future, languages: Tuple[str, ...]) -> int:
+        """Grava uma janela traduzida (uma linha por idioma); retorna as células traduzidas"""
+        results = future.result()
+        translated_cells = 0
+        position = 0
+        for row in window:
+            for language in languages:
+                translated_row = results[language][position:position + len(row)]
+                translated_cells += sum(1 for cell, translated in zip(row, translated_row) if translated != cell)
+                writer.writerow(translated_row)
+            position += len(row)
+        return translated_cells
+
+    def _collect(self, first: CellJob) -> Tuple[List[CellJob], bool]:
+        """Junta à primeira requisição as que chegarem dentro da janela (até max_batch_cells)"""
+        batch = [first]
+        cells = len(first.cells)
+        deadline = time.monotonic() + self.window
+        while cells < self.max_batch_cells:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self.jobs.get(timeout=remaining) if remaining > 0 else self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+            cells += len(job.cells)
+        return batch, False
+
+    def _dispatch(self):
+        """Thread de despacho: junta as requisições da fila e chama o motor"""
+        stopping = False
+        while not stopping:
+            first = self.jobs.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            # Requisições canceladas antes do despacho (ex.: janelas de um CSV que falhou) não vão ao motor
+            batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            groups: Dict[Tuple[str, ...], List[CellJob]] = {}
+            for job in batch:
+                groups.setdefault(job.languages, []).append(job)
+            for languages, jobs in groups.items():
+                self._translate_group(languages, jobs)
+            with self._lock:
+                self.dispatches += 1
+                self.dispatched_jobs += len(batch)
+
+    def _translate_group(self, languages: Tuple[str, ...], jobs: List[CellJob]):
+        """Uma chamada ao motor com as células de todas as requisições do grupo"""
+        cells = [cell for job in jobs for cell in job.cells]
+        try:
+            results = self.translator.translate_texts(cells, list(languages))
+        except Exception as e:
+            for job in jobs:
+                job.future.set_exception(e)
+            return
+        # Textos que o backend não traduziu voltam como estão; só a contagem fica
+        failed = len(self.translator.take_failed_texts())
+        with self._lock:
+            self.cells += len(cells) * len(languages)
+            self.failed_texts += failed
+
+        position = 0
+        for job in jobs:
+            end = position + len(job.cells)
+            job.future.set_result({language: results[language][position:end] for language in languages})
+            position = end
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True):
+        """Latência de uma requisição HTTP atendida"""
+        with self._lock:
+            self.latency.setdefault(endpoint, StageStats()).add(seconds)
+            if not ok:
+                self.errors += 1
+
+    def metrics(self) -> Dict:
+        """Contadores do serviço, do motor e dos caches (GET /metrics)"""
+        translator = self.translator
+        uptime = time.monotonic() - self._started
+        with self._lock:
+            requests = {endpoint: stats.summary() for endpoint, stats in self.latency.items()}
+            report = {
+                'uptime_seconds': uptime,
+                'requests': requests,
+                'errors': self.errors,
+                'queued': self.jobs.qsize(),
+                'cells': self.cells,
+                'failed_texts': self.failed_texts,
+                'cells_per_second': self.cells / uptime if uptime else 0.0,
+                'requests_per_second': sum(stats['count'] for stats in requests.values()) / uptime if uptime else 0.0,
+                'batching': {
+                    'window_seconds': self.window,
+                    'dispatchers': self.dispatchers,
+                    'dispatches': self.dispatches,
+                    'requests_per_dispatch': self.dispatched_jobs / self.dispatches if self.dispatches else 0.0,
+                },
+            }
+        if translator is not None:
+            engine = translator.stats_report()
+            report['backend'] = engine['requests']
+            report['cache'] = engine['cache']
+            report['dedup'] = engine['dedup']
+            if 'http' in engine:
+                report['http'] = engine['http']
+        return report
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """Rotas do serviço; cada requisição roda em uma thread do ThreadingHTTPServer"""
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo em um só envio (sem a espera do Nagle com ACK atrasado)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _read_body(self) -> str:
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        if length > MAX_BODY_BYTES:
+            raise OverflowError(f"corpo maior que {MAX_BODY_BYTES // 1024 // 1024} MB")
+        return self.rfile.read(length).decode('utf-8')
+
+    def _handle(self, endpoint: str, action: Callable[[], None]):
+        """Executa a rota, transforma erros em respostas JSON e registra a latência"""
+        service = self.server.service
+        start = time.perf_counter()
+        ok = True
+        try:
+            action()
+        except OverflowError as e:
+            # O corpo não foi lido: a conexão não pode ser reaproveitada
+            self.close_connection = True
+            ok = False
+            self._send_json(413, {'error': str(e)})
+        except (ValueError, UnicodeDecodeError) as e:
+            ok = False
+            self._send_json(400, {'error': str(e)})
+        except ServiceBusy as e:
+            ok = False
+            self._send_json(503, {'error': str(e)})
+        except Exception as e:
+            ok = False
+            self._send_json(500, {'error': str(e) or type(e).__name__})
+        service.record(endpoint, time.perf_counter() - start, ok)
+
+    def _translate(self):
+        service = self.server.service
+        try:
+            payload = json.loads(self._read_body() or '{}')
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}")
+        if not isinstance(payload, dict):
+            raise ValueError("o corpo deve ser um objeto JSON")
+        texts = payload.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError("'texts' deve ser uma lista de textos")
+        languages = service.languages(payload.get('targets'))
+        self._send_json(200, {'translations': service.translate(texts, languages)})
+
+    def _translate_csv(self, query: Dict[str, List[str]]):
+        service = self.server.service
+        languages = service.languages(query.get('targets', [''])[0])
+        text, translated_cells = service.translate_csv_text(self._read_body(), languages)
+        self._send(200, text.encode('utf-8'), 'text/csv; charset=utf-8',
+                   {'X-Translated-Cells': str(translated_cells)})
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        else:
+            self._send_json(404, {'error': f"rota não encontrada: {path}"})
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/translate':
+            self._handle('translate', self._translate)
+        elif url.path == '/translate/csv':
+            self._handle('translate_csv', lambda: self._translate_csv(urllib.parse.parse_qs(url.query)))
+        else:
+            self.close_connection = True
+            self._send_json(404, {'error': f"rota não encontrada: {url.path}"})
+
+class _ServiceHTTPServer(ThreadingHTTPServer):
+    # Fila de conexões do listen(): o padrão (5) recusa rajadas de clientes simultâneos
+    request_queue_size = 128
+    daemon_threads = True
+
+class TranslationServer:
+    """Servidor HTTP do serviço (ThreadingHTTPServer, conexões keep-alive)"""
+
+    def __init__(self, service: TranslationService, host: str = '127.0.0.1', port: int = 8080):
+        self.service = service
+        self._server = _ServiceHTTPServer((host, port), _ServiceHandler)
+        self._server.service = service
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Abre o tradutor e atende em uma thread em segundo plano; retorna a URL"""
+        self.service.start()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        """Abre o tradutor e atende na thread atual até Ctrl+C"""
+        self.service.start()
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        self.service.close()